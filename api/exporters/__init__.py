@@ -1,11 +1,31 @@
+from .streaming import ExportableResult, StreamingExporter, aiter_in_thread, encode_chunks
 from .markdown import MarkdownExporter
 from .json_export import JsonExporter
 from .csv_export import CsvExporter
 from .xml_export import XmlExporter
+from .registry import EXPORT_FORMATS, enabled_formats
+from .lazy import (
+    LazyExportRenderer,
+    canonical_blob_name,
+    export_mode,
+    get_export_renderer,
+    store_canonical_result,
+)
 
 __all__ = [
+    "ExportableResult",
+    "StreamingExporter",
+    "aiter_in_thread",
+    "encode_chunks",
     "MarkdownExporter",
     "JsonExporter",
     "CsvExporter",
     "XmlExporter",
+    "EXPORT_FORMATS",
+    "enabled_formats",
+    "LazyExportRenderer",
+    "canonical_blob_name",
+    "export_mode",
+    "get_export_renderer",
+    "store_canonical_result",
 ]
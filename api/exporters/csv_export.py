@@ -1,40 +1,49 @@
 import csv
 import io
-from models import ExtractionResult
+from collections.abc import Iterator
 
+from .streaming import ExportableResult, StreamingExporter
 
-class CsvExporter:
-    def export(self, result: ExtractionResult) -> str:
-        output = io.StringIO()
+
+class CsvExporter(StreamingExporter):
+    def iter_export(self, result: ExportableResult) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def drain() -> str:
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
 
         if result.fields:
-            writer = csv.writer(output)
             writer.writerow(["Field Name", "Value", "Confidence"])
             for field in result.fields:
                 writer.writerow([field.name, field.value, f"{field.confidence:.2f}"])
+                yield drain()
 
-            output.write("\n")
+            yield "\n"
 
         if result.tables:
             for i, table in enumerate(result.tables):
                 if i > 0:
-                    output.write("\n")
-                output.write(f"# Table {i + 1}\n")
+                    yield "\n"
+                yield f"# Table {i + 1}\n"
 
                 if isinstance(table, dict):
                     headers = table.get("headers", [])
                     rows = table.get("rows", [])
 
-                    writer = csv.writer(output)
                     if headers:
                         writer.writerow(headers)
                     for row in rows:
                         writer.writerow(row)
+                        yield drain()
 
                 elif isinstance(table, list) and table:
-                    writer = csv.writer(output)
                     for row in table:
                         if isinstance(row, list):
                             writer.writerow(row)
+                            yield drain()
 
-        return output.getvalue()
+                yield drain()
@@ -1,9 +1,40 @@
 import json
-from models import ExtractionResult
+import uuid
+from json.encoder import encode_basestring
+from collections.abc import Iterable, Iterator
 
+from .streaming import ExportableResult, StreamingExporter, markdown_pieces, raw_text_pieces
+
+
+def _encode_pieces(pieces: Iterable[str]) -> Iterator[str]:
+    # JSON escapes each character on its own, so escaping pieces matches escaping their join
+    yield '"'
+    for piece in pieces:
+        yield encode_basestring(piece)[1:-1]
+    yield '"'
+
+
+def _splice(tokens: Iterable[str], replacements: dict[str, Iterable[str]]) -> Iterator[str]:
+    """Replace encoded placeholder strings in an encoder's output with streamed text, in order."""
+    for token in tokens:
+        for placeholder, pieces in replacements.items():
+            if placeholder in token:
+                before, token = token.split(placeholder, 1)
+                yield before
+                yield from _encode_pieces(pieces)
+        yield token
+
+
+class JsonExporter(StreamingExporter):
+    def export(self, result: ExportableResult, indent: int = 2) -> str:
+        return "".join(self.iter_export(result, indent))
+
+    def iter_export(self, result: ExportableResult, indent: int = 2) -> Iterator[str]:
+        # The document text is written page by page in place of these placeholders
+        marker = uuid.uuid4().hex
+        raw_text = f"\0raw-{marker}"
+        markdown = f"\0markdown-{marker}"
 
-class JsonExporter:
-    def export(self, result: ExtractionResult, indent: int = 2) -> str:
         output = {
             "document_id": result.document_id,
             "extracted_at": result.extracted_at.isoformat(),
@@ -24,9 +55,14 @@ class JsonExporter:
             ],
             "tables": result.tables,
             "content": {
-                "raw_text": result.raw_text,
-                "markdown": result.markdown_content
+                "raw_text": raw_text,
+                "markdown": markdown
             }
         }
 
-        return json.dumps(output, indent=indent, ensure_ascii=False)
+        # iterencode yields the same text as json.dumps, a token at a time
+        tokens = json.JSONEncoder(indent=indent, ensure_ascii=False).iterencode(output)
+        return _splice(tokens, {
+            encode_basestring(raw_text): raw_text_pieces(result),
+            encode_basestring(markdown): markdown_pieces(result)
+        })
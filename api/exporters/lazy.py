@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from models import CompactResult, result_to_json
+from utils.compression import compress, decompress, result_encoding
+from utils.lru import LRUCache
+from utils.read_cache import BlobReadCache, CachedBlob, get_read_cache
+
+from .registry import EXPORT_FORMATS
+from .streaming import ExportableResult
+
+logger = logging.getLogger(__name__)
+
+CANONICAL_EXTENSION = "result.json"
+
+
+def export_mode() -> str:
+    """'eager' renders every enabled format at ingest, 'lazy' stores only the canonical result."""
+    mode = os.environ.get("EXPORT_MODE", "eager").strip().lower()
+    return mode if mode in ("eager", "lazy") else "eager"
+
+
+def canonical_blob_name(base_name: str) -> str:
+    return f"{base_name}.{CANONICAL_EXTENSION}"
+
+
+async def store_canonical_result(result: ExportableResult, base_name: str, storage_helper) -> str:
+    return await storage_helper.upload_result(
+        canonical_blob_name(base_name),
+        result_to_json(result),
+        "application/json"
+    )
+
+
+class LazyExportRenderer:
+    """Renders exports on first request from the canonical stored result.
+
+    Rendered output is written back next to the canonical blob, tagged with the canonical
+    blob's ETag, and kept in an in-process LRU, so each format is rendered once per version
+    of the result. Documents processed in eager mode have no canonical blob; their stored
+    exports are served as they are.
+    """
+
+    def __init__(
+        self,
+        storage_helper=None,
+        read_cache: BlobReadCache | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None
+    ):
+        self._storage_helper = storage_helper
+        self._read_cache = read_cache
+        self._rendered = LRUCache(
+            max_entries=max_entries or int(os.environ.get("EXPORT_RENDER_CACHE_MAX_ENTRIES", "128")),
+            max_bytes=max_bytes or int(os.environ.get("EXPORT_RENDER_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            sizeof=lambda blob: len(blob.content)
+        )
+        self.renders = 0
+
+    @property
+    def storage_helper(self):
+        if self._storage_helper is None:
+            from utils.clients import get_storage_helper
+
+            self._storage_helper = get_storage_helper()
+        return self._storage_helper
+
+    @property
+    def read_cache(self) -> BlobReadCache:
+        if self._read_cache is None:
+            self._read_cache = get_read_cache()
+        return self._read_cache
+
+    async def get(self, doc_id: str, format_name: str) -> CachedBlob:
+        ext, content_type, exporter_cls = EXPORT_FORMATS[format_name]
+        container = self.storage_helper.extracted_data_container
+
+        try:
+            canonical = await self.read_cache.get(container, canonical_blob_name(doc_id))
+        except ResourceNotFoundError:
+            return await self.read_cache.get(container, f"{doc_id}.{ext}")
+
+        key = (doc_id, format_name, canonical.etag)
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            return rendered
+
+        # Same etag as the served export, derived from the result it was rendered from
+        source_tag = canonical.etag.strip('"')
+        etag = f'"{source_tag}-{ext}"'
+        written_back = await self._load_written_back(container, f"{doc_id}.{ext}", canonical.etag)
+        if written_back is not None:
+            content, encoding = written_back
+        else:
+            content, encoding = await asyncio.to_thread(self._render, exporter_cls, canonical)
+            self.renders += 1
+            await self._write_back(container, f"{doc_id}.{ext}", content, content_type, encoding, canonical.etag)
+
+        rendered = CachedBlob(
+            content=content,
+            etag=etag,
+            last_modified=canonical.last_modified,
+            content_type=content_type,
+            checked_at=canonical.checked_at,
+            content_encoding=encoding
+        )
+        self._rendered.put(key, rendered)
+        return rendered
+
+    @staticmethod
+    def _render(exporter_cls, canonical: CachedBlob) -> tuple[bytes, str | None]:
+        data = canonical.content
+        if canonical.content_encoding:
+            data = decompress(data, canonical.content_encoding)
+        result = CompactResult.from_json(data)
+
+        content = exporter_cls().export(result).encode("utf-8")
+        encoding = result_encoding()
+        if encoding:
+            content = compress(content, encoding)
+        return content, encoding
+
+    async def _load_written_back(
+        self,
+        container: str,
+        blob_name: str,
+        source_etag: str
+    ) -> tuple[bytes, str | None] | None:
+        # Read directly rather than through the read cache, which would hold a second copy
+        try:
+            content, props = await self.storage_helper.download_blob_if_modified(container, blob_name)
+        except ResourceNotFoundError:
+            return None
+        if props.get("metadata", {}).get("source_etag") != source_etag:
+            # Rendered from an older result, or an eager-mode export
+            return None
+        return content, props.get("content_encoding")
+
+    async def _write_back(
+        self,
+        container: str,
+        blob_name: str,
+        content: bytes,
+        content_type: str,
+        content_encoding: str | None,
+        source_etag: str
+    ):
+        try:
+            await self.storage_helper.upload_blob(
+                container=container,
+                blob_name=blob_name,
+                data=content,
+                content_type=content_type,
+                metadata={"source_etag": source_etag},
+                content_encoding=content_encoding
+            )
+        except AzureError as e:
+            # The rendered output is still served; the next cold instance renders again
+            logger.warning(f"Failed to write back rendered export {blob_name}: {e}")
+
+
+_renderer: LazyExportRenderer | None = None
+
+
+def get_export_renderer() -> LazyExportRenderer:
+    global _renderer
+    if _renderer is None:
+        _renderer = LazyExportRenderer()
+    return _renderer
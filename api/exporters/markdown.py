@@ -1,37 +1,46 @@
-from models import ExtractionResult
+from collections.abc import Iterator
 
+from .streaming import ExportableResult, StreamingExporter, markdown_pieces
 
-class MarkdownExporter:
-    def export(self, result: ExtractionResult) -> str:
-        lines = []
 
-        lines.append(f"# Extracted Document: {result.document_id}")
-        lines.append("")
-        lines.append(f"**Processed:** {result.extracted_at.isoformat()}")
-        lines.append(f"**Pages:** {result.page_count}")
-        lines.append(f"**Confidence:** {result.confidence.overall:.1%}")
+class MarkdownExporter(StreamingExporter):
+    def iter_export(self, result: ExportableResult) -> Iterator[str]:
+        lines = self._lines(result)
+        yield next(lines)
+        for line in lines:
+            yield "\n"
+            yield line
+
+        # The document content goes out a page at a time
+        yield "\n"
+        yield from markdown_pieces(result)
+
+        for line in ("", "---", f"*Extracted by Mistral OCR ({result.model_version})*"):
+            yield "\n"
+            yield line
+
+    @staticmethod
+    def _lines(result: ExportableResult) -> Iterator[str]:
+        yield f"# Extracted Document: {result.document_id}"
+        yield ""
+        yield f"**Processed:** {result.extracted_at.isoformat()}"
+        yield f"**Pages:** {result.page_count}"
+        yield f"**Confidence:** {result.confidence.overall:.1%}"
         if result.confidence.is_low_confidence:
-            lines.append("⚠️ **Low confidence extraction - manual review recommended**")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+            yield "⚠️ **Low confidence extraction - manual review recommended**"
+        yield ""
+        yield "---"
+        yield ""
 
         if result.fields:
-            lines.append("## Extracted Fields")
-            lines.append("")
+            yield "## Extracted Fields"
+            yield ""
             for field in result.fields:
                 confidence_indicator = "✓" if field.confidence >= 0.7 else "?"
-                lines.append(f"- **{field.name}:** {field.value} {confidence_indicator}")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-
-        lines.append("## Document Content")
-        lines.append("")
-        lines.append(result.markdown_content)
-        lines.append("")
-
-        lines.append("---")
-        lines.append(f"*Extracted by Mistral OCR ({result.model_version})*")
+                yield f"- **{field.name}:** {field.value} {confidence_indicator}"
+            yield ""
+            yield "---"
+            yield ""
 
-        return "\n".join(lines)
+        yield "## Document Content"
+        yield ""
@@ -0,0 +1,26 @@
+import os
+
+from .csv_export import CsvExporter
+from .json_export import JsonExporter
+from .markdown import MarkdownExporter
+from .xml_export import XmlExporter
+
+# format name -> (file extension, content type, exporter class)
+EXPORT_FORMATS = {
+    "markdown": ("md", "text/markdown", MarkdownExporter),
+    "json": ("json", "application/json", JsonExporter),
+    "csv": ("csv", "text/csv", CsvExporter),
+    "xml": ("xml", "application/xml", XmlExporter),
+}
+
+
+def enabled_formats() -> list[str]:
+    configured = os.environ.get("EXPORT_FORMATS", ",".join(EXPORT_FORMATS))
+    formats = []
+    for name in configured.split(","):
+        name = name.strip().lower()
+        if name == "md":
+            name = "markdown"
+        if name in EXPORT_FORMATS and name not in formats:
+            formats.append(name)
+    return formats
@@ -0,0 +1,65 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator, Iterable, Iterator
+
+from models import CompactResult, ExtractionResult
+
+# Exporters only read attributes, so the pipeline's compact results need no conversion
+ExportableResult = ExtractionResult | CompactResult
+
+
+def markdown_pieces(result: ExportableResult) -> Iterable[str]:
+    """The markdown content as page-sized pieces, without joining a compact result's pages."""
+    if isinstance(result, CompactResult):
+        return result.iter_markdown()
+    return (result.markdown_content,)
+
+
+def raw_text_pieces(result: ExportableResult) -> Iterable[str]:
+    if isinstance(result, CompactResult):
+        return result.iter_raw_text()
+    return (result.raw_text,)
+
+
+def default_chunk_size() -> int:
+    # Matches the block size the blob SDK uses for its own chunked uploads
+    return int(os.environ.get("EXPORT_CHUNK_SIZE", str(4 * 1024 * 1024)))
+
+
+def encode_chunks(pieces: Iterable[str], chunk_size: int) -> Iterator[bytes]:
+    """Encode text pieces as UTF-8 and regroup them into chunk_size-byte chunks."""
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece.encode("utf-8")
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def aiter_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Advance a CPU-bound iterator in a worker thread so the event loop keeps serving uploads."""
+    done = object()
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+class StreamingExporter:
+    """Base for exporters that produce their output piece by piece.
+
+    Subclasses implement iter_export; export joins it into one string, iter_bytes regroups
+    it into encoded chunks so an upload never needs the whole export in memory.
+    """
+
+    def iter_export(self, result: ExportableResult) -> Iterator[str]:
+        raise NotImplementedError
+
+    def export(self, result: ExportableResult) -> str:
+        return "".join(self.iter_export(result))
+
+    def iter_bytes(self, result: ExportableResult, chunk_size: int | None = None) -> Iterator[bytes]:
+        return encode_chunks(self.iter_export(result), chunk_size or default_chunk_size())
@@ -1,56 +1,139 @@
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-from models import ExtractionResult
+import re
+from collections.abc import Iterable, Iterator
 
+from .streaming import ExportableResult, StreamingExporter, raw_text_pieces
 
-class XmlExporter:
-    def export(self, result: ExtractionResult) -> str:
-        root = ET.Element("extraction")
-        root.set("document_id", result.document_id)
-        root.set("extracted_at", result.extracted_at.isoformat())
-        root.set("model_version", result.model_version)
+# Characters XML 1.0 cannot represent, even as character references
+_INVALID_XML_CHARS = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
 
-        metadata = ET.SubElement(root, "metadata")
-        ET.SubElement(metadata, "page_count").text = str(result.page_count)
-        ET.SubElement(metadata, "processing_time_ms").text = str(result.processing_time_ms)
 
-        confidence_elem = ET.SubElement(metadata, "confidence")
-        ET.SubElement(confidence_elem, "overall").text = f"{result.confidence.overall:.3f}"
-        ET.SubElement(confidence_elem, "is_low_confidence").text = str(result.confidence.is_low_confidence).lower()
+def _escape(data: str) -> str:
+    # Same replacements, in the same order, as xml.dom.minidom uses when writing
+    return data.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+
+def _check(data: str) -> str:
+    match = _INVALID_XML_CHARS.search(data)
+    if match:
+        raise ValueError(f"Character {match.group()!r} cannot be represented in XML")
+    return data
+
+
+def _text(data: str) -> str:
+    # The previous exporter re-parsed its output, and XML parsers normalise line endings in
+    # text; attribute values survived as character references, so those are left alone
+    return _escape(_check(data).replace("\r\n", "\n").replace("\r", "\n"))
+
+
+def _iter_text(pieces: Iterable[str]) -> Iterator[str]:
+    # Escapes text split into pieces as _text would the joined string; a trailing '\r' is
+    # held back in case the next piece starts with the '\n' of a '\r\n'
+    pending = ""
+    for piece in pieces:
+        piece = pending + piece
+        pending = "\r" if piece.endswith("\r") else ""
+        if pending:
+            piece = piece[:-1]
+        if piece:
+            yield _text(piece)
+    if pending:
+        yield "\n"
+
+
+class XmlExporter(StreamingExporter):
+    """Writes the XML export in one pass, element by element.
+
+    With the default indent the output is byte-for-byte what ElementTree followed by
+    minidom's toprettyxml produced; indent=None writes the same document without
+    whitespace between elements.
+    """
+
+    def __init__(self, indent: str | None = "  "):
+        self.indent = indent
+
+    def iter_export(self, result: ExportableResult) -> Iterator[str]:
+        pretty = self.indent is not None
+        newline = "\n" if pretty else ""
+        step = self.indent or ""
+
+        def open_tag(depth: int, tag: str, attrs: dict[str, str] | None = None, empty: bool = False) -> str:
+            attributes = "".join(f' {name}="{_escape(_check(value))}"' for name, value in (attrs or {}).items())
+            return f"{step * depth}<{tag}{attributes}{'/' if empty else ''}>{newline}"
+
+        def close_tag(depth: int, tag: str) -> str:
+            return f"{step * depth}</{tag}>{newline}"
+
+        def leaf(depth: int, tag: str, text: str | None) -> str:
+            if not text:
+                return f"{step * depth}<{tag}/>{newline}"
+            return f"{step * depth}<{tag}>{_text(text)}</{tag}>{newline}"
+
+        yield '<?xml version="1.0" ?>' + newline
+        yield open_tag(0, "extraction", {
+            "document_id": result.document_id,
+            "extracted_at": result.extracted_at.isoformat(),
+            "model_version": result.model_version
+        })
+
+        yield open_tag(1, "metadata")
+        yield leaf(2, "page_count", str(result.page_count))
+        yield leaf(2, "processing_time_ms", str(result.processing_time_ms))
+        yield open_tag(2, "confidence")
+        yield leaf(3, "overall", f"{result.confidence.overall:.3f}")
+        yield leaf(3, "is_low_confidence", str(result.confidence.is_low_confidence).lower())
+        yield close_tag(2, "confidence")
+        yield close_tag(1, "metadata")
 
         if result.fields:
-            fields_elem = ET.SubElement(root, "fields")
+            yield open_tag(1, "fields")
             for field in result.fields:
-                field_elem = ET.SubElement(fields_elem, "field")
-                field_elem.set("confidence", f"{field.confidence:.2f}")
-                ET.SubElement(field_elem, "name").text = field.name
-                ET.SubElement(field_elem, "value").text = str(field.value)
+                yield open_tag(2, "field", {"confidence": f"{field.confidence:.2f}"})
+                yield leaf(3, "name", field.name)
+                yield leaf(3, "value", str(field.value))
+                yield close_tag(2, "field")
+            yield close_tag(1, "fields")
 
         if result.tables:
-            tables_elem = ET.SubElement(root, "tables")
+            yield open_tag(1, "tables")
             for i, table in enumerate(result.tables):
-                table_elem = ET.SubElement(tables_elem, "table")
-                table_elem.set("index", str(i))
+                if not isinstance(table, dict):
+                    # Compact results are not validated; anything else is written as an empty table
+                    yield open_tag(2, "table", {"index": str(i)}, empty=True)
+                    continue
+                headers = table.get("headers", [])
+                rows = table.get("rows", [])
 
-                if isinstance(table, dict):
-                    headers = table.get("headers", [])
-                    rows = table.get("rows", [])
+                yield open_tag(2, "table", {"index": str(i)})
+                if headers:
+                    yield open_tag(3, "headers")
+                    for h in headers:
+                        yield leaf(4, "header", str(h))
+                    yield close_tag(3, "headers")
 
-                    if headers:
-                        headers_elem = ET.SubElement(table_elem, "headers")
-                        for h in headers:
-                            ET.SubElement(headers_elem, "header").text = str(h)
-
-                    rows_elem = ET.SubElement(table_elem, "rows")
+                if rows:
+                    yield open_tag(3, "rows")
                     for row in rows:
-                        row_elem = ET.SubElement(rows_elem, "row")
+                        if not row:
+                            yield f"{step * 4}<row/>{newline}"
+                            continue
+                        yield open_tag(4, "row")
                         for cell in row:
-                            ET.SubElement(row_elem, "cell").text = str(cell)
-
-        content = ET.SubElement(root, "content")
-        raw_text = ET.SubElement(content, "raw_text")
-        raw_text.text = result.raw_text
+                            yield leaf(5, "cell", str(cell))
+                        yield close_tag(4, "row")
+                    yield close_tag(3, "rows")
+                else:
+                    yield f"{step * 3}<rows/>{newline}"
+                yield close_tag(2, "table")
+            yield close_tag(1, "tables")
 
-        rough_string = ET.tostring(root, encoding="unicode")
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
+        yield open_tag(1, "content")
+        raw_text = [piece for piece in raw_text_pieces(result) if piece]
+        if raw_text:
+            # Written a page at a time rather than escaping the whole text at once
+            yield f"{step * 2}<raw_text>"
+            yield from _iter_text(raw_text)
+            yield f"</raw_text>{newline}"
+        else:
+            yield leaf(2, "raw_text", None)
+        yield close_tag(1, "content")
+        yield close_tag(0, "extraction")
@@ -1,33 +1,31 @@
+import asyncio
 import json
 import logging
 import os
-import azure.functions as func
-from azure.keyvault.secrets import SecretClient
-from azure.identity import DefaultAzureCredential
+import zipfile
 
-from ocr import process_document
-from utils import BlobStorageHelper, EventGridPublisher
+from utils import startup_profile
 
-app = func.FunctionApp()
+# Must run before the heavier imports below so their load time is captured
+startup_profile.install_if_enabled()
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+import azure.functions as func
 
+app = func.FunctionApp()
 
-def _load_mistral_credentials():
-    key_vault_uri = os.environ.get("KEY_VAULT_URI")
-    if key_vault_uri:
-        try:
-            credential = DefaultAzureCredential()
-            client = SecretClient(vault_url=key_vault_uri, credential=credential)
-            api_key = client.get_secret("MistralApiKey").value
-            os.environ["MISTRAL_API_KEY"] = api_key
-            logger.info("Loaded Mistral API key from Key Vault")
-        except Exception as e:
-            logger.warning(f"Could not load from Key Vault: {e}")
+MAX_PAGE_SIZE = 1000
+# Largest slice one ranged export response holds in memory; clients resume from Content-Range
+MAX_RANGE_BYTES = int(os.environ.get("EXPORT_MAX_RANGE_BYTES", str(8 * 1024 * 1024)))
+# Seconds clients are asked to wait between polls of a job's status
+JOB_RETRY_AFTER = int(os.environ.get("JOB_RETRY_AFTER", "2"))
+# Most files one POST /batches request may carry, counting zip archive members
+MAX_BATCH_FILES = int(os.environ.get("BATCH_MAX_FILES", "1000"))
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-_load_mistral_credentials()
+# The OCR pipeline and Azure SDK clients are imported inside the functions that need
+# them, so cold starts and /health do not pay for loading them.
 
 
 @app.blob_trigger(
@@ -36,40 +34,103 @@ _load_mistral_credentials()
     connection="AzureWebJobsStorage"
 )
 async def document_processor(blob: func.InputStream):
+    from ocr import process_document
+    from ocr.worker import reject_document
+    from utils import get_event_publisher, get_storage_helper
+    from utils.admission import get_admission_scheduler
+    from utils.memory_budget import DocumentTooLarge
+    from utils.queues import ingest_mode
+    from utils.spool import spool_reader
+
+    startup_profile.mark_request("document_processor")
     blob_name = blob.name.replace("landing-zone/", "") if blob.name else "unknown"
+    if ingest_mode() != "blob":
+        # document_queue_processor handles it; also set AzureWebJobs.document_processor.Disabled
+        # so the host stops scanning the container
+        logger.info(f"INGEST_MODE is {ingest_mode()}, leaving {blob_name} to the queue worker")
+        return
     logger.info(f"Blob trigger fired for: {blob_name}, Size: {blob.length} bytes")
 
-    try:
-        blob_content = blob.read()
+    metadata = blob.metadata or {}
+    size = blob.length or 0
 
-        storage_helper = BlobStorageHelper()
-        event_publisher = EventGridPublisher()
+    try:
+        storage_helper = get_storage_helper()
+        event_publisher = get_event_publisher()
 
         properties = {
-            "content_type": blob.metadata.get("content_type", "application/pdf") if blob.metadata else "application/pdf",
-            "size": blob.length or 0
+            "content_type": metadata.get("content_type", "application/pdf"),
+            "size": size
         }
 
-        result = await process_document(
-            blob_name=blob_name,
-            blob_content=blob_content,
-            blob_properties=properties,
-            storage_helper=storage_helper,
-            event_publisher=event_publisher
-        )
+        # Waits for room in the document's lane, or raises so the host retries the blob later
+        async with get_admission_scheduler().admit(size, properties["content_type"]):
+            # Large blobs are copied to a memory-mapped temp file rather than a second buffer
+            with await asyncio.to_thread(spool_reader, blob.read, size) as document:
+                result = await process_document(
+                    blob_name=blob_name,
+                    blob_content=document.data,
+                    blob_properties=properties,
+                    storage_helper=storage_helper,
+                    event_publisher=event_publisher,
+                    # Set by POST /upload, absent for files dropped straight into the container
+                    job_id=metadata.get("job_id")
+                )
 
         logger.info(f"Document processed successfully: {result['document']['id']}")
 
-        await storage_helper.close()
-        await event_publisher.close()
+    except DocumentTooLarge as e:
+        # Retrying cannot help, so fail the job and let the trigger complete
+        await reject_document(blob_name, metadata.get("job_id"), e)
 
     except Exception as e:
-        logger.error(f"Error processing blob {blob_name}: {str(e)}")
+        logger.error(f"Error processing blob {blob_name}: {e}")
+        raise
+
+
+@app.queue_trigger(
+    arg_name="msg",
+    queue_name="document-ingest",
+    connection="AzureWebJobsStorage"
+)
+async def document_queue_processor(msg: func.QueueMessage):
+    """Process one landing-zone file per message; parallelism, retries and poison handling are set in host.json."""
+    from ocr.worker import (
+        handle_ingest_message,
+        ingest_max_dequeue_count,
+        mark_poisoned,
+    )
+    from utils import get_event_publisher, get_storage_helper
+
+    startup_profile.mark_request("document_queue_processor")
+    content = msg.get_body().decode("utf-8")
+    logger.info(f"Queue trigger fired for message {msg.id}, attempt {msg.dequeue_count}")
+
+    try:
+        result = await handle_ingest_message(
+            content,
+            storage_helper=get_storage_helper(),
+            event_publisher=get_event_publisher()
+        )
+        if result is not None:
+            logger.info(f"Document processed successfully: {result['document']['id']}")
+
+    except Exception as e:
+        logger.error(f"Error processing message {msg.id}: {e}")
+        if (msg.dequeue_count or 1) >= ingest_max_dequeue_count():
+            # Last attempt: the host moves the message to document-ingest-poison
+            await mark_poisoned(content, e)
         raise
 
 
 @app.route(route="upload", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
 async def upload_document(req: func.HttpRequest) -> func.HttpResponse:
+    """Store the file in the landing zone and return 202; the blob trigger processes it."""
+    from utils import get_storage_helper
+    from utils.jobs import FAILED, get_job_store, landing_blob_name, new_job_id
+    from utils.queues import get_ingest_queue, ingest_message, ingest_mode
+
+    startup_profile.mark_request("upload")
     logger.info("Upload endpoint called")
 
     try:
@@ -91,68 +152,305 @@ async def upload_document(req: func.HttpRequest) -> func.HttpResponse:
             content_type = file.content_type or "application/pdf"
             file_content = file.read()
 
-        storage_helper = BlobStorageHelper()
-        event_publisher = EventGridPublisher()
+        storage_helper = get_storage_helper()
+        jobs = get_job_store()
+
+        # The record exists before the blob, so the worker always finds it
+        job_id = new_job_id()
+        blob_name = landing_blob_name(job_id, filename)
+        job = await jobs.create(
+            filename=filename,
+            blob_name=blob_name,
+            content_type=content_type,
+            size=len(file_content),
+            job_id=job_id
+        )
+        try:
+            await storage_helper.upload_blob(
+                container=storage_helper.landing_zone_container,
+                blob_name=blob_name,
+                data=file_content,
+                content_type=content_type,
+                metadata={"job_id": job["id"], "content_type": content_type}
+            )
+            if ingest_mode() == "queue":
+                await get_ingest_queue().send(ingest_message(blob_name, job["id"], content_type))
+        except Exception as e:
+            await jobs.update(job["id"], status=FAILED, error=f"Upload failed: {e}")
+            raise
+
+        status_url = f"/api/jobs/{job['id']}"
+        return func.HttpResponse(
+            json.dumps({**job, "status_url": status_url}),
+            status_code=202,
+            mimetype="application/json",
+            headers={
+                "Location": status_url,
+                "Retry-After": str(JOB_RETRY_AFTER),
+                "Access-Control-Expose-Headers": "Location, Retry-After"
+            }
+        )
+
+    except Exception as e:
+        logger.exception("Upload error")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
+            mimetype="application/json"
+        )
 
-        properties = {
-            "content_type": content_type,
-            "size": len(file_content)
-        }
 
-        result = await process_document(
-            blob_name=filename,
-            blob_content=file_content,
-            blob_properties=properties,
-            storage_helper=storage_helper,
-            event_publisher=event_publisher
+@app.route(route="jobs/{job_id}", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
+async def get_job(req: func.HttpRequest) -> func.HttpResponse:
+    from utils.jobs import PENDING, PROCESSING, get_job_store
+
+    startup_profile.mark_request("jobs/{job_id}")
+    job_id = req.route_params.get("job_id", "")
+
+    try:
+        job = await get_job_store().get(job_id)
+    except Exception as e:
+        logger.exception("Get job error")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
+            mimetype="application/json"
         )
 
-        await storage_helper.close()
-        await event_publisher.close()
+    if job is None:
+        return func.HttpResponse(
+            json.dumps({"error": f"Job not found: {job_id}"}),
+            status_code=404,
+            mimetype="application/json"
+        )
+
+    headers = {"Cache-Control": "no-store", "Access-Control-Expose-Headers": "Retry-After"}
+    if job["status"] in (PENDING, PROCESSING):
+        headers["Retry-After"] = str(JOB_RETRY_AFTER)
+    return func.HttpResponse(
+        json.dumps(job),
+        status_code=200,
+        mimetype="application/json",
+        headers=headers
+    )
+
+
+@app.route(route="batches", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+async def upload_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """Accept many files, as multipart parts or zip archives, and return 202 with a job per file."""
+    from utils import get_storage_helper
+    from utils.ingest import (
+        IngestEntry,
+        ingest_entries,
+        is_zip,
+        iter_zip_entries,
+        unique_names,
+    )
+    from utils.jobs import FAILED, get_job_store, landing_blob_name, new_job_id
+    from utils.queues import get_ingest_queue, ingest_message, ingest_mode
+
+    startup_profile.mark_request("batches")
+    logger.info("Batch upload endpoint called")
+
+    def iter_entries():
+        files = [part for key in req.files for part in req.files.getlist(key)]
+        if not files:
+            # A bare application/zip body
+            yield from iter_zip_entries(req.get_body())
+            return
+        for part in files:
+            if is_zip(part.filename, part.content_type):
+                yield from iter_zip_entries(part.read())
+            else:
+                yield IngestEntry(part.filename, part.content_type or "application/pdf", part.read)
 
+    try:
+        if not req.files and not is_zip(None, req.headers.get("Content-Type")):
+            return func.HttpResponse(
+                json.dumps({"error": "Send files as multipart/form-data or a single application/zip body"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+
+        # Listing reads only multipart headers and zip central directories, so a batch that
+        # is too large or holds a corrupt archive is refused before anything is stored
+        try:
+            entries = list(iter_entries())
+        except zipfile.BadZipFile as e:
+            return func.HttpResponse(
+                json.dumps({"error": f"Invalid zip archive: {e}"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        if len(entries) > MAX_BATCH_FILES:
+            return func.HttpResponse(
+                json.dumps({"error": f"A batch may contain at most {MAX_BATCH_FILES} files, got {len(entries)}"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        if not entries:
+            return func.HttpResponse(
+                json.dumps({"error": "No files provided"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+
+        storage_helper = get_storage_helper()
+        jobs = get_job_store()
+        batch_id = new_job_id()
+
+        async def store(entry: IngestEntry, content: bytes) -> dict:
+            job_id = new_job_id()
+            blob_name = landing_blob_name(job_id, entry.filename)
+            job = await jobs.create(
+                filename=entry.filename,
+                blob_name=blob_name,
+                content_type=entry.content_type,
+                size=len(content),
+                batch_id=batch_id,
+                job_id=job_id
+            )
+            try:
+                await storage_helper.upload_blob(
+                    container=storage_helper.landing_zone_container,
+                    blob_name=blob_name,
+                    data=content,
+                    content_type=entry.content_type,
+                    metadata={"job_id": job["id"], "batch_id": batch_id, "content_type": entry.content_type}
+                )
+                if ingest_mode() == "queue":
+                    await get_ingest_queue().send(
+                        ingest_message(blob_name, job["id"], entry.content_type, batch_id)
+                    )
+            except Exception as e:
+                await jobs.update(job["id"], status=FAILED, error=f"Upload failed: {e}")
+                raise
+            return {"filename": entry.filename, "job_id": job["id"]}
+
+        files = await ingest_entries(unique_names(entries), store)
+        await jobs.create_batch(batch_id, files)
+        status_url = f"/api/batches/{batch_id}"
         return func.HttpResponse(
-            json.dumps(result),
-            status_code=200,
+            json.dumps({
+                "id": batch_id,
+                "total": len(files),
+                "accepted": sum(1 for f in files if f.get("job_id")),
+                "files": [
+                    {**f, "status_url": f"/api/jobs/{f['job_id']}"} if f.get("job_id") else f
+                    for f in files
+                ],
+                "status_url": status_url
+            }),
+            status_code=202,
+            mimetype="application/json",
+            headers={
+                "Location": status_url,
+                "Retry-After": str(JOB_RETRY_AFTER),
+                "Access-Control-Expose-Headers": "Location, Retry-After"
+            }
+        )
+
+    except Exception as e:
+        logger.exception("Batch upload error")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
             mimetype="application/json"
         )
 
+
+@app.route(route="batches/{batch_id}", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
+async def get_batch(req: func.HttpRequest) -> func.HttpResponse:
+    from utils.jobs import PENDING, PROCESSING, get_job_store
+
+    startup_profile.mark_request("batches/{batch_id}")
+    batch_id = req.route_params.get("batch_id", "")
+
+    try:
+        batch = await get_job_store().get_batch_status(batch_id)
     except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
+        logger.exception("Get batch error")
         return func.HttpResponse(
             json.dumps({"error": str(e)}),
             status_code=500,
             mimetype="application/json"
         )
 
+    if batch is None:
+        return func.HttpResponse(
+            json.dumps({"error": f"Batch not found: {batch_id}"}),
+            status_code=404,
+            mimetype="application/json"
+        )
+
+    headers = {"Cache-Control": "no-store", "Access-Control-Expose-Headers": "Retry-After"}
+    if batch["status"] in (PENDING, PROCESSING):
+        headers["Retry-After"] = str(JOB_RETRY_AFTER)
+    return func.HttpResponse(
+        json.dumps(batch),
+        status_code=200,
+        mimetype="application/json",
+        headers=headers
+    )
+
 
 @app.route(route="documents", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
 async def list_documents(req: func.HttpRequest) -> func.HttpResponse:
+    from utils import get_manifest_index, get_storage_helper
+
+    startup_profile.mark_request("documents")
     logger.info("List documents endpoint called")
 
     try:
-        storage_helper = BlobStorageHelper()
-        results = await storage_helper.list_results()
-        await storage_helper.close()
+        limit = int(req.params.get("limit", "100"))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return func.HttpResponse(
+            json.dumps({"error": f"limit must be an integer between 1 and {MAX_PAGE_SIZE}"}),
+            status_code=400,
+            mimetype="application/json"
+        )
+
+    try:
+        manifest = get_manifest_index()
+        # Until manifest_compactor has backfilled the index it misses older documents
+        if manifest is not None and await manifest.is_backfilled():
+            return await _list_documents_from_manifest(req, manifest, limit)
+
+        storage_helper = get_storage_helper()
+        results, continuation = await storage_helper.list_results_page(
+            prefix=req.params.get("prefix", ""),
+            limit=limit,
+            continuation=req.params.get("continuation") or None
+        )
 
+        # A document's exports can straddle two pages; clients merge entries by id
         documents = {}
         for result in results:
-            base_name = result["name"].rsplit(".", 1)[0]
+            if result["name"].endswith(".result.json"):
+                base_name, ext = result["name"][:-len(".result.json")], "result"
+            else:
+                base_name = result["name"].rsplit(".", 1)[0]
+                ext = result["name"].rsplit(".", 1)[-1]
             if base_name not in documents:
                 documents[base_name] = {
                     "id": base_name,
                     "exports": {}
                 }
-            ext = result["name"].rsplit(".", 1)[-1]
             documents[base_name]["exports"][ext] = result
 
         return func.HttpResponse(
-            json.dumps({"documents": list(documents.values())}),
+            json.dumps({
+                "documents": list(documents.values()),
+                "continuation": continuation
+            }),
             status_code=200,
             mimetype="application/json"
         )
 
     except Exception as e:
-        logger.error(f"List documents error: {str(e)}")
+        logger.exception("List documents error")
         return func.HttpResponse(
             json.dumps({"error": str(e)}),
             status_code=500,
@@ -160,29 +458,59 @@ async def list_documents(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+async def _list_documents_from_manifest(req: func.HttpRequest, manifest, limit: int) -> func.HttpResponse:
+    try:
+        min_confidence = req.params.get("min_confidence")
+        documents, continuation = await manifest.query(
+            status=req.params.get("status") or None,
+            min_confidence=float(min_confidence) if min_confidence else None,
+            prefix=req.params.get("prefix", ""),
+            sort=req.params.get("sort", "processed_at"),
+            descending=req.params.get("order", "desc").lower() != "asc",
+            limit=limit,
+            continuation=req.params.get("continuation") or None
+        )
+    except ValueError as e:
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=400,
+            mimetype="application/json"
+        )
+
+    return func.HttpResponse(
+        json.dumps({
+            "documents": documents,
+            "continuation": continuation
+        }),
+        status_code=200,
+        mimetype="application/json"
+    )
+
+
 @app.route(route="documents/{doc_id}", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
 async def get_document(req: func.HttpRequest) -> func.HttpResponse:
+    from exporters import export_mode, get_export_renderer
+    from utils import get_storage_helper
+    from utils.read_cache import get_read_cache
+
+    startup_profile.mark_request("documents/{doc_id}")
     doc_id = req.route_params.get("doc_id", "")
     logger.info(f"Get document endpoint called for: {doc_id}")
 
     try:
-        storage_helper = BlobStorageHelper()
-
-        json_content = await storage_helper.download_blob(
-            container=storage_helper.extracted_data_container,
-            blob_name=f"{doc_id}.json"
-        )
-
-        await storage_helper.close()
+        if export_mode() == "lazy":
+            blob = await get_export_renderer().get(doc_id, "json")
+        else:
+            storage_helper = get_storage_helper()
+            blob = await get_read_cache().get(
+                container=storage_helper.extracted_data_container,
+                blob_name=f"{doc_id}.json"
+            )
 
-        return func.HttpResponse(
-            json_content,
-            status_code=200,
-            mimetype="application/json"
-        )
+        return _cached_blob_response(req, blob, mimetype="application/json")
 
-    except Exception as e:
-        logger.error(f"Get document error: {str(e)}")
+    except Exception:
+        logger.exception("Get document error")
         return func.HttpResponse(
             json.dumps({"error": f"Document not found: {doc_id}"}),
             status_code=404,
@@ -190,8 +518,34 @@ async def get_document(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+def _cached_blob_response(req: func.HttpRequest, blob, mimetype: str, headers: dict | None = None) -> func.HttpResponse:
+    from utils.read_cache import is_not_modified, representation, validator_headers
+
+    accept_encoding = req.headers.get("Accept-Encoding")
+    variant = representation(blob, accept_encoding, decode=False)
+    headers = {**(headers or {}), **validator_headers(variant)}
+    if is_not_modified(req.headers, variant):
+        return func.HttpResponse(status_code=304, headers=headers)
+
+    if variant is not blob:
+        # Client cannot take the stored coding, so this is the only case that decompresses
+        variant = representation(blob, accept_encoding)
+
+    return func.HttpResponse(
+        variant.content,
+        status_code=200,
+        mimetype=mimetype,
+        headers=headers
+    )
+
+
 @app.route(route="documents/{doc_id}/export", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
 async def export_document(req: func.HttpRequest) -> func.HttpResponse:
+    from exporters import export_mode, get_export_renderer
+    from utils import get_storage_helper
+    from utils.read_cache import get_read_cache
+
+    startup_profile.mark_request("documents/{doc_id}/export")
     doc_id = req.route_params.get("doc_id", "")
     format_type = req.params.get("format", "json")
     logger.info(f"Export document endpoint called for: {doc_id}, format: {format_type}")
@@ -214,41 +568,195 @@ async def export_document(req: func.HttpRequest) -> func.HttpResponse:
     mime_type, ext = format_map[format_type]
 
     try:
-        storage_helper = BlobStorageHelper()
+        storage_helper = get_storage_helper()
+        headers = {
+            "Content-Disposition": f"attachment; filename={doc_id}.{ext}",
+            "Accept-Ranges": "bytes",
+            "Access-Control-Expose-Headers": "Content-Range, Accept-Ranges, ETag, Last-Modified"
+        }
 
-        content = await storage_helper.download_blob(
-            container=storage_helper.extracted_data_container,
-            blob_name=f"{doc_id}.{ext}"
+        if export_mode() == "lazy":
+            blob = await get_export_renderer().get(doc_id, "markdown" if ext == "md" else ext)
+            # Byte ranges of a compressed body cannot be decoded on their own; send it whole
+            if req.headers.get("Range") and not blob.content_encoding:
+                response = await _ranged_response(
+                    req,
+                    size=len(blob.content),
+                    etag=blob.etag,
+                    read_range=lambda start, length: _slice(blob.content, start, length),
+                    mimetype=mime_type,
+                    headers=headers
+                )
+                if response is not None:
+                    return response
+            return _cached_blob_response(req, blob, mimetype=mime_type, headers=headers)
+
+        container = storage_helper.extracted_data_container
+        blob_name = f"{doc_id}.{ext}"
+        read_cache = get_read_cache()
+
+        props = None
+        # A cached body is small by construction; otherwise check the size before downloading
+        if req.headers.get("Range") or (container, blob_name) not in read_cache:
+            props = await storage_helper.get_blob_properties(container, blob_name)
+
+        # Byte ranges of a compressed body cannot be decoded on their own; send it whole
+        if req.headers.get("Range") and not props.get("content_encoding"):
+            response = await _ranged_response(
+                req,
+                size=props["size"],
+                etag=props.get("etag"),
+                read_range=lambda start, length: _read_blob_range(storage_helper, container, blob_name, start, length),
+                mimetype=mime_type,
+                headers=headers
+            )
+            if response is not None:
+                return response
+
+        if props is not None and props["size"] > read_cache.max_entry_bytes:
+            return await _uncached_blob_response(
+                req, storage_helper, container, blob_name, props, mimetype=mime_type, headers=headers
+            )
+
+        blob = await read_cache.get(container=container, blob_name=blob_name)
+
+        return _cached_blob_response(req, blob, mimetype=mime_type, headers=headers)
+
+    except Exception:
+        logger.exception("Export document error")
+        return func.HttpResponse(
+            json.dumps({"error": f"Export not found: {doc_id}.{ext}"}),
+            status_code=404,
+            mimetype="application/json"
         )
 
-        await storage_helper.close()
 
-        return func.HttpResponse(
-            content,
-            status_code=200,
-            mimetype=mime_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={doc_id}.{ext}"
-            }
-        )
+async def _ranged_response(
+    req: func.HttpRequest,
+    size: int,
+    etag: str | None,
+    read_range,
+    mimetype: str,
+    headers: dict
+) -> func.HttpResponse | None:
+    """Serve a Range request as 206, or return None to fall back to the full body."""
+    from utils.http_ranges import RangeNotSatisfiable, content_range, parse_range
 
-    except Exception as e:
-        logger.error(f"Export document error: {str(e)}")
+    # If-Range: the client's partial copy is stale, so send the whole current body
+    if_range = req.headers.get("If-Range")
+    if if_range and if_range.strip() != etag:
+        return None
+
+    try:
+        byte_range = parse_range(req.headers.get("Range"), size, max_length=MAX_RANGE_BYTES)
+    except RangeNotSatisfiable:
         return func.HttpResponse(
-            json.dumps({"error": f"Export not found: {doc_id}.{ext}"}),
-            status_code=404,
-            mimetype="application/json"
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
         )
+    if byte_range is None:
+        return None
+
+    start, end = byte_range
+    return func.HttpResponse(
+        await read_range(start, end - start + 1),
+        status_code=206,
+        mimetype=mimetype,
+        headers={
+            **headers,
+            "Content-Range": content_range(start, end, size),
+            "ETag": etag or ""
+        }
+    )
+
+
+async def _uncached_blob_response(
+    req: func.HttpRequest,
+    storage_helper,
+    container: str,
+    blob_name: str,
+    props: dict,
+    mimetype: str,
+    headers: dict
+) -> func.HttpResponse:
+    """Send a blob too large for the read cache, read chunk by chunk and not kept afterwards.
+
+    A conditional request is answered from the properties, before anything is downloaded.
+    """
+    from utils.read_cache import (
+        CachedBlob,
+        is_not_modified,
+        representation,
+        validator_headers,
+    )
+
+    blob = CachedBlob(
+        content=b"",
+        etag=props.get("etag") or "",
+        last_modified=props.get("last_modified"),
+        content_type=props.get("content_type"),
+        checked_at=0.0,
+        metadata=props.get("metadata") or {},
+        content_encoding=props.get("content_encoding")
+    )
+    variant = representation(blob, req.headers.get("Accept-Encoding"), decode=False)
+    if is_not_modified(req.headers, variant):
+        return func.HttpResponse(status_code=304, headers={**headers, **validator_headers(variant)})
+
+    blob.content = b"".join([chunk async for chunk in storage_helper.iter_blob_chunks(container, blob_name)])
+    return _cached_blob_response(req, blob, mimetype=mimetype, headers=headers)
+
+
+async def _read_blob_range(storage_helper, container: str, blob_name: str, start: int, length: int) -> bytes:
+    chunks = [
+        chunk async for chunk in storage_helper.iter_blob_chunks(container, blob_name, offset=start, length=length)
+    ]
+    return b"".join(chunks)
+
+
+async def _slice(content: bytes, start: int, length: int) -> bytes:
+    return content[start:start + length]
+
+
+@app.timer_trigger(
+    arg_name="timer",
+    schedule="0 */15 * * * *",
+    run_on_startup=False
+)
+async def manifest_compactor(timer: func.TimerRequest):
+    from utils import get_manifest_index, get_storage_helper
+
+    manifest = get_manifest_index()
+    if manifest is None:
+        return
+
+    try:
+        if not await manifest.is_backfilled():
+            await manifest.backfill(get_storage_helper())
+        await manifest.compact()
+    except Exception:
+        logger.exception("Manifest compaction error")
 
 
 @app.route(route="health", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
 def health_check(req: func.HttpRequest) -> func.HttpResponse:
+    from utils.admission import admission_stats
+
+    startup_profile.mark_request("health")
+    body = {
+        "status": "healthy",
+        "service": "document-processor",
+        "version": "1.0.0"
+    }
+    if startup_profile.is_enabled():
+        body["startup"] = startup_profile.get_report()
+    # Lane occupancy and queue-wait times once this instance has processed a document
+    admission = admission_stats()
+    if admission is not None:
+        body["admission"] = admission
+
     return func.HttpResponse(
-        json.dumps({
-            "status": "healthy",
-            "service": "document-processor",
-            "version": "1.0.0"
-        }),
+        json.dumps(body),
         status_code=200,
         mimetype="application/json"
     )
@@ -1,5 +1,6 @@
 from .document import Document, DocumentStatus, DocumentType
 from .extraction_result import ExtractionResult, ExtractedField, ExtractionConfidence
+from .compact import PAGE_SEPARATOR, CompactResult, FieldRecord, result_to_json
 
 __all__ = [
     "Document",
@@ -8,4 +9,8 @@ __all__ = [
     "ExtractionResult",
     "ExtractedField",
     "ExtractionConfidence",
+    "PAGE_SEPARATOR",
+    "CompactResult",
+    "FieldRecord",
+    "result_to_json",
 ]
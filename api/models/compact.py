@@ -0,0 +1,199 @@
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from typing import Any
+
+import pydantic_core
+
+from .extraction_result import ExtractedField, ExtractionConfidence, ExtractionResult
+
+# Separator between pages of a document's combined markdown
+PAGE_SEPARATOR = "\n\n---\n\n"
+
+
+def _join_pages(pages: list[str]) -> str:
+    # join returns a one-element list's string itself, so single-page text is never copied
+    return PAGE_SEPARATOR.join(pages)
+
+
+def _iter_pages(pages: list[str]) -> Iterator[str]:
+    for i, page in enumerate(pages):
+        if i:
+            yield PAGE_SEPARATOR
+        yield page
+
+
+def _isoformat(value: datetime) -> str:
+    # pydantic writes a zero UTC offset as "Z"
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+@dataclass(slots=True)
+class FieldRecord:
+    """An extracted field without pydantic validation or a per-instance __dict__."""
+
+    name: str
+    value: Any
+    confidence: float = 1.0
+    page_number: int | None = None
+    bounding_box: dict | None = None
+
+    def to_model(self) -> ExtractedField:
+        return ExtractedField(
+            name=self.name,
+            value=self.value,
+            confidence=self.confidence,
+            page_number=self.page_number,
+            bounding_box=self.bounding_box
+        )
+
+
+@dataclass(slots=True)
+class CompactResult:
+    """Internal counterpart of ExtractionResult for the processing pipeline.
+
+    Exposes the same attributes, so exporters take either, but fields are slotted records
+    and tables stay the plain dicts OCR produced. Nothing is validated until to_result()
+    builds the pydantic model at the API boundary; to_dict() and to_json() produce the
+    same document as ExtractionResult without going through it.
+
+    Text is kept as the OCR response's page strings: markdown_content and raw_text join
+    them on access, and iter_markdown()/iter_raw_text() walk them without joining.
+    raw_pages is None when the raw text is the markdown, so it is held once.
+    """
+
+    document_id: str
+    confidence: ExtractionConfidence
+    pages: list[str] = field(default_factory=list)
+    raw_pages: list[str] | None = None
+    fields: list[FieldRecord] = field(default_factory=list)
+    tables: list[dict] = field(default_factory=list)
+    page_count: int = 1
+    processing_time_ms: int = 0
+    extracted_at: datetime = field(default_factory=datetime.utcnow)
+    model_version: str = "mistral-ocr-2503"
+
+    @property
+    def markdown_content(self) -> str:
+        return _join_pages(self.pages)
+
+    @property
+    def raw_text(self) -> str:
+        return _join_pages(self.raw_pages if self.raw_pages is not None else self.pages)
+
+    def iter_markdown(self) -> Iterator[str]:
+        return _iter_pages(self.pages)
+
+    def iter_raw_text(self) -> Iterator[str]:
+        return _iter_pages(self.raw_pages if self.raw_pages is not None else self.pages)
+
+    @classmethod
+    def from_text(cls, markdown_content: str, raw_text: str, **kwargs) -> "CompactResult":
+        """Build from already-combined text, such as a stored result, sharing it when raw equals markdown."""
+        return cls(
+            pages=[markdown_content],
+            raw_pages=None if raw_text == markdown_content else [raw_text],
+            **kwargs
+        )
+
+    @classmethod
+    def from_result(cls, result: ExtractionResult) -> "CompactResult":
+        return cls.from_text(
+            result.markdown_content,
+            result.raw_text,
+            document_id=result.document_id,
+            confidence=result.confidence,
+            fields=[
+                FieldRecord(f.name, f.value, f.confidence, f.page_number, f.bounding_box)
+                for f in result.fields
+            ],
+            tables=result.tables,
+            page_count=result.page_count,
+            processing_time_ms=result.processing_time_ms,
+            extracted_at=result.extracted_at,
+            model_version=result.model_version
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompactResult":
+        """Load the JSON form of an ExtractionResult, such as a stored canonical result."""
+        return cls.from_text(
+            data.get("markdown_content", ""),
+            data.get("raw_text", ""),
+            document_id=data["document_id"],
+            confidence=ExtractionConfidence(**data["confidence"]),
+            fields=[
+                FieldRecord(
+                    f["name"],
+                    f["value"],
+                    f.get("confidence", 1.0),
+                    f.get("page_number"),
+                    f.get("bounding_box")
+                )
+                for f in data.get("fields", [])
+            ],
+            tables=data.get("tables", []),
+            page_count=data.get("page_count", 1),
+            processing_time_ms=data.get("processing_time_ms", 0),
+            extracted_at=datetime.fromisoformat(data["extracted_at"]) if "extracted_at" in data else datetime.now(UTC).replace(tzinfo=None),
+            model_version=data.get("model_version", "mistral-ocr-2503")
+        )
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> "CompactResult":
+        return cls.from_dict(json.loads(data))
+
+    def _dump(self, extracted_at) -> dict:
+        markdown_content = self.markdown_content
+        return {
+            "document_id": self.document_id,
+            "raw_text": markdown_content if self.raw_pages is None else self.raw_text,
+            "markdown_content": markdown_content,
+            "fields": [
+                {
+                    "name": f.name,
+                    "value": f.value,
+                    "confidence": f.confidence,
+                    "page_number": f.page_number,
+                    "bounding_box": f.bounding_box
+                }
+                for f in self.fields
+            ],
+            "tables": self.tables,
+            "confidence": {
+                "overall": self.confidence.overall,
+                "is_low_confidence": self.confidence.is_low_confidence
+            },
+            "page_count": self.page_count,
+            "processing_time_ms": self.processing_time_ms,
+            "extracted_at": extracted_at,
+            "model_version": self.model_version
+        }
+
+    def to_dict(self) -> dict:
+        return self._dump(_isoformat(self.extracted_at))
+
+    def to_json(self) -> str:
+        # pydantic's serialiser writes the same compact JSON as model_dump_json
+        return pydantic_core.to_json(self.to_dict()).decode("utf-8")
+
+    def to_result(self) -> ExtractionResult:
+        # One validation call for the whole document rather than one per field
+        return ExtractionResult.model_validate(self._dump(self.extracted_at))
+
+    def replace(self, **changes) -> "CompactResult":
+        return replace(self, **changes)
+
+    def get_field_value(self, field_name: str) -> Any:
+        for f in self.fields:
+            if f.name.lower() == field_name.lower():
+                return f.value
+        return None
+
+
+def result_to_json(result: ExtractionResult | CompactResult) -> str:
+    if isinstance(result, CompactResult):
+        return result.to_json()
+    return result.model_dump_json()
@@ -1,9 +1,19 @@
 from .mistral_client import MistralOCRClient
 from .extractor import DocumentExtractor
 from .handler import process_document
+from .http_pool import HttpClientPool, get_http_pool, close_http_pool
+from .rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+from .worker import QueueWorker, handle_ingest_message
 
 __all__ = [
     "MistralOCRClient",
     "DocumentExtractor",
     "process_document",
+    "HttpClientPool",
+    "get_http_pool",
+    "close_http_pool",
+    "AdaptiveRateLimiter",
+    "get_rate_limiter",
+    "QueueWorker",
+    "handle_ingest_message",
 ]
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol, TypeVar
+
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from models import CompactResult, ExtractionResult, result_to_json
+from utils.blob_helpers import BlobStorageHelper
+from utils.clients import get_storage_helper
+from utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def document_cache_key(content: bytes, model: str) -> str:
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{model}/{digest}"
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def put(self, key: str, data: bytes): ...
+
+
+class LocalDirectoryCacheBackend:
+    """Persistent cache tier on the local filesystem, mainly for development and tests."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, key: str) -> bytes | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def put(self, key: str, data: bytes):
+        await asyncio.to_thread(self._write, key, data)
+
+
+class BlobCacheBackend:
+    """Persistent cache tier stored as JSON blobs in a dedicated container."""
+
+    def __init__(self, container: str = "ocr-cache", storage_helper: BlobStorageHelper | None = None):
+        self.container = container
+        self.storage_helper = storage_helper or get_storage_helper()
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.storage_helper.download_blob(
+                container=self.container,
+                blob_name=f"{key}.json"
+            )
+        except ResourceNotFoundError:
+            return None
+
+    async def put(self, key: str, data: bytes):
+        await self.storage_helper.upload_blob(
+            container=self.container,
+            blob_name=f"{key}.json",
+            data=data,
+            content_type="application/json"
+        )
+
+
+class OCRResultCache:
+    """Two-tier cache of extraction results keyed by document hash and model."""
+
+    def __init__(self, backend: CacheBackend | None = None, max_entries: int = 128):
+        self.backend = backend
+        self._memory = LRUCache(max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> ExtractionResult | None:
+        return await self._load(key, ExtractionResult.model_validate_json)
+
+    async def get_compact(self, key: str) -> CompactResult | None:
+        return await self._load(key, CompactResult.from_json)
+
+    async def _load(self, key: str, parse: Callable[[bytes], T]) -> T | None:
+        data = self._memory.get(key)
+
+        if data is None and self.backend is not None:
+            try:
+                data = await self.backend.get(key)
+            except (AzureError, OSError) as e:
+                # A broken cache tier must never fail the document
+                logger.warning(f"OCR cache read failed for {key}: {e}")
+                data = None
+
+        result = None
+        if data is not None:
+            try:
+                result = parse(data)
+            except (ValueError, TypeError, KeyError) as e:
+                # A truncated or outdated entry is a miss; the next put() replaces it in both tiers
+                logger.warning(f"Discarding unreadable OCR cache entry {key}: {e}")
+                self._memory.pop(key)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._memory.put(key, data)
+        self.hits += 1
+        return result
+
+    async def put(self, key: str, result: ExtractionResult | CompactResult):
+        data = result_to_json(result).encode("utf-8")
+        self._memory.put(key, data)
+
+        if self.backend is not None:
+            try:
+                await self.backend.put(key, data)
+            except (AzureError, OSError) as e:
+                logger.warning(f"OCR cache write failed for {key}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._memory)
+        }
+
+
+_cache: OCRResultCache | None = None
+
+
+def _backend_from_env() -> CacheBackend | None:
+    backend = os.environ.get("OCR_CACHE_BACKEND", "blob").lower()
+
+    if backend == "local":
+        return LocalDirectoryCacheBackend(os.environ.get("OCR_CACHE_DIR", ".ocr-cache"))
+    if backend == "blob":
+        return BlobCacheBackend(container=os.environ.get("OCR_CACHE_CONTAINER", "ocr-cache"))
+    return None
+
+
+def get_result_cache() -> OCRResultCache:
+    global _cache
+    if _cache is None:
+        _cache = OCRResultCache(
+            backend=_backend_from_env(),
+            max_entries=int(os.environ.get("OCR_CACHE_MAX_ENTRIES", "128"))
+        )
+    return _cache
@@ -1,38 +1,73 @@
+import asyncio
 import logging
+import os
 import time
-from typing import Optional
 
-from models import ExtractionResult, ExtractionConfidence, ExtractedField
+from models import CompactResult, ExtractionConfidence, ExtractionResult, FieldRecord
+from .fields import extract_fields, extract_page_fields
 from .mistral_client import MistralOCRClient
+from .sharding import merge_responses, split_pdf
 
 logger = logging.getLogger(__name__)
 
 
 class DocumentExtractor:
-    def __init__(self, mistral_client: MistralOCRClient):
+    def __init__(
+        self,
+        mistral_client: MistralOCRClient,
+        pages_per_shard: int | None = None,
+        max_concurrent_shards: int | None = None
+    ):
         self.client = mistral_client
         self.confidence_threshold = 0.7
+        # 0 disables sharding and sends every document in a single request
+        self.pages_per_shard = (
+            pages_per_shard if pages_per_shard is not None else int(os.environ.get("OCR_PAGES_PER_SHARD", "25"))
+        )
+        self.max_concurrent_shards = max_concurrent_shards or int(os.environ.get("OCR_MAX_CONCURRENT_SHARDS", "4"))
 
     async def extract(
         self,
         document_id: str,
         file_bytes: bytes,
         content_type: str,
-        filename: Optional[str] = None
+        filename: str | None = None
     ) -> ExtractionResult:
+        result = await self.extract_compact(document_id, file_bytes, content_type, filename)
+        return result.to_result()
+
+    async def extract_compact(
+        self,
+        document_id: str,
+        file_bytes: bytes,
+        content_type: str,
+        filename: str | None = None
+    ) -> CompactResult:
+        """Extract without building pydantic models, for callers that only export the result."""
         start_time = time.time()
 
         try:
-            response = await self.client.extract_from_bytes(
-                file_bytes=file_bytes,
-                content_type=content_type,
-                filename=filename
-            )
-
-            parsed = self.client.parse_response(response)
-
-            fields = self._extract_fields(parsed["markdown_content"])
-            field_confidences = [f.confidence for f in fields] if fields else [parsed["confidence"]]
+            response = await self._run_ocr(file_bytes, content_type, filename)
+
+            # One pass over the response's pages: each page's fields and tables are taken
+            # as it is read, and its markdown is kept as is rather than joined
+            pages = []
+            tables = []
+            fields = []
+            page_confidences = []
+            for page_number, page in enumerate(self.client.iter_pages(response), 1):
+                pages.append(page["markdown"])
+                tables.extend(page["tables"])
+                fields.extend(extract_page_fields(page["markdown"], page_number))
+                if page["confidence"] is not None:
+                    page_confidences.append(page["confidence"])
+
+            if fields:
+                field_confidences = [f.confidence for f in fields]
+            elif page_confidences:
+                field_confidences = [sum(page_confidences) / len(page_confidences)]
+            else:
+                field_confidences = [0.85]
 
             confidence = ExtractionConfidence.calculate(
                 field_confidences,
@@ -41,38 +76,64 @@ class DocumentExtractor:
 
             processing_time = int((time.time() - start_time) * 1000)
 
-            return ExtractionResult(
+            return CompactResult(
                 document_id=document_id,
-                raw_text=parsed["raw_text"],
-                markdown_content=parsed["markdown_content"],
+                pages=pages,
                 fields=fields,
-                tables=parsed["tables"],
+                tables=tables,
                 confidence=confidence,
-                page_count=parsed["page_count"],
+                page_count=len(pages),
                 processing_time_ms=processing_time,
-                model_version=parsed["model"]
+                model_version=response.get("model", self.client.model)
             )
 
         except Exception as e:
-            logger.error(f"Extraction failed for document {document_id}: {str(e)}")
+            logger.error(f"Extraction failed for document {document_id}: {e}")
+            raise
+
+    async def _run_ocr(self, file_bytes: bytes, content_type: str, filename: str | None) -> dict:
+        shards = None
+        if content_type == "application/pdf" and self.pages_per_shard > 0:
+            shards = await asyncio.to_thread(split_pdf, file_bytes, self.pages_per_shard)
+
+        if not shards:
+            return await self.client.extract_from_bytes(
+                file_bytes=file_bytes,
+                content_type=content_type,
+                filename=filename
+            )
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_shards)
+
+        async def run_shard(index: int) -> dict:
+            async with semaphore:
+                # Rendered inside the slot, so at most max_concurrent_shards shards are in memory
+                shard = await asyncio.to_thread(shards.render, index)
+                return await self._extract_shard(index, shard, filename)
+
+        tasks = [asyncio.create_task(run_shard(i)) for i in range(len(shards))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # One failed shard fails the document: stop the others before the caller
+            # releases the document they render from
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return merge_responses([task.result() for task in tasks])
+
+    async def _extract_shard(self, index: int, shard: bytes, filename: str | None) -> dict:
+        # MistralOCRClient retries transient errors with the rate limiter's backoff, and
+        # each shard is its own call, so a failed shard is retried alone there
+        try:
+            return await self.client.extract_from_bytes(
+                file_bytes=shard,
+                content_type="application/pdf",
+                filename=filename
+            )
+        except Exception as e:
+            logger.error(f"Shard {index} of {filename} failed: {e}")
             raise
 
-    def _extract_fields(self, markdown_content: str) -> list[ExtractedField]:
-        fields = []
-        lines = markdown_content.split("\n")
-
-        for line in lines:
-            if ":" in line and not line.startswith("#"):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    name = parts[0].strip().strip("*").strip("-").strip()
-                    value = parts[1].strip().strip("*").strip()
-
-                    if name and value and len(name) < 50:
-                        fields.append(ExtractedField(
-                            name=name,
-                            value=value,
-                            confidence=0.85
-                        ))
-
-        return fields
+    def _extract_fields(self, markdown_content: str, page_count: int | None = None) -> list[FieldRecord]:
+        return extract_fields(markdown_content, page_count=page_count)
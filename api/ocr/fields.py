@@ -0,0 +1,74 @@
+from bisect import bisect_right
+from collections.abc import Iterator
+
+from models import PAGE_SEPARATOR, FieldRecord
+
+MAX_NAME_LENGTH = 50
+DEFAULT_FIELD_CONFIDENCE = 0.85
+
+
+def _page_starts(markdown_content: str, page_count: int | None) -> list[int] | None:
+    if not page_count or page_count < 2:
+        return None
+
+    starts = [0]
+    position = markdown_content.find(PAGE_SEPARATOR)
+    while position != -1:
+        starts.append(position + len(PAGE_SEPARATOR))
+        position = markdown_content.find(PAGE_SEPARATOR, position + len(PAGE_SEPARATOR))
+
+    # A page's own horizontal rules look like separators; only trust an exact count
+    return starts if len(starts) == page_count else None
+
+
+def _scan(markdown_content: str) -> Iterator[tuple[int, str, str]]:
+    """Yield (line start, name, value) for each field line, jumping from colon to colon."""
+    find = markdown_content.find
+    length = len(markdown_content)
+
+    colon = find(":")
+    while colon != -1:
+        line_start = markdown_content.rfind("\n", 0, colon) + 1
+        line_end = find("\n", colon)
+        if line_end == -1:
+            line_end = length
+
+        if not markdown_content.startswith("#", line_start):
+            name = markdown_content[line_start:colon].strip().strip("*").strip("-").strip()
+            value = markdown_content[colon + 1:line_end].strip().strip("*").strip()
+            if name and value and len(name) < MAX_NAME_LENGTH:
+                yield line_start, name, value
+
+        # Only the first colon of a line separates name from value
+        colon = find(":", line_end)
+
+
+def extract_fields(
+    markdown_content: str,
+    page_count: int | None = None,
+    confidence: float = DEFAULT_FIELD_CONFIDENCE
+) -> list[FieldRecord]:
+    """Find "name: value" fields in combined OCR markdown in a single pass over the text.
+
+    The scan jumps from colon to colon, so lines without one are never split out or
+    copied. Lines starting with '#' are skipped, and surrounding whitespace, '*' and '-'
+    markup is dropped from names and '*' markup from values. page_number is set when
+    page_count matches the number of page separators in the text; a single-page
+    document is page 1.
+    """
+    page_starts = _page_starts(markdown_content, page_count)
+    default_page = 1 if page_count == 1 else None
+
+    return [
+        FieldRecord(name, value, confidence, bisect_right(page_starts, line_start) if page_starts else default_page)
+        for line_start, name, value in _scan(markdown_content)
+    ]
+
+
+def extract_page_fields(
+    page_markdown: str,
+    page_number: int,
+    confidence: float = DEFAULT_FIELD_CONFIDENCE
+) -> list[FieldRecord]:
+    """Fields of one page; over every page, the same fields extract_fields finds in the joined text."""
+    return [FieldRecord(name, value, confidence, page_number) for _, name, value in _scan(page_markdown)]
@@ -1,11 +1,20 @@
+import asyncio
 import logging
+import mmap
 import os
 from datetime import datetime
 
-from models import Document, DocumentStatus
+from azure.core.exceptions import AzureError
+from exporters import export_mode, store_canonical_result
+from models import CompactResult, Document, DocumentStatus
 from utils.blob_helpers import BlobStorageHelper
 from utils.eventgrid import EventGridPublisher
+from utils.jobs import JobStore, get_job_store
+from utils.manifest import ManifestIndex, get_manifest_index, utc_timestamp
+from utils.secrets import get_secret_provider
+from .cache import OCRResultCache, document_cache_key, get_result_cache
 from .extractor import DocumentExtractor
+from .http_pool import get_http_pool
 from .mistral_client import MistralOCRClient
 
 logger = logging.getLogger(__name__)
@@ -13,10 +22,14 @@ logger = logging.getLogger(__name__)
 
 async def process_document(
     blob_name: str,
-    blob_content: bytes,
+    blob_content: bytes | mmap.mmap,
     blob_properties: dict,
     storage_helper: BlobStorageHelper,
-    event_publisher: EventGridPublisher | None = None
+    event_publisher: EventGridPublisher | None = None,
+    cache: OCRResultCache | None = None,
+    manifest: ManifestIndex | None = None,
+    job_id: str | None = None,
+    jobs: JobStore | None = None
 ) -> dict:
     document = Document.from_blob_properties(
         blob_name=blob_name,
@@ -24,66 +37,72 @@ async def process_document(
         properties=blob_properties
     )
     document.status = DocumentStatus.PROCESSING
+    base_name = os.path.splitext(document.filename)[0]
+    if manifest is None:
+        manifest = get_manifest_index()
+    if job_id and jobs is None:
+        jobs = get_job_store()
 
     logger.info(f"Processing document: {document.id} ({document.filename})")
+    await _update_job(jobs, job_id, status=DocumentStatus.PROCESSING.value, document_id=base_name)
 
     try:
         mistral_endpoint = os.environ.get("MISTRAL_ENDPOINT", "")
-        mistral_api_key = os.environ.get("MISTRAL_API_KEY", "")
+        mistral_api_key = await get_secret_provider().get("MistralApiKey", env_fallback="MISTRAL_API_KEY")
 
         if not mistral_endpoint or not mistral_api_key:
             raise ValueError("Mistral endpoint and API key must be configured")
 
         client = MistralOCRClient(
             endpoint=mistral_endpoint,
-            api_key=mistral_api_key
+            api_key=mistral_api_key,
+            http_client=get_http_pool().get_client()
         )
-        extractor = DocumentExtractor(client)
 
-        result = await extractor.extract(
-            document_id=document.id,
-            file_bytes=blob_content,
-            content_type=document.content_type or "application/pdf",
-            filename=document.filename
-        )
-
-        from exporters import MarkdownExporter, JsonExporter, CsvExporter, XmlExporter
-
-        base_name = os.path.splitext(document.filename)[0]
-        exports = {}
-
-        md_exporter = MarkdownExporter()
-        exports["markdown"] = await storage_helper.upload_result(
-            f"{base_name}.md",
-            md_exporter.export(result),
-            "text/markdown"
-        )
-
-        json_exporter = JsonExporter()
-        exports["json"] = await storage_helper.upload_result(
-            f"{base_name}.json",
-            json_exporter.export(result),
-            "application/json"
-        )
-
-        if result.tables:
-            csv_exporter = CsvExporter()
-            exports["csv"] = await storage_helper.upload_result(
-                f"{base_name}.csv",
-                csv_exporter.export(result),
-                "text/csv"
+        if cache is None:
+            cache = get_result_cache()
+        # Off the event loop: hashing a large (possibly memory-mapped) document takes a while
+        cache_key = await asyncio.to_thread(document_cache_key, blob_content, client.model)
+        # The result stays compact through caching and exports; only to_dict() below
+        # shapes it for the response
+        result = await cache.get_compact(cache_key)
+        cache_hit = result is not None
+
+        if cache_hit:
+            # Same bytes seen before: reuse the extraction and skip the OCR call
+            logger.info(f"OCR cache hit for document {document.id}")
+            result = result.replace(document_id=document.id)
+        else:
+            extractor = DocumentExtractor(client)
+            result = await extractor.extract_compact(
+                document_id=document.id,
+                file_bytes=blob_content,
+                content_type=document.content_type or "application/pdf",
+                filename=document.filename
             )
+            await cache.put(cache_key, result)
 
-        xml_exporter = XmlExporter()
-        exports["xml"] = await storage_helper.upload_result(
-            f"{base_name}.xml",
-            xml_exporter.export(result),
-            "application/xml"
-        )
+        if export_mode() == "lazy":
+            # Formats are rendered on first download from this one canonical blob
+            exports = {"result": await store_canonical_result(result, base_name, storage_helper)}
+            export_errors = {}
+        else:
+            exports, export_errors = await _upload_exports(result, base_name, storage_helper)
 
         document.status = DocumentStatus.COMPLETED
         document.processed_at = datetime.utcnow()
 
+        await _record_manifest(manifest, base_name, document, result, exports)
+        await _update_job(
+            jobs,
+            job_id,
+            status=DocumentStatus.COMPLETED.value,
+            confidence=result.confidence.overall,
+            page_count=result.page_count,
+            exports=exports,
+            error=None
+        )
+
         if event_publisher:
             await event_publisher.publish_document_processed(
                 document_id=document.id,
@@ -97,13 +116,22 @@ async def process_document(
         return {
             "document": document.to_dict(),
             "extraction": result.to_dict(),
-            "exports": exports
+            "exports": exports,
+            "export_errors": export_errors,
+            "cache": {
+                "hit": cache_hit,
+                **cache.stats()
+            },
+            "throttling": client.rate_limiter.stats()
         }
 
     except Exception as e:
         document.status = DocumentStatus.FAILED
         document.error_message = str(e)
-        logger.error(f"Failed to process document {document.id}: {str(e)}")
+        logger.error(f"Failed to process document {document.id}: {e}")
+
+        await _record_manifest(manifest, base_name, document)
+        await _update_job(jobs, job_id, status=DocumentStatus.FAILED.value, error=str(e))
 
         if event_publisher:
             await event_publisher.publish_document_failed(
@@ -113,3 +141,83 @@ async def process_document(
             )
 
         raise
+
+
+async def _record_manifest(
+    manifest: ManifestIndex | None,
+    base_name: str,
+    document: Document,
+    result: CompactResult | None = None,
+    exports: dict[str, str] | None = None
+):
+    if manifest is None:
+        return
+
+    entry = {
+        "id": base_name,
+        "document_id": document.id,
+        "filename": document.filename,
+        "status": document.status,
+        "confidence": result.confidence.overall if result else None,
+        "page_count": result.page_count if result else None,
+        "exports": exports or {},
+        "error": document.error_message,
+        "created_at": utc_timestamp(document.created_at),
+        "processed_at": utc_timestamp(document.processed_at)
+    }
+    try:
+        await manifest.record(entry)
+    except (AzureError, OSError) as e:
+        # The manifest is an index over the results container, not the source of truth
+        logger.error(f"Failed to record {base_name} in the manifest: {e}")
+
+
+async def _update_job(jobs: JobStore | None, job_id: str | None, **changes):
+    if jobs is None or not job_id:
+        return
+    try:
+        await jobs.update(job_id, **changes)
+    except (AzureError, OSError) as e:
+        # Status is for pollers; losing an update must not fail the document
+        logger.error(f"Failed to update job {job_id}: {e}")
+
+
+async def _upload_exports(
+    result: CompactResult,
+    base_name: str,
+    storage_helper: BlobStorageHelper
+) -> tuple[dict[str, str], dict[str, str]]:
+    from exporters import EXPORT_FORMATS, aiter_in_thread, enabled_formats
+
+    formats = [
+        name for name in enabled_formats()
+        if name != "csv" or result.tables
+    ]
+    semaphore = asyncio.Semaphore(int(os.environ.get("EXPORT_CONCURRENCY", "4")))
+
+    async def render_and_upload(name: str) -> str:
+        ext, content_type, exporter_cls = EXPORT_FORMATS[name]
+        async with semaphore:
+            # Rendering is CPU-bound, so chunks are produced off the event loop and each one
+            # is staged as a block while the next is rendered
+            chunks = aiter_in_thread(exporter_cls().iter_bytes(result))
+            return await storage_helper.upload_result_stream(f"{base_name}.{ext}", chunks, content_type)
+
+    outcomes = await asyncio.gather(
+        *(render_and_upload(name) for name in formats),
+        return_exceptions=True
+    )
+
+    exports = {}
+    export_errors = {}
+    for name, outcome in zip(formats, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Failed to export {base_name} as {name}: {outcome}")
+            export_errors[name] = str(outcome)
+        else:
+            exports[name] = outcome
+
+    if formats and not exports:
+        raise RuntimeError(f"All exports failed for {base_name}: {export_errors}")
+
+    return exports, export_errors
@@ -0,0 +1,128 @@
+import asyncio
+import importlib.util
+import logging
+import os
+
+import httpx
+from utils.lifecycle import on_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientPool:
+    """Process-wide pooled httpx client reused across function invocations."""
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool | None = None,
+        timeout: float = 120.0
+    ):
+        self.max_connections = (
+            max_connections if max_connections is not None
+            else int(os.environ.get("MISTRAL_HTTP_MAX_CONNECTIONS", "20"))
+        )
+        self.max_keepalive_connections = (
+            max_keepalive_connections if max_keepalive_connections is not None
+            else int(os.environ.get("MISTRAL_HTTP_MAX_KEEPALIVE", "10"))
+        )
+        self.keepalive_expiry = (
+            keepalive_expiry if keepalive_expiry is not None
+            else float(os.environ.get("MISTRAL_HTTP_KEEPALIVE_EXPIRY", "60"))
+        )
+        self.http2 = http2 if http2 is not None else _env_flag("MISTRAL_HTTP2")
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task] = set()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        logger.info(
+            f"Creating pooled HTTP client (max_connections={self.max_connections}, "
+            f"keepalive={self.max_keepalive_connections}, http2={http2})"
+        )
+        return httpx.AsyncClient(limits=limits, http2=http2, timeout=self.timeout)
+
+    def get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+
+        # Connections are bound to the loop that opened them, so a new loop needs a new client
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._retire(self._client, self._loop)
+            self._client = self._create_client()
+            self._loop = loop
+
+        return self._client
+
+    def _retire(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None):
+        """Close a client left behind by a loop change, so its pooled sockets are not leaked."""
+        if loop is not None and loop.is_running():
+            # Still running in another thread: close it there
+            asyncio.run_coroutine_threadsafe(self._close_client(client), loop)
+            return
+        task = asyncio.ensure_future(self._close_client(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except RuntimeError as e:
+            # The owning loop is closed; what is left of the sockets goes with the process
+            logger.warning(f"Could not close pooled HTTP client cleanly: {e}")
+
+    async def aclose(self):
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+
+        if client is None or client.is_closed:
+            return
+        if loop is not None and loop.is_closed():
+            # Owning loop is gone; the sockets are released with the process
+            return
+
+        await self._close_client(client)
+
+
+_pool: HttpClientPool | None = None
+
+
+def get_http_pool() -> HttpClientPool:
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool()
+        on_shutdown(close_http_pool)
+    return _pool
+
+
+async def close_http_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
@@ -1,7 +1,14 @@
-import base64
+import asyncio
 import logging
+import os
 import httpx
-from typing import Optional
+from collections.abc import Iterator
+
+from models import PAGE_SEPARATOR
+
+from .http_pool import get_http_pool
+from .payload import StreamingOCRPayload
+from .rate_limiter import AdaptiveRateLimiter, RETRYABLE_STATUS_CODES, get_rate_limiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -9,65 +16,108 @@ logger = logging.getLogger(__name__)
 class MistralOCRClient:
     """Client for Mistral Document AI via Azure AI Foundry."""
 
-    def __init__(self, endpoint: str, api_key: str, model: str = "mistral-document-ai-2505"):
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        model: str = "mistral-document-ai-2505",
+        http_client: httpx.AsyncClient | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        max_retries: int | None = None
+    ):
         self.endpoint = endpoint.rstrip("/")
         self.api_key = api_key
         self.model = model
         self.timeout = 120.0
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get("MISTRAL_MAX_RETRIES", "4"))
+        self._http_client = http_client
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # Fall back to the process-wide pool so connections survive across invocations
+        if self._http_client is not None:
+            return self._http_client
+        return get_http_pool().get_client()
 
     async def extract_from_bytes(
         self,
         file_bytes: bytes,
         content_type: str,
-        filename: Optional[str] = None
+        filename: str | None = None
     ) -> dict:
         """Extract content from document bytes using Azure Mistral Document AI."""
-        base64_content = base64.b64encode(file_bytes).decode("utf-8")
-
-        # Determine document type and format
-        if content_type == "application/pdf":
-            doc_type = "document_url"
-            data_uri = f"data:application/pdf;base64,{base64_content}"
-        else:
-            # Image types
-            doc_type = "image_url"
-            media_type = content_type if content_type in ["image/png", "image/jpeg", "image/jpg", "image/tiff"] else "image/png"
-            data_uri = f"data:{media_type};base64,{base64_content}"
-
-        # Azure AI Foundry Mistral Document AI format
-        payload = {
-            "model": self.model,
-            "document": {
-                "type": doc_type,
-                doc_type: data_uri
-            },
-            "include_image_base64": False
-        }
+        # Stream the JSON envelope and base64 data URI instead of building them in memory
+        payload = StreamingOCRPayload(
+            model=self.model,
+            file_bytes=file_bytes,
+            content_type=content_type
+        )
 
         headers = {
             "Content-Type": "application/json",
+            "Content-Length": str(len(payload)),
             "Authorization": f"Bearer {self.api_key}"
         }
 
         # Azure AI Foundry Mistral OCR endpoint
         url = f"{self.endpoint}/providers/mistral/azure/ocr"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                logger.info(f"Calling Azure Mistral Document AI: {url}")
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Azure Mistral API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Error calling Azure Mistral: {str(e)}")
-                raise
+        client = self._get_http_client()
+        limiter = self.rate_limiter
+        attempt = 0
+
+        while True:
+            retry_after = None
+            async with limiter.slot():
+                try:
+                    logger.info(f"Calling Azure Mistral Document AI: {url}")
+                    response = await client.post(
+                        url,
+                        content=payload,
+                        headers=headers,
+                        timeout=self.timeout
+                    )
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        retry_after = parse_retry_after(response.headers)
+                        if response.status_code == 429 or retry_after is not None:
+                            limiter.on_throttle(retry_after)
+                    response.raise_for_status()
+                    limiter.on_success()
+                    return response.json()
+                except httpx.HTTPStatusError as e:
+                    error = e
+                    retryable = e.response.status_code in RETRYABLE_STATUS_CODES
+                    if not retryable or attempt >= self.max_retries:
+                        logger.error(f"Azure Mistral API error: {e.response.status_code} - {e.response.text}")
+                        raise
+                except httpx.TransportError as e:
+                    error = e
+                    if attempt >= self.max_retries:
+                        logger.error(f"Error calling Azure Mistral: {e}")
+                        raise
+                except Exception as e:
+                    logger.error(f"Error calling Azure Mistral: {e}")
+                    raise
+
+            # Back off outside the slot so waiting retries do not hold concurrency
+            delay = limiter.backoff_delay(attempt, retry_after)
+            attempt += 1
+            limiter.on_retry()
+            logger.warning(f"Transient Mistral error ({error}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def iter_pages(self, response: dict) -> Iterator[dict]:
+        """Yield each page of a response as {"markdown", "tables", "confidence"}, in order.
+
+        The markdown strings are the response's own, so nothing is copied; confidence is
+        None when the page has none.
+        """
+        for page in response.get("pages", []):
+            yield {
+                "markdown": page.get("markdown", ""),
+                "tables": page.get("tables", []),
+                "confidence": page.get("confidence")
+            }
 
     def parse_response(self, response: dict) -> dict:
         """Parse Mistral Document AI response into standardized format."""
@@ -92,7 +142,7 @@ class MistralOCRClient:
                     page_confidences.append(page["confidence"])
 
             # Combine all pages
-            combined_text = "\n\n---\n\n".join(all_text) if len(all_text) > 1 else (all_text[0] if all_text else "")
+            combined_text = PAGE_SEPARATOR.join(all_text)
 
             # Calculate average confidence
             avg_confidence = sum(page_confidences) / len(page_confidences) if page_confidences else 0.85
@@ -106,7 +156,7 @@ class MistralOCRClient:
                 "model": response.get("model", self.model)
             }
         except Exception as e:
-            logger.error(f"Error parsing response: {str(e)}")
+            logger.error(f"Error parsing response: {e}")
             return {
                 "markdown_content": str(response),
                 "raw_text": str(response),
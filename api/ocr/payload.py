@@ -0,0 +1,60 @@
+import base64
+import json
+import mmap
+from collections.abc import AsyncIterator
+
+# Multiple of 3 so every chunk encodes to base64 without padding except the last
+DEFAULT_CHUNK_SIZE = 3 * 64 * 1024
+
+SUPPORTED_IMAGE_TYPES = ["image/png", "image/jpeg", "image/jpg", "image/tiff"]
+
+
+class StreamingOCRPayload:
+    """JSON request body for the OCR endpoint, base64-encoding the document chunk by chunk.
+
+    The envelope is written around the data URI so the full base64 string is never
+    materialised. Iterating the payload again restarts it, which keeps retries safe.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        file_bytes: bytes | bytearray | memoryview | mmap.mmap,
+        content_type: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if chunk_size <= 0 or chunk_size % 3:
+            raise ValueError("chunk_size must be a positive multiple of 3")
+
+        if content_type == "application/pdf":
+            doc_type = "document_url"
+            media_type = "application/pdf"
+        else:
+            doc_type = "image_url"
+            media_type = content_type if content_type in SUPPORTED_IMAGE_TYPES else "image/png"
+
+        self.doc_type = doc_type
+        self.media_type = media_type
+        self.chunk_size = chunk_size
+        self._view = memoryview(file_bytes).cast("B")
+
+        self._prefix = (
+            f'{{"model": {json.dumps(model)}, "document": {{"type": {json.dumps(doc_type)}, '
+            f'{json.dumps(doc_type)}: "data:{media_type};base64,'
+        ).encode()
+        self._suffix = b'"}, "include_image_base64": false}'
+
+    def __len__(self) -> int:
+        encoded_length = 4 * ((len(self._view) + 2) // 3)
+        return len(self._prefix) + encoded_length + len(self._suffix)
+
+    def iter_chunks(self):
+        yield self._prefix
+        view = self._view
+        for offset in range(0, len(view), self.chunk_size):
+            yield base64.b64encode(view[offset:offset + self.chunk_size])
+        yield self._suffix
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.iter_chunks():
+            yield chunk
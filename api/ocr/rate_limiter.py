@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the server-requested delay in seconds from Retry-After style headers."""
+    for name in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(float(value) / 1000, 0.0)
+            except ValueError:
+                pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with a concurrency cap whose rate adapts to throttling (AIMD).
+
+    Every success nudges the rate up by ``increase_step`` until ``max_rate``; every 429
+    multiplies it by ``decrease_factor`` down to ``min_rate``. A Retry-After pauses all
+    callers sharing the limiter until the server says it is ready again.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        max_concurrency: int | None = None,
+        min_rate: float | None = None,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0
+    ):
+        self.max_rate = requests_per_second or float(os.environ.get("MISTRAL_MAX_RPS", "5"))
+        self.min_rate = min_rate or float(os.environ.get("MISTRAL_MIN_RPS", "0.5"))
+        self.max_concurrency = max_concurrency or int(os.environ.get("MISTRAL_MAX_CONCURRENCY", "8"))
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.rate = self.max_rate
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.requests = 0
+        self.throttle_events = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _refill(self, now: float):
+        # Allow at most one second of burst so a quiet period cannot flood the endpoint
+        elapsed = now - self._last_refill
+        self._tokens = min(max(self.rate, 1.0), self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    async def _acquire_token(self):
+        while True:
+            now = time.monotonic()
+            if self._blocked_until > now:
+                wait = self._blocked_until - now
+            else:
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            self.throttled_seconds += wait
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        semaphore = self._get_semaphore()
+        waited_from = time.monotonic()
+        async with semaphore:
+            self.throttled_seconds += time.monotonic() - waited_from
+            await self._acquire_token()
+            self.requests += 1
+            yield
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: float | None = None):
+        self.throttle_events += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Mistral endpoint throttled, rate lowered to {self.rate:.2f} req/s")
+
+    def on_retry(self):
+        self.retries += 1
+
+    def backoff_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        # Full jitter keeps retries from many invocations from lining up again
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "requests": self.requests,
+            "throttle_events": self.throttle_events,
+            "retries": self.retries,
+            "throttled_seconds": round(self.throttled_seconds, 3)
+        }
+
+
+_limiter: AdaptiveRateLimiter | None = None
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = AdaptiveRateLimiter()
+    return _limiter
@@ -0,0 +1,96 @@
+import io
+import logging
+import mmap
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _open_stream(file_bytes: bytes | mmap.mmap):
+    if isinstance(file_bytes, mmap.mmap):
+        # A spooled document is already a seekable file; BytesIO would copy it into memory
+        file_bytes.seek(0)
+        return file_bytes
+    return io.BytesIO(file_bytes)
+
+
+class PdfShards:
+    """A PDF's page-range shards, each written only when render() asks for it.
+
+    Only the shards being sent are in memory, rather than a second copy of the whole
+    document. The reader's stream is shared, so renders from several threads take turns.
+    """
+
+    def __init__(self, reader, page_count: int, pages_per_shard: int):
+        self._reader = reader
+        self._lock = threading.Lock()
+        self.page_count = page_count
+        self.pages_per_shard = pages_per_shard
+
+    def __len__(self) -> int:
+        return (self.page_count + self.pages_per_shard - 1) // self.pages_per_shard
+
+    def render(self, index: int) -> bytes:
+        from pypdf import PdfWriter
+
+        start = index * self.pages_per_shard
+        with self._lock:
+            writer = PdfWriter()
+            for page_index in range(start, min(start + self.pages_per_shard, self.page_count)):
+                writer.add_page(self._reader.pages[page_index])
+
+            buffer = io.BytesIO()
+            writer.write(buffer)
+        return buffer.getvalue()
+
+
+def split_pdf(file_bytes: bytes | mmap.mmap, pages_per_shard: int) -> PdfShards | None:
+    """Split a PDF into page-range shards, or return None when it should go as one request."""
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+    except ImportError:
+        logger.warning("pypdf is not installed, PDF sharding disabled")
+        return None
+
+    try:
+        reader = PdfReader(_open_stream(file_bytes))
+        page_count = len(reader.pages)
+    except (PyPdfError, ValueError, OSError) as e:
+        logger.warning(f"Could not read PDF for sharding, sending as one request: {e}")
+        return None
+
+    if page_count <= pages_per_shard:
+        return None
+
+    shards = PdfShards(reader, page_count, pages_per_shard)
+    logger.info(f"Split {page_count}-page PDF into {len(shards)} shards of up to {pages_per_shard} pages")
+    return shards
+
+
+def merge_responses(responses: list[dict]) -> dict:
+    """Merge per-shard OCR responses, in shard order, into the shape of a single response."""
+    if not responses:
+        return {"pages": []}
+
+    merged = {key: value for key, value in responses[0].items() if key not in ("pages", "usage_info")}
+    pages = []
+    usage: dict = {}
+
+    for response in responses:
+        offset = len(pages)
+        for page in response.get("pages", []):
+            if isinstance(page.get("index"), int):
+                page = {**page, "index": page["index"] + offset}
+            pages.append(page)
+
+        for key, value in (response.get("usage_info") or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                usage[key] = usage.get(key, 0) + value
+            else:
+                usage.setdefault(key, value)
+
+    merged["pages"] = pages
+    if usage:
+        merged["usage_info"] = usage
+    return merged
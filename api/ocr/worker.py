@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from utils.admission import AdmissionScheduler, get_admission_scheduler
+from utils.blob_helpers import BlobStorageHelper
+from utils.eventgrid import EventGridPublisher
+from utils.jobs import FAILED, JobStore, get_job_store
+from utils.memory_budget import DocumentTooLarge
+from utils.queues import MessageQueue, QueueMessage, parse_ingest_message
+from utils.spool import spool_chunks
+
+from .handler import process_document
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, int], Awaitable[object]]
+PoisonHandler = Callable[[str, Exception], Awaitable[object]]
+
+
+def ingest_max_dequeue_count() -> int:
+    # Keep in step with extensions.queues.maxDequeueCount in host.json
+    return int(os.environ.get("INGEST_MAX_DEQUEUE_COUNT", "5"))
+
+
+async def handle_ingest_message(
+    content: str,
+    storage_helper: BlobStorageHelper,
+    event_publisher: EventGridPublisher | None = None,
+    jobs: JobStore | None = None,
+    scheduler: AdmissionScheduler | None = None
+) -> dict | None:
+    """Process the landing-zone file an ingest message points at.
+
+    The job id and content type come from the message when the API enqueued it, and
+    from the blob's metadata when a storage event did. The blob is admitted by the
+    admission scheduler before it is downloaded, chunk by chunk, and large blobs are
+    spooled to disk. Returns None for a blob that no longer exists or can never
+    fit the budget, since retrying cannot help.
+    """
+    message = parse_ingest_message(content, storage_helper.landing_zone_container)
+    blob_name = message["blob_name"]
+    container = storage_helper.landing_zone_container
+
+    try:
+        properties = await storage_helper.get_blob_properties(container=container, blob_name=blob_name)
+    except ResourceNotFoundError:
+        logger.warning(f"Blob {blob_name} no longer exists, dropping its ingest message")
+        return None
+
+    metadata = properties.get("metadata") or {}
+    job_id = message.get("job_id") or metadata.get("job_id")
+    content_type = (
+        message.get("content_type") or metadata.get("content_type") or properties.get("content_type") or "application/pdf"
+    )
+    size = properties.get("size") or 0
+
+    try:
+        async with (scheduler or get_admission_scheduler()).admit(size, content_type):
+            chunks = storage_helper.iter_blob_chunks(container=container, blob_name=blob_name)
+            with await spool_chunks(chunks, size) as document:
+                return await process_document(
+                    blob_name=blob_name,
+                    blob_content=document.data,
+                    blob_properties={"content_type": content_type, "size": document.size},
+                    storage_helper=storage_helper,
+                    event_publisher=event_publisher,
+                    job_id=job_id,
+                    jobs=jobs
+                )
+    except DocumentTooLarge as e:
+        await reject_document(blob_name, job_id, e, jobs=jobs)
+        return None
+
+
+async def reject_document(blob_name: str, job_id: str | None, error: Exception, jobs: JobStore | None = None):
+    """Fail a document that is refused before processing, such as one over the memory budget."""
+    logger.error(f"Refusing {blob_name}: {error}")
+    if job_id:
+        try:
+            await (jobs or get_job_store()).update(job_id, status=FAILED, error=str(error))
+        except (AzureError, OSError) as e:
+            logger.warning(f"Could not update job {job_id}: {e}")
+
+
+async def mark_poisoned(content: str, error: Exception, jobs: JobStore | None = None):
+    """Fail the job of a message that will not be retried again."""
+    try:
+        job_id = parse_ingest_message(content).get("job_id")
+    except ValueError:
+        return
+    if job_id:
+        attempts = ingest_max_dequeue_count()
+        await (jobs or get_job_store()).update(job_id, status=FAILED, error=f"Gave up after {attempts} attempts: {error}")
+
+
+class QueueWorker:
+    """Pulls ingest messages and handles at most `concurrency` of them at once.
+
+    Only as many messages are received as there are free slots, so a backlog stays in
+    the queue, where its depth drives scale-out, rather than in worker memory. A message
+    stays invisible while it is handled: its visibility timeout is extended at half
+    intervals, so a long OCR call is not handed to a second worker. A failed message
+    becomes visible again after an exponential backoff; after max_dequeue_count attempts
+    it is moved to the poison queue and on_poison is told.
+
+    This runs the queue path without the Functions host, for local runs and tests
+    against InMemoryQueue. In Azure, document_queue_processor gets the same behaviour
+    from extensions.queues in host.json.
+    """
+
+    def __init__(
+        self,
+        queue: MessageQueue,
+        handler: MessageHandler,
+        concurrency: int | None = None,
+        visibility_timeout: int | None = None,
+        max_dequeue_count: int | None = None,
+        retry_delay: float = 5.0,
+        poison_queue: MessageQueue | None = None,
+        on_poison: PoisonHandler | None = None
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency or int(os.environ.get("INGEST_WORKER_CONCURRENCY", "4"))
+        self.visibility_timeout = visibility_timeout or int(os.environ.get("INGEST_VISIBILITY_TIMEOUT", "60"))
+        self.max_dequeue_count = max_dequeue_count or ingest_max_dequeue_count()
+        self.retry_delay = retry_delay
+        self.poison_queue = poison_queue
+        self.on_poison = on_poison
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {"completed": 0, "retried": 0, "poisoned": 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_flight": self.in_flight}
+
+    async def run_once(self) -> int:
+        """Receive messages for the free slots and start handling them; returns how many were received."""
+        free = self.concurrency - len(self._tasks)
+        if free <= 0:
+            return 0
+        messages = await self.queue.receive(free, self.visibility_timeout)
+        for message in messages:
+            task = asyncio.create_task(self._handle(message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return len(messages)
+
+    async def drain(self):
+        """Handle messages until the queue has none visible and nothing is in flight."""
+        while True:
+            received = await self.run_once()
+            if not received and not self._tasks:
+                return
+            if self._tasks:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    async def run(self, stop: asyncio.Event, poll_interval: float = 1.0):
+        """Poll until stop is set, then let in-flight messages finish."""
+        while not stop.is_set():
+            received = await self.run_once()
+            if len(self._tasks) >= self.concurrency:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+            elif not received:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle(self, message: QueueMessage):
+        # The pop receipt changes with every extension, so the current one is shared
+        lease = [message]
+        keep_invisible = asyncio.create_task(self._keep_invisible(lease))
+        try:
+            await self.handler(message.content, message.dequeue_count)
+            error = None
+        except Exception as e:
+            logger.exception(f"Message {message.id} failed on attempt {message.dequeue_count}")
+            error = e
+        finally:
+            keep_invisible.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keep_invisible
+
+        try:
+            if error is None:
+                self._stats["completed"] += 1
+                await self.queue.delete(lease[0])
+            elif message.dequeue_count >= self.max_dequeue_count:
+                await self._poison(lease[0], error)
+            else:
+                delay = self.retry_delay * (2 ** (message.dequeue_count - 1))
+                self._stats["retried"] += 1
+                logger.warning(
+                    f"Message {message.id} failed on attempt {message.dequeue_count}, retry in {delay:.0f}s: {error}"
+                )
+                await self.queue.update_visibility(lease[0], delay)
+        except (AzureError, LookupError) as e:
+            # The message reappears after its visibility timeout and is handled again
+            logger.error(f"Could not settle message {message.id}: {e}")
+
+    async def _keep_invisible(self, lease: list[QueueMessage]):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 2)
+            try:
+                lease[0] = await self.queue.update_visibility(lease[0], self.visibility_timeout)
+            except (AzureError, LookupError) as e:
+                logger.warning(f"Could not extend visibility of message {lease[0].id}: {e}")
+
+    async def _poison(self, message: QueueMessage, error: Exception):
+        self._stats["poisoned"] += 1
+        logger.error(f"Message {message.id} failed {message.dequeue_count} times, moving to poison queue: {error}")
+        if self.poison_queue is not None:
+            await self.poison_queue.send(message.content)
+        if self.on_poison is not None:
+            try:
+                await self.on_poison(message.content, error)
+            except Exception:
+                logger.exception(f"Poison handler failed for message {message.id}")
+        await self.queue.delete(message)
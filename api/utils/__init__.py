@@ -1,7 +1,30 @@
-from .blob_helpers import BlobStorageHelper
-from .eventgrid import EventGridPublisher
+import importlib
 
-__all__ = [
-    "BlobStorageHelper",
-    "EventGridPublisher",
-]
+# Exports are resolved on first access so lightweight submodules such as
+# utils.lifecycle can be imported without loading the Azure SDKs
+_EXPORTS = {
+    "BlobStorageHelper": ".blob_helpers",
+    "EventGridPublisher": ".eventgrid",
+    "get_credential": ".credentials",
+    "get_storage_helper": ".clients",
+    "get_event_publisher": ".clients",
+    "close_shared_clients": ".clients",
+    "SecretProvider": ".secrets",
+    "get_secret_provider": ".secrets",
+    "ManifestIndex": ".manifest",
+    "get_manifest_index": ".manifest",
+    "JobStore": ".jobs",
+    "get_job_store": ".jobs",
+    "InMemoryQueue": ".queues",
+    "get_ingest_queue": ".queues",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,167 @@
+import contextlib
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from .memory_budget import MemoryBudget, MemoryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+FAST = "fast"
+SLOW = "slow"
+
+# Content types whose page count grows with size; anything else is one image
+MULTI_PAGE_TYPES = ("application/pdf", "image/tiff")
+
+
+def estimate_pages(size: int, content_type: str | None, bytes_per_page: int) -> int:
+    """Guess a document's page count from its size before it has been read."""
+    if content_type not in MULTI_PAGE_TYPES:
+        return 1
+    return max(1, math.ceil(size / bytes_per_page))
+
+
+class WaitStats:
+    """Time documents spent waiting for admission, over the lane's lifetime and its recent admissions."""
+
+    def __init__(self, window: int = 256):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.timeouts = 0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, wait_ms: float):
+        self.count += 1
+        self.total_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+        self._recent.append(wait_ms)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float:
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 1) if recent else 0.0
+
+        return {
+            "admitted": self.count,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_ms, 1)
+        }
+
+
+class Lane:
+    def __init__(self, name: str, budget: MemoryBudget):
+        self.name = name
+        self.budget = budget
+        self.pages_in_flight = 0
+        self.wait = WaitStats()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.budget.active,
+            "bytes_in_flight": self.budget.in_use,
+            "bytes_borrowed": self.budget.borrowed,
+            "pages_in_flight": self.pages_in_flight,
+            "waiting": self.budget.stats()["waiting"],
+            "max_concurrency": self.budget.max_concurrency,
+            "byte_budget": self.budget.capacity,
+            "queue_wait": self.wait.snapshot()
+        }
+
+
+class AdmissionScheduler:
+    """Admits documents to process_document through a fast and a slow lane.
+
+    Each document's pages are estimated from its size. Those with at most
+    fast_lane_max_pages pages that also fit the fast lane's share of the byte budget take
+    the fast lane; the rest take the slow one. Each lane is its own MemoryBudget with a
+    concurrency cap and first-come order, so a queue of 100-page PDFs never holds up
+    one-page receipts, and the two lanes together stay within the process's byte
+    budget. While the fast lane is idle the slow lane may borrow its share, so any
+    document within the whole budget can be admitted. Time spent waiting is recorded
+    per lane and reported by stats().
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        fast_share: float = 0.25,
+        fast_concurrency: int = 6,
+        slow_concurrency: int = 2,
+        fast_lane_max_pages: int = 10,
+        bytes_per_page: int = 100 * 1024,
+        wait_timeout: float = 60.0
+    ):
+        fast_capacity = int(capacity * fast_share)
+        self.fast_lane_max_pages = fast_lane_max_pages
+        self.bytes_per_page = bytes_per_page
+        fast = MemoryBudget(fast_capacity, wait_timeout, max_concurrency=fast_concurrency)
+        slow = MemoryBudget(capacity - fast_capacity, wait_timeout, max_concurrency=slow_concurrency, lender=fast)
+        self.lanes = {FAST: Lane(FAST, fast), SLOW: Lane(SLOW, slow)}
+
+    def lane_for(self, size: int, pages: int) -> Lane:
+        fast = self.lanes[FAST]
+        if pages <= self.fast_lane_max_pages and (fast.budget.capacity <= 0 or size <= fast.budget.capacity):
+            return fast
+        return self.lanes[SLOW]
+
+    @contextlib.asynccontextmanager
+    async def admit(self, size: int, content_type: str | None = None) -> AsyncIterator[str]:
+        """Hold a place in the document's lane while it is processed; yields the lane's name.
+
+        Raises DocumentTooLarge if the document exceeds the whole byte budget and
+        MemoryBudgetExceeded if it waits longer than the wait timeout.
+        """
+        pages = estimate_pages(size, content_type, self.bytes_per_page)
+        lane = self.lane_for(size, pages)
+        started = time.monotonic()
+
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(lane.budget.reserve(size))
+            except MemoryBudgetExceeded:
+                lane.wait.timeouts += 1
+                raise
+
+            wait_ms = (time.monotonic() - started) * 1000
+            lane.wait.record(wait_ms)
+            logger.info(f"Admitted {size} bytes (~{pages} pages) to the {lane.name} lane after {wait_ms:.0f} ms")
+
+            lane.pages_in_flight += pages
+            try:
+                yield lane.name
+            finally:
+                lane.pages_in_flight -= pages
+
+    def stats(self) -> dict:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+_scheduler: AdmissionScheduler | None = None
+
+
+def get_admission_scheduler() -> AdmissionScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AdmissionScheduler(
+            capacity=int(os.environ.get("INGEST_MEMORY_BUDGET_BYTES", str(512 * 1024 * 1024))),
+            fast_share=float(os.environ.get("INGEST_FAST_LANE_SHARE", "0.25")),
+            fast_concurrency=int(os.environ.get("INGEST_FAST_LANE_CONCURRENCY", "6")),
+            slow_concurrency=int(os.environ.get("INGEST_SLOW_LANE_CONCURRENCY", "2")),
+            fast_lane_max_pages=int(os.environ.get("INGEST_FAST_LANE_MAX_PAGES", "10")),
+            bytes_per_page=int(os.environ.get("INGEST_BYTES_PER_PAGE", str(100 * 1024))),
+            wait_timeout=float(os.environ.get("INGEST_MEMORY_WAIT_SECONDS", "60"))
+        )
+    return _scheduler
+
+
+def admission_stats() -> dict | None:
+    """Lane statistics for /health, or None before the first document was admitted."""
+    return _scheduler.stats() if _scheduler is not None else None
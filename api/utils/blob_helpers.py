@@ -1,8 +1,16 @@
+import asyncio
+import base64
 import logging
 import os
+from collections.abc import AsyncIterable, AsyncIterator
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
 from azure.storage.blob.aio import BlobServiceClient
-from azure.storage.blob import ContentSettings
-from azure.identity.aio import DefaultAzureCredential
+from azure.storage.blob import BlobBlock, ContentSettings
+
+from .compression import compress, compress_chunks, result_encoding
+from .credentials import get_credential
 
 logger = logging.getLogger(__name__)
 
@@ -26,50 +34,213 @@ class BlobStorageHelper:
             if connection_string and "UseDevelopmentStorage" not in connection_string:
                 self._client = BlobServiceClient.from_connection_string(connection_string)
             else:
-                credential = DefaultAzureCredential()
+                credential = get_credential()
                 self._client = BlobServiceClient(
                     account_url=self.account_url,
                     credential=credential
                 )
         return self._client
 
+    async def get_container_client(self, container: str):
+        client = await self._get_client()
+        return client.get_container_client(container)
+
     async def download_blob(self, container: str, blob_name: str) -> bytes:
         client = await self._get_client()
         blob_client = client.get_blob_client(container=container, blob=blob_name)
         download = await blob_client.download_blob()
         return await download.readall()
 
+    async def download_blob_if_modified(
+        self,
+        container: str,
+        blob_name: str,
+        etag: str | None = None
+    ) -> tuple[bytes | None, dict]:
+        """Download a blob unless its ETag still matches; returns (None, {}) when unchanged.
+
+        Compressed blobs are returned as stored; props["content_encoding"] names the encoding.
+        """
+        client = await self._get_client()
+        blob_client = client.get_blob_client(container=container, blob=blob_name)
+        try:
+            if etag:
+                download = await blob_client.download_blob(
+                    etag=etag, match_condition=MatchConditions.IfModified, decompress=False
+                )
+            else:
+                download = await blob_client.download_blob(decompress=False)
+        except ResourceNotModifiedError:
+            return None, {}
+
+        props = download.properties
+        content = await download.readall()
+        return content, {
+            "etag": props.etag,
+            "last_modified": props.last_modified,
+            "content_type": props.content_settings.content_type if props.content_settings else None,
+            "content_encoding": props.content_settings.content_encoding if props.content_settings else None,
+            "metadata": props.metadata or {}
+        }
+
     async def get_blob_properties(self, container: str, blob_name: str) -> dict:
         client = await self._get_client()
         blob_client = client.get_blob_client(container=container, blob=blob_name)
         props = await blob_client.get_blob_properties()
         return {
             "content_type": props.content_settings.content_type,
+            "content_encoding": props.content_settings.content_encoding,
             "size": props.size,
+            "etag": props.etag,
             "created_on": props.creation_time,
-            "last_modified": props.last_modified
+            "last_modified": props.last_modified,
+            "metadata": props.metadata or {}
         }
 
+    async def iter_blob_chunks(
+        self,
+        container: str,
+        blob_name: str,
+        offset: int | None = None,
+        length: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Yield a blob (or the byte range offset..offset+length) chunk by chunk.
+
+        Only one chunk is held at a time; its size follows the client's max_chunk_get_size.
+        """
+        client = await self._get_client()
+        blob_client = client.get_blob_client(container=container, blob=blob_name)
+        download = await blob_client.download_blob(offset=offset, length=length, max_concurrency=1)
+        async for chunk in download.chunks():
+            yield chunk
+
+    async def upload_blob(
+        self,
+        container: str,
+        blob_name: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+        metadata: dict[str, str] | None = None,
+        content_encoding: str | None = None
+    ) -> str:
+        client = await self._get_client()
+        blob_client = client.get_blob_client(container=container, blob=blob_name)
+
+        await blob_client.upload_blob(
+            data,
+            content_settings=ContentSettings(content_type=content_type, content_encoding=content_encoding),
+            metadata=metadata,
+            overwrite=True
+        )
+        return blob_client.url
+
     async def upload_result(
         self,
         blob_name: str,
         content: str,
         content_type: str = "text/plain"
     ) -> str:
-        client = await self._get_client()
-        blob_client = client.get_blob_client(
+        data = content.encode("utf-8")
+        encoding = result_encoding()
+        if encoding:
+            data = await asyncio.to_thread(compress, data, encoding)
+
+        url = await self.upload_blob(
             container=self.extracted_data_container,
-            blob=blob_name
+            blob_name=blob_name,
+            data=data,
+            content_type=content_type,
+            content_encoding=encoding
         )
 
-        await blob_client.upload_blob(
-            content.encode("utf-8"),
-            content_settings=ContentSettings(content_type=content_type),
-            overwrite=True
+        logger.info(f"Uploaded result to {self.extracted_data_container}/{blob_name}")
+        return url
+
+    async def upload_blob_stream(
+        self,
+        container: str,
+        blob_name: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str = "application/octet-stream",
+        max_concurrency: int | None = None,
+        content_encoding: str | None = None
+    ) -> str:
+        """Upload a block blob from an async iterator of chunks, staging blocks in parallel.
+
+        At most max_concurrency blocks are in flight, so memory is bounded by the chunk size
+        rather than the blob size. A single-chunk body is uploaded in one request instead.
+        """
+        max_concurrency = max_concurrency or int(os.environ.get("BLOB_UPLOAD_CONCURRENCY", "4"))
+        client = await self._get_client()
+        blob_client = client.get_blob_client(container=container, blob=blob_name)
+        content_settings = ContentSettings(content_type=content_type, content_encoding=content_encoding)
+
+        iterator = chunks.__aiter__()
+        first = await anext(iterator, None)
+        second = await anext(iterator, None) if first is not None else None
+        if second is None:
+            await blob_client.upload_blob(first or b"", content_settings=content_settings, overwrite=True)
+            return blob_client.url
+
+        async def remaining():
+            yield first
+            yield second
+            async for chunk in iterator:
+                yield chunk
+
+        blocks: list[BlobBlock] = []
+        pending: set[asyncio.Task] = set()
+        try:
+            async for chunk in remaining():
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+
+                # Block ids must all have the same length within a blob
+                block_id = base64.b64encode(f"{len(blocks):08d}".encode("ascii")).decode("ascii")
+                blocks.append(BlobBlock(block_id=block_id))
+                pending.add(asyncio.create_task(blob_client.stage_block(block_id, chunk)))
+
+            await asyncio.gather(*pending)
+        except BaseException:
+            # Uncommitted blocks are discarded by the service; the previous blob stays intact
+            for task in pending:
+                task.cancel()
+            raise
+
+        await blob_client.commit_block_list(blocks, content_settings=content_settings)
+        return blob_client.url
+
+    async def upload_result_stream(
+        self,
+        blob_name: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str = "text/plain"
+    ) -> str:
+        encoding = result_encoding()
+        if encoding:
+            chunks = compress_chunks(chunks, encoding)
+
+        url = await self.upload_blob_stream(
+            container=self.extracted_data_container,
+            blob_name=blob_name,
+            chunks=chunks,
+            content_type=content_type,
+            content_encoding=encoding
         )
 
         logger.info(f"Uploaded result to {self.extracted_data_container}/{blob_name}")
-        return blob_client.url
+        return url
+
+    @staticmethod
+    def _blob_summary(blob) -> dict:
+        return {
+            "name": blob.name,
+            "size": blob.size,
+            "content_type": blob.content_settings.content_type if blob.content_settings else None,
+            "last_modified": blob.last_modified.isoformat() if blob.last_modified else None
+        }
 
     async def list_results(self, prefix: str = "") -> list[dict]:
         client = await self._get_client()
@@ -77,15 +248,31 @@ class BlobStorageHelper:
 
         results = []
         async for blob in container_client.list_blobs(name_starts_with=prefix):
-            results.append({
-                "name": blob.name,
-                "size": blob.size,
-                "content_type": blob.content_settings.content_type if blob.content_settings else None,
-                "last_modified": blob.last_modified.isoformat() if blob.last_modified else None
-            })
+            results.append(self._blob_summary(blob))
 
         return results
 
+    async def list_results_page(
+        self,
+        prefix: str = "",
+        limit: int = 100,
+        continuation: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        """Fetch one page of result blobs and the token for the next page, if any."""
+        client = await self._get_client()
+        container_client = client.get_container_client(self.extracted_data_container)
+
+        pages = container_client.list_blobs(
+            name_starts_with=prefix or None,
+            results_per_page=limit
+        ).by_page(continuation_token=continuation)
+
+        async for page in pages:
+            results = [self._blob_summary(blob) async for blob in page]
+            return results, pages.continuation_token
+
+        return [], None
+
     async def close(self):
         if self._client:
             await self._client.close()
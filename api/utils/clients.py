@@ -0,0 +1,43 @@
+import logging
+
+from .blob_helpers import BlobStorageHelper
+from .credentials import close_credential
+from .eventgrid import EventGridPublisher
+from .lifecycle import on_shutdown
+
+logger = logging.getLogger(__name__)
+
+# Process-scoped SDK clients, created lazily on first use and reused by every invocation
+_storage_helper: BlobStorageHelper | None = None
+_event_publisher: EventGridPublisher | None = None
+
+
+def get_storage_helper() -> BlobStorageHelper:
+    global _storage_helper
+    if _storage_helper is None:
+        _storage_helper = BlobStorageHelper()
+        on_shutdown(close_shared_clients)
+    return _storage_helper
+
+
+def get_event_publisher() -> EventGridPublisher:
+    global _event_publisher
+    if _event_publisher is None:
+        _event_publisher = EventGridPublisher()
+        on_shutdown(close_shared_clients)
+    return _event_publisher
+
+
+async def close_shared_clients():
+    global _storage_helper, _event_publisher
+
+    # Close users of the credential before the credential itself
+    if _event_publisher is not None:
+        await _event_publisher.close()
+        _event_publisher = None
+    if _storage_helper is not None:
+        await _storage_helper.close()
+        _storage_helper = None
+    await close_credential()
+
+    logger.info("Closed shared Azure SDK clients")
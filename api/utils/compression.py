@@ -0,0 +1,100 @@
+import gzip
+import importlib.util
+import logging
+import os
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ENCODINGS = ("gzip", "zstd")
+
+
+def _zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def result_encoding() -> str | None:
+    """Content-Encoding to store results with, from RESULT_COMPRESSION (none, gzip or zstd)."""
+    encoding = os.environ.get("RESULT_COMPRESSION", "none").strip().lower()
+    if encoding not in SUPPORTED_ENCODINGS:
+        return None
+    if encoding == "zstd" and not _zstd_available():
+        logger.warning("zstd compression requested but the 'zstandard' package is not installed, using gzip")
+        return "gzip"
+    return encoding
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output, and so the blob's MD5, stable for identical content
+        return gzip.compress(data, mtime=0)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        import zstandard
+
+        # Streaming-compressed frames do not record their size, so read them as a stream
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+async def compress_chunks(
+    chunks: AsyncIterable[bytes],
+    encoding: str,
+    min_chunk_size: int = 1024 * 1024
+) -> AsyncIterator[bytes]:
+    """Compress a chunk stream incrementally, regrouping output into chunks of at least min_chunk_size."""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(wbits=31)
+    elif encoding == "zstd":
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor().compressobj()
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += compressor.compress(chunk)
+        if len(buffer) >= min_chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += compressor.flush()
+    if buffer:
+        yield bytes(buffer)
+
+
+def accepts_encoding(accept_encoding: str | None, encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows `encoding`, honouring q-values and '*'."""
+    if not accept_encoding:
+        return False
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding == "x-gzip":
+            coding = "gzip"
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+
+    if encoding in qualities:
+        return qualities[encoding] > 0
+    return qualities.get("*", 0.0) > 0
@@ -0,0 +1,18 @@
+from azure.identity.aio import DefaultAzureCredential
+
+# One credential per process so managed-identity tokens are cached across requests
+_credential: DefaultAzureCredential | None = None
+
+
+def get_credential() -> DefaultAzureCredential:
+    global _credential
+    if _credential is None:
+        _credential = DefaultAzureCredential()
+    return _credential
+
+
+async def close_credential():
+    global _credential
+    if _credential is not None:
+        await _credential.close()
+        _credential = None
@@ -1,23 +1,55 @@
+import asyncio
+import json
 import logging
 import os
 from datetime import datetime
 from azure.eventgrid.aio import EventGridPublisherClient
 from azure.eventgrid import EventGridEvent
+from azure.eventgrid import EventGridPublisherClient as SyncEventGridPublisherClient
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import AzureError
 
 logger = logging.getLogger(__name__)
 
+# Rough per-event envelope size on top of the data payload
+EVENT_OVERHEAD_BYTES = 512
+
 
 class EventGridPublisher:
     def __init__(
         self,
         topic_endpoint: str | None = None,
-        topic_key: str | None = None
+        topic_key: str | None = None,
+        batching: bool | None = None,
+        max_batch_size: int | None = None,
+        max_batch_bytes: int | None = None,
+        max_latency: float | None = None,
+        max_buffered_events: int | None = None
     ):
         self.topic_endpoint = topic_endpoint or os.environ.get("EVENT_GRID_TOPIC_ENDPOINT", "")
         self.topic_key = topic_key or os.environ.get("EVENT_GRID_TOPIC_KEY", "")
         self._client: EventGridPublisherClient | None = None
 
+        if batching is None:
+            batching = os.environ.get("EVENT_GRID_BATCHING", "true").lower() in ("1", "true", "yes")
+        self.batching = batching
+        self.max_batch_size = max_batch_size or int(os.environ.get("EVENT_GRID_MAX_BATCH_SIZE", "100"))
+        # Event Grid rejects requests over 1 MB, so leave some headroom
+        self.max_batch_bytes = max_batch_bytes or int(os.environ.get("EVENT_GRID_MAX_BATCH_BYTES", "900000"))
+        self.max_latency = max_latency if max_latency is not None else float(
+            os.environ.get("EVENT_GRID_MAX_LATENCY", "1.0")
+        )
+        self.max_buffered_events = max_buffered_events or int(os.environ.get("EVENT_GRID_MAX_BUFFERED", "1000"))
+
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flusher: asyncio.Task | None = None
+        self._pending: list[tuple[EventGridEvent, int]] = []
+        # Batches being sent, kept so a drain from another loop can resend unfinished ones
+        self._inflight: dict[asyncio.Task, list[EventGridEvent]] = {}
+        self.batches_sent = 0
+        self.events_sent = 0
+
     def _get_client(self) -> EventGridPublisherClient | None:
         if not self.topic_endpoint or not self.topic_key:
             logger.warning("Event Grid not configured, skipping event publishing")
@@ -38,10 +70,6 @@ class EventGridPublisher:
         confidence: float,
         exports: dict[str, str]
     ):
-        client = self._get_client()
-        if not client:
-            return
-
         event = EventGridEvent(
             event_type="Document.Processed",
             subject=f"documents/{document_id}",
@@ -55,11 +83,7 @@ class EventGridPublisher:
             data_version="1.0"
         )
 
-        try:
-            await client.send([event])
-            logger.info(f"Published Document.Processed event for {document_id}")
-        except Exception as e:
-            logger.error(f"Failed to publish event: {str(e)}")
+        await self._publish(event)
 
     async def publish_document_failed(
         self,
@@ -67,10 +91,6 @@ class EventGridPublisher:
         filename: str,
         error: str
     ):
-        client = self._get_client()
-        if not client:
-            return
-
         event = EventGridEvent(
             event_type="Document.Failed",
             subject=f"documents/{document_id}",
@@ -83,13 +103,191 @@ class EventGridPublisher:
             data_version="1.0"
         )
 
+        await self._publish(event)
+
+    async def _publish(self, event: EventGridEvent):
+        if not self.topic_endpoint or not self.topic_key:
+            self._get_client()
+            return
+
+        if not self.batching:
+            await self._send([event])
+            return
+
+        queue = self._get_queue()
+        # Blocks when the buffer is full, pushing back on producers instead of growing memory
+        await queue.put(event)
+
+    def _get_queue(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            carried = self._take_buffered() if self._loop is not None else []
+            self._queue = asyncio.Queue(maxsize=self.max_buffered_events)
+            self._loop = loop
+            self._flusher = loop.create_task(self._run_flusher(self._queue))
+            # Events buffered on the previous loop are sent from this one
+            for batch in self._batches(carried):
+                self._track(asyncio.ensure_future(self._send(batch)), batch)
+        return self._queue
+
+    def _take_buffered(self) -> list[EventGridEvent]:
+        """Empty the buffer of a loop that is no longer in use and return its unsent events.
+
+        In-flight sends are included, since their loop will not run them to completion.
+        The aio client is dropped too: its transport belongs to that loop.
+        """
+        events = [event for batch in self._inflight.values() for event in batch]
+        events.extend(event for event, _ in self._pending)
+        if self._queue is not None:
+            # The deque itself: get_nowait() would wake putters on the old loop
+            events.extend(self._queue._queue)
+
+        self._inflight = {}
+        self._pending = []
+        self._flusher = None
+        self._queue = None
+        self._loop = None
+        self._client = None
+        return events
+
+    @staticmethod
+    def _event_size(event: EventGridEvent) -> int:
+        return len(json.dumps(event.data, default=str)) + EVENT_OVERHEAD_BYTES
+
+    async def _run_flusher(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        deadline = 0.0
+
+        while True:
+            if self._pending:
+                try:
+                    event = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except TimeoutError:
+                    await self._dispatch_pending()
+                    continue
+            else:
+                event = await queue.get()
+
+            size = self._event_size(event)
+            if self._pending and sum(s for _, s in self._pending) + size > self.max_batch_bytes:
+                await self._dispatch_pending()
+
+            if not self._pending:
+                deadline = loop.time() + self.max_latency
+            self._pending.append((event, size))
+
+            if len(self._pending) >= self.max_batch_size:
+                await self._dispatch_pending()
+
+    async def _dispatch_pending(self):
+        batch = [event for event, _ in self._pending]
+        self._pending = []
+        if not batch:
+            return
+
+        # Shield the send so shutdown cannot cancel a batch halfway through
+        task = asyncio.ensure_future(self._send(batch))
+        self._track(task, batch)
+        await asyncio.shield(task)
+
+    def _track(self, task: asyncio.Task, batch: list[EventGridEvent]):
+        self._inflight[task] = batch
+        task.add_done_callback(self._settle)
+
+    def _settle(self, task: asyncio.Task):
+        batch = self._inflight.pop(task, [])
+        if task.cancelled():
+            # Cancelled by loop teardown before it was sent; keep it for close()
+            self._pending[:0] = [(event, self._event_size(event)) for event in batch]
+
+    async def _send(self, events: list[EventGridEvent]):
+        client = self._get_client()
+        if not client:
+            return
+
         try:
-            await client.send([event])
-            logger.info(f"Published Document.Failed event for {document_id}")
+            await client.send(events)
+            self.batches_sent += 1
+            self.events_sent += len(events)
+            for event in events:
+                logger.info(f"Published {event.event_type} event for {event.subject}")
         except Exception as e:
-            logger.error(f"Failed to publish event: {str(e)}")
+            logger.error(f"Failed to publish {len(events)} event(s): {e}")
+
+    async def flush(self):
+        """Send everything buffered right away."""
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+        while True:
+            events = [event for event, _ in self._pending]
+            self._pending = []
+            if self._queue is not None:
+                while not self._queue.empty():
+                    events.append(self._queue.get_nowait())
+            if not events:
+                return
+
+            for batch in self._batches(events):
+                await self._send(batch)
+
+            # Let producers blocked on a full buffer enqueue before checking again
+            await asyncio.sleep(0)
+
+    def _batches(self, events: list[EventGridEvent]) -> list[list[EventGridEvent]]:
+        batches: list[list[EventGridEvent]] = []
+        batch: list[EventGridEvent] = []
+        batch_bytes = 0
+        for event in events:
+            size = self._event_size(event)
+            if batch and (len(batch) >= self.max_batch_size or batch_bytes + size > self.max_batch_bytes):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(event)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _drain_foreign(self):
+        """Send what is still buffered for a loop that has stopped, with a sync client.
+
+        The queue, flusher, in-flight sends and aio client all belong to the loop that
+        created them. At exit that loop is stopped or closed, so none of them can be
+        awaited from the new one; their events are read directly and sent synchronously.
+        """
+        events = self._take_buffered()
+        if not events or not self.topic_endpoint or not self.topic_key:
+            return
+        client = SyncEventGridPublisherClient(
+            endpoint=self.topic_endpoint,
+            credential=AzureKeyCredential(self.topic_key)
+        )
+        try:
+            for batch in self._batches(events):
+                try:
+                    client.send(batch)
+                    self.batches_sent += 1
+                    self.events_sent += len(batch)
+                except AzureError as e:
+                    logger.error(f"Failed to publish {len(batch)} event(s) at shutdown: {e}")
+        finally:
+            client.close()
 
     async def close(self):
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Called from a different loop, as the atexit hook does
+            await asyncio.to_thread(self._drain_foreign)
+            return
+
+        if self._flusher is not None:
+            self._flusher.cancel()
+        self._flusher = None
+
+        await self.flush()
+        self._queue = None
+        self._loop = None
+
         if self._client:
             await self._client.close()
             self._client = None
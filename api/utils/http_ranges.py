@@ -0,0 +1,50 @@
+import re
+
+_BYTE_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: str | None, size: int, max_length: int | None = None) -> tuple[int, int] | None:
+    """Resolve a Range header to an inclusive (start, end) byte range of a `size`-byte body.
+
+    Returns None when the whole body should be sent: no header, an empty body, a header
+    this parser does not handle (multiple ranges, other units) or one that is malformed,
+    all of which RFC 9110 lets a server ignore. Raises RangeNotSatisfiable when the range lies past the end.
+    `max_length` clamps the range so one response never holds more than that many bytes;
+    Content-Range tells the client where to resume.
+    """
+    if not header or size == 0:
+        return None
+    match = _BYTE_RANGE.match(header)
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable(header)
+        start, end = max(size - suffix, 0), size - 1
+    else:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            raise RangeNotSatisfiable(header)
+        end = min(end, size - 1)
+
+    if max_length is not None:
+        end = min(end, start + max_length - 1)
+    return start, end
+
+
+def content_range(start: int, end: int, size: int) -> str:
+    return f"bytes {start}-{end}/{size}"
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import logging
+import mimetypes
+import os
+import posixpath
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+
+
+class IngestEntry(NamedTuple):
+    """One file of a batch; read() is called only when the file is about to be stored."""
+
+    filename: str
+    content_type: str
+    read: Callable[[], bytes]
+
+
+def max_entry_bytes() -> int:
+    return int(os.environ.get("BATCH_MAX_ENTRY_BYTES", str(100 * 1024 * 1024)))
+
+
+def guess_content_type(filename: str) -> str:
+    content_type, _ = mimetypes.guess_type(filename)
+    return content_type or "application/octet-stream"
+
+
+def is_zip(filename: str | None, content_type: str | None) -> bool:
+    if content_type and content_type.split(";")[0].strip().lower() in ZIP_CONTENT_TYPES:
+        return True
+    return bool(filename) and filename.lower().endswith(".zip")
+
+
+def iter_zip_entries(data: bytes, max_bytes: int | None = None) -> Iterator[IngestEntry]:
+    """Yield the files of a zip archive, each decompressed only when its entry is read.
+
+    Directories, macOS resource forks and hidden files are skipped. An entry whose
+    declared or actual size exceeds max_bytes fails when read, not when listed.
+    """
+    limit = max_bytes or max_entry_bytes()
+    # BytesIO over the request body shares its buffer rather than copying it
+    archive = zipfile.ZipFile(io.BytesIO(data))
+
+    for info in archive.infolist():
+        name = posixpath.basename(info.filename)
+        if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+
+        def read(info=info) -> bytes:
+            if info.file_size > limit:
+                raise ValueError(f"{info.filename} is {info.file_size} bytes, over the {limit} byte limit")
+            with archive.open(info) as entry:
+                # Declared sizes can lie; never inflate past the limit
+                content = entry.read(limit + 1)
+            if len(content) > limit:
+                raise ValueError(f"{info.filename} is over the {limit} byte limit")
+            return content
+
+        yield IngestEntry(name, guess_content_type(name), read)
+
+
+def unique_names(entries: Iterable[IngestEntry]) -> Iterator[IngestEntry]:
+    """Rename repeated filenames (invoice.pdf, invoice-2.pdf, ...) so their blobs do not overwrite each other."""
+    seen: dict[str, int] = {}
+    for entry in entries:
+        count = seen.get(entry.filename.lower(), 0) + 1
+        seen[entry.filename.lower()] = count
+        if count > 1:
+            stem, ext = posixpath.splitext(entry.filename)
+            entry = entry._replace(filename=f"{stem}-{count}{ext}")
+        yield entry
+
+
+async def ingest_entries(
+    entries: Iterable[IngestEntry],
+    store: Callable[[IngestEntry, bytes], "asyncio.Future[dict]"],
+    concurrency: int | None = None
+) -> list[dict]:
+    """Store batch entries with at most `concurrency` in flight, returning one result per entry in order.
+
+    An entry is read (for zip members, decompressed) only once a slot is free, so the
+    batch never holds more than `concurrency` files in memory. A file that cannot be
+    read or stored gets {"filename", "error"} instead of failing the batch.
+    """
+    limit = concurrency or int(os.environ.get("BATCH_INGEST_CONCURRENCY", "8"))
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(entry: IngestEntry, content: bytes) -> dict:
+        try:
+            return await store(entry, content)
+        except Exception as e:
+            logger.exception(f"Failed to ingest {entry.filename}")
+            return {"filename": entry.filename, "error": str(e)}
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        for entry in entries:
+            await semaphore.acquire()
+            try:
+                content = await asyncio.to_thread(entry.read)
+            except Exception as e:
+                semaphore.release()
+                logger.exception(f"Failed to read {entry.filename}")
+                tasks.append(_done({"filename": entry.filename, "error": str(e)}))
+                continue
+            tasks.append(asyncio.create_task(run(entry, content)))
+    except BaseException:
+        # Iterating the entries failed; let the stores already under way finish before
+        # reporting it
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return list(await asyncio.gather(*tasks))
+
+
+def _done(value: dict) -> "asyncio.Future[dict]":
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+# Statuses a job moves through; these match DocumentStatus values
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+# Batch status once every job has finished but some failed
+COMPLETED_WITH_ERRORS = "completed_with_errors"
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def landing_blob_name(job_id: str, filename: str) -> str:
+    """Where an uploaded file is stored in the landing zone; the job id keeps uploads of the same name apart."""
+    return f"{job_id}/{filename}"
+
+
+def is_job_id(value: str) -> bool:
+    return bool(JOB_ID_PATTERN.fullmatch(value))
+
+
+class JobBackend(Protocol):
+    async def get(self, job_id: str) -> bytes | None: ...
+
+    async def put(self, job_id: str, data: bytes): ...
+
+
+class LocalJobBackend:
+    """Job records as files in a local directory, used for tests and local development."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _read(self, job_id: str) -> bytes | None:
+        path = self._path(job_id)
+        return path.read_bytes() if path.exists() else None
+
+    def _write(self, job_id: str, data: bytes):
+        path = self._path(job_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    async def get(self, job_id: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, job_id)
+
+    async def put(self, job_id: str, data: bytes):
+        await asyncio.to_thread(self._write, job_id, data)
+
+
+class BlobJobBackend:
+    """Job records as small JSON blobs in a dedicated container."""
+
+    def __init__(self, container: str = "jobs", storage_helper=None):
+        self.container = container
+        self._storage_helper = storage_helper
+
+    @property
+    def storage_helper(self):
+        if self._storage_helper is None:
+            from .clients import get_storage_helper
+
+            self._storage_helper = get_storage_helper()
+        return self._storage_helper
+
+    async def get(self, job_id: str) -> bytes | None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            return await self.storage_helper.download_blob(container=self.container, blob_name=f"{job_id}.json")
+        except ResourceNotFoundError:
+            return None
+
+    async def put(self, job_id: str, data: bytes):
+        await self.storage_helper.upload_blob(
+            container=self.container,
+            blob_name=f"{job_id}.json",
+            data=data,
+            content_type="application/json"
+        )
+
+
+class JobStore:
+    """Status records for documents accepted by POST /upload and processed in the background.
+
+    A record holds the job's status, the document it produced and its export URLs, so
+    clients poll a few hundred bytes instead of the document's JSON export. Each job is
+    written by one step at a time (upload, then the worker), so updates read and rewrite
+    the record without locking. A POST /batches request adds one more record listing
+    its jobs, which is aggregated on read rather than updated as they finish.
+    """
+
+    def __init__(self, backend: JobBackend):
+        self.backend = backend
+
+    async def create(
+        self,
+        filename: str,
+        blob_name: str,
+        content_type: str,
+        size: int,
+        batch_id: str | None = None,
+        job_id: str | None = None
+    ) -> dict:
+        now = datetime.now(UTC).isoformat()
+        job = {
+            "id": job_id or new_job_id(),
+            "status": PENDING,
+            "batch_id": batch_id,
+            "filename": filename,
+            "blob_name": blob_name,
+            "content_type": content_type,
+            "size_bytes": size,
+            "document_id": None,
+            "confidence": None,
+            "page_count": None,
+            "exports": {},
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        await self._write(job)
+        return job
+
+    async def get(self, job_id: str) -> dict | None:
+        if not is_job_id(job_id):
+            return None
+        data = await self.backend.get(job_id)
+        return json.loads(data) if data is not None else None
+
+    async def update(self, job_id: str, **changes) -> dict | None:
+        job = await self.get(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} not found, status update dropped")
+            return None
+        job.update(changes, updated_at=datetime.now(UTC).isoformat())
+        await self._write(job)
+        return job
+
+    async def create_batch(self, batch_id: str, files: list[dict]) -> dict:
+        """Record a POST /batches request: its id and, per file, the job id or ingest error."""
+        batch = {
+            "id": batch_id,
+            "kind": "batch",
+            "files": files,
+            "created_at": datetime.now(UTC).isoformat()
+        }
+        await self._write(batch)
+        return batch
+
+    async def get_batch_status(self, batch_id: str, concurrency: int = 16) -> dict | None:
+        """Aggregate the current status of a batch's jobs, reading at most `concurrency` records at a time."""
+        batch = await self.get(batch_id)
+        if batch is None or batch.get("kind") != "batch":
+            return None
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(entry: dict) -> dict:
+            if not entry.get("job_id"):
+                return {"filename": entry["filename"], "job_id": None, "status": FAILED, "error": entry.get("error")}
+            async with semaphore:
+                job = await self.get(entry["job_id"])
+            if job is None:
+                return {"filename": entry["filename"], "job_id": entry["job_id"], "status": FAILED, "error": "Job not found"}
+            return {
+                "filename": entry["filename"],
+                "job_id": job["id"],
+                "status": job["status"],
+                "document_id": job["document_id"],
+                "error": job["error"]
+            }
+
+        jobs = await asyncio.gather(*(load(entry) for entry in batch["files"]))
+        counts = {status: 0 for status in (PENDING, PROCESSING, COMPLETED, FAILED)}
+        for job in jobs:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+
+        return {
+            "id": batch_id,
+            "status": batch_status(counts),
+            "total": len(jobs),
+            "counts": counts,
+            "jobs": list(jobs),
+            "created_at": batch["created_at"]
+        }
+
+    async def _write(self, job: dict):
+        await self.backend.put(job["id"], json.dumps(job).encode("utf-8"))
+
+
+def batch_status(counts: dict[str, int]) -> str:
+    total = sum(counts.values())
+    if counts.get(PENDING, 0) == total:
+        return PENDING
+    if counts.get(PENDING, 0) or counts.get(PROCESSING, 0):
+        return PROCESSING
+    if counts.get(FAILED, 0) == total:
+        return FAILED
+    return COMPLETED_WITH_ERRORS if counts.get(FAILED, 0) else COMPLETED
+
+
+_store: JobStore | None = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        if os.environ.get("JOB_STORE_BACKEND", "blob").lower() == "local":
+            backend: JobBackend = LocalJobBackend(os.environ.get("JOB_STORE_DIR", ".jobs"))
+        else:
+            backend = BlobJobBackend(container=os.environ.get("JOB_STORE_CONTAINER", "jobs"))
+        _store = JobStore(backend)
+    return _store
@@ -0,0 +1,40 @@
+import asyncio
+import atexit
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+_shutdown_hooks: list[ShutdownHook] = []
+
+
+def on_shutdown(hook: ShutdownHook) -> ShutdownHook:
+    """Register a coroutine function to run when the worker process shuts down."""
+    if hook not in _shutdown_hooks:
+        _shutdown_hooks.append(hook)
+    return hook
+
+
+async def shutdown():
+    # Tear down in reverse registration order so dependants close before what they use
+    while _shutdown_hooks:
+        hook = _shutdown_hooks.pop()
+        try:
+            await hook()
+        except Exception:
+            logger.exception(f"Shutdown hook {getattr(hook, '__name__', hook)} failed")
+
+
+def _run_at_exit():
+    # This runs on a new loop: hooks holding state bound to the worker's loop must not await it
+    if not _shutdown_hooks:
+        return
+    try:
+        asyncio.run(shutdown())
+    except Exception:
+        logger.exception("Error during shutdown")
+
+
+atexit.register(_run_at_exit)
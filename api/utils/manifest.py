@@ -0,0 +1,504 @@
+import asyncio
+import base64
+import functools
+import hashlib
+import heapq
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+PAGES_NAME = "pages.json"
+BACKFILL_MARKER = "backfill.json"
+# The field compacted pages are sorted by; queries on other fields read every entry
+PAGE_SORT = "processed_at"
+# Lines per append when backfilling, well under the 4 MiB append block limit
+BACKFILL_APPEND_LINES = 1000
+SORT_FIELDS = ("processed_at", "created_at", "updated_at", "confidence", "page_count", "filename", "id")
+
+
+def utc_timestamp(value: datetime | None) -> str | None:
+    """The one format manifest timestamps are written in, since pages and cursors compare them as strings.
+
+    Naive datetimes, such as the models' utcnow() values, are taken to be UTC.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat()
+
+
+class ManifestBackend(Protocol):
+    async def append(self, shard: int, name: str, data: bytes): ...
+
+    async def list_segments(self, shard: int) -> list[str]: ...
+
+    async def read(self, shard: int, name: str) -> bytes | None: ...
+
+    async def write(self, shard: int, name: str, data: bytes): ...
+
+    async def delete(self, shard: int, name: str): ...
+
+
+class LocalManifestBackend:
+    """Manifest storage in a local directory, used for tests and local development."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, shard: int, name: str) -> Path:
+        return self.directory / f"{shard:02d}" / name
+
+    def _append(self, shard: int, name: str, data: bytes):
+        path = self._path(shard, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(data)
+
+    def _list(self, shard: int) -> list[str]:
+        shard_dir = self.directory / f"{shard:02d}"
+        if not shard_dir.exists():
+            return []
+        return sorted(p.name for p in shard_dir.glob("segment-*.jsonl"))
+
+    def _read(self, shard: int, name: str) -> bytes | None:
+        path = self._path(shard, name)
+        return path.read_bytes() if path.exists() else None
+
+    def _write(self, shard: int, name: str, data: bytes):
+        path = self._path(shard, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def _delete(self, shard: int, name: str):
+        self._path(shard, name).unlink(missing_ok=True)
+
+    async def append(self, shard: int, name: str, data: bytes):
+        await asyncio.to_thread(self._append, shard, name, data)
+
+    async def list_segments(self, shard: int) -> list[str]:
+        return await asyncio.to_thread(self._list, shard)
+
+    async def read(self, shard: int, name: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, shard, name)
+
+    async def write(self, shard: int, name: str, data: bytes):
+        await asyncio.to_thread(self._write, shard, name, data)
+
+    async def delete(self, shard: int, name: str):
+        await asyncio.to_thread(self._delete, shard, name)
+
+
+class BlobManifestBackend:
+    """Manifest storage in a blob container; segments are append blobs."""
+
+    def __init__(self, container: str = "manifest", storage_helper=None):
+        self.container = container
+        self._storage_helper = storage_helper
+
+    async def _container_client(self):
+        if self._storage_helper is None:
+            from .clients import get_storage_helper
+
+            self._storage_helper = get_storage_helper()
+        return await self._storage_helper.get_container_client(self.container)
+
+    async def append(self, shard: int, name: str, data: bytes):
+        from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+        container = await self._container_client()
+        blob_client = container.get_blob_client(f"{shard:02d}/{name}")
+        try:
+            await blob_client.append_block(data)
+        except ResourceNotFoundError:
+            try:
+                await blob_client.create_append_blob(if_none_match="*")
+            except ResourceExistsError:
+                pass
+            await blob_client.append_block(data)
+
+    async def list_segments(self, shard: int) -> list[str]:
+        container = await self._container_client()
+        prefix = f"{shard:02d}/segment-"
+        names = [blob.name async for blob in container.list_blobs(name_starts_with=prefix)]
+        return sorted(name.split("/", 1)[1] for name in names)
+
+    async def read(self, shard: int, name: str) -> bytes | None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        container = await self._container_client()
+        try:
+            download = await container.get_blob_client(f"{shard:02d}/{name}").download_blob()
+            return await download.readall()
+        except ResourceNotFoundError:
+            return None
+
+    async def write(self, shard: int, name: str, data: bytes):
+        container = await self._container_client()
+        await container.get_blob_client(f"{shard:02d}/{name}").upload_blob(data, overwrite=True)
+
+    async def delete(self, shard: int, name: str):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        container = await self._container_client()
+        try:
+            await container.get_blob_client(f"{shard:02d}/{name}").delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+
+class ManifestIndex:
+    """Catalogue of processed documents kept as sharded, append-only JSON-lines segments.
+
+    Each write appends one line to the shard's current hourly segment. Compaction folds
+    closed segments into the shard's pages: the newest record per document, sorted by
+    PAGE_SORT and split into pages of page_size entries, with an index of each page's
+    first and last key. A query on PAGE_SORT reads only the pages at and after its
+    continuation key, merged across shards with the open segments, so a page costs
+    about the same however large the manifest grows. Other sort fields read every entry.
+
+    Continuation tokens carry the (sort key, id) of the last document returned rather
+    than an offset, so documents added or updated between requests do not shift pages.
+    """
+
+    def __init__(self, backend: ManifestBackend, shards: int = 16, page_size: int = 1000):
+        self.backend = backend
+        self.shards = shards
+        self.page_size = page_size
+        self._backfilled = False
+
+    def shard_for(self, document_id: str) -> int:
+        return int(hashlib.sha1(document_id.encode("utf-8")).hexdigest()[:8], 16) % self.shards
+
+    @staticmethod
+    def _segment_name(at: datetime) -> str:
+        return f"segment-{at:%Y%m%d%H}.jsonl"
+
+    def _current_segment(self) -> str:
+        return self._segment_name(datetime.now(UTC))
+
+    def _open_segments(self) -> set[str]:
+        now = datetime.now(UTC)
+        # The last two hours may still receive appends (clock skew between instances)
+        return {self._segment_name(now), self._segment_name(now - timedelta(hours=1))}
+
+    @staticmethod
+    def _line(entry: dict) -> bytes:
+        return (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+    async def record(self, entry: dict):
+        entry = {**entry, "updated_at": utc_timestamp(datetime.now(UTC))}
+        await self.backend.append(self.shard_for(entry["id"]), self._current_segment(), self._line(entry))
+
+    @staticmethod
+    def _apply(entries: dict[str, dict], data: bytes | None):
+        if not data:
+            return
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn final line from an interrupted append is skipped, not fatal
+                continue
+            current = entries.get(entry["id"])
+            if current is None or entry.get("updated_at", "") >= current.get("updated_at", ""):
+                entries[entry["id"]] = entry
+
+    async def _read_pages(self, shard: int) -> list[dict]:
+        data = await self.backend.read(shard, PAGES_NAME)
+        return json.loads(data)["pages"] if data else []
+
+    async def _read_segments(self, shard: int, names: list[str]) -> dict[str, dict]:
+        entries: dict[str, dict] = {}
+        contents = await asyncio.gather(*(self.backend.read(shard, name) for name in names))
+        for data in contents:
+            self._apply(entries, data)
+        return entries
+
+    async def _read_shard(self, shard: int) -> dict[str, dict]:
+        entries: dict[str, dict] = {}
+        pages = await self._read_pages(shard)
+        for data in await asyncio.gather(*(self.backend.read(shard, page["name"]) for page in pages)):
+            self._apply(entries, data)
+        # Segments are newer than the pages compacted from them
+        entries.update(await self._read_segments(shard, await self.backend.list_segments(shard)))
+        return entries
+
+    async def entries(self) -> list[dict]:
+        shards = await asyncio.gather(*(self._read_shard(shard) for shard in range(self.shards)))
+        return [entry for entries in shards for entry in entries.values()]
+
+    async def query(
+        self,
+        status: str | None = None,
+        min_confidence: float | None = None,
+        prefix: str = "",
+        sort: str = "processed_at",
+        descending: bool = True,
+        limit: int = 100,
+        continuation: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort field: {sort}. Supported: {', '.join(SORT_FIELDS)}")
+        cursor = decode_continuation(continuation, sort, descending)
+        order = functools.cmp_to_key(functools.partial(_compare, descending=descending))
+
+        def matches(entry: dict) -> bool:
+            if status and entry.get("status") != status:
+                return False
+            if min_confidence is not None and (entry.get("confidence") or 0.0) < min_confidence:
+                return False
+            return entry["id"].startswith(prefix)
+
+        if sort == PAGE_SORT:
+            streams = [self._stream_shard(shard, descending, cursor) for shard in range(self.shards)]
+        else:
+            entries = [e for e in await self.entries() if _follows(e, sort, cursor, descending)]
+            streams = [_iterate(sorted(entries, key=lambda e: order(_position(e, sort))))]
+
+        page: list[dict] = []
+        async for entry in _merge(streams, lambda e: order(_position(e, sort))):
+            if not matches(entry):
+                continue
+            if len(page) == limit:
+                return page, encode_continuation(sort, descending, _position(page[-1], sort))
+            page.append(entry)
+        return page, None
+
+    async def _stream_shard(
+        self,
+        shard: int,
+        descending: bool,
+        cursor: list | None
+    ) -> AsyncIterator[dict]:
+        """Yield a shard's entries after the cursor, in query order, reading pages only as needed."""
+        order = functools.cmp_to_key(functools.partial(_compare, descending=descending))
+        pages = await self._read_pages(shard)
+        recent = await self._read_segments(shard, await self.backend.list_segments(shard))
+
+        present = [page for page in pages if not page["missing"]]
+        ordered = (present[::-1] if descending else present) + [page for page in pages if page["missing"]]
+        if cursor is not None:
+            # A page whose last entry in query order is not after the cursor holds nothing to return
+            ordered = [
+                page for page in ordered
+                if _compare(page["first"] if descending and not page["missing"] else page["last"], cursor, descending) > 0
+            ]
+
+        async def compacted() -> AsyncIterator[dict]:
+            for page in ordered:
+                entries: dict[str, dict] = {}
+                self._apply(entries, await self.backend.read(shard, page["name"]))
+                for entry in sorted(entries.values(), key=lambda e: order(_position(e, PAGE_SORT))):
+                    # Open segments hold the newer record of a document they mention
+                    if entry["id"] not in recent and _follows(entry, PAGE_SORT, cursor, descending):
+                        yield entry
+
+        fresh = sorted(
+            (e for e in recent.values() if _follows(e, PAGE_SORT, cursor, descending)),
+            key=lambda e: order(_position(e, PAGE_SORT))
+        )
+        async for entry in _merge([compacted(), _iterate(fresh)], lambda e: order(_position(e, PAGE_SORT))):
+            yield entry
+
+    async def compact(self, shard: int | None = None):
+        shards = range(self.shards) if shard is None else [shard]
+        open_segments = self._open_segments()
+
+        for shard_index in shards:
+            segments = await self.backend.list_segments(shard_index)
+            closed = [name for name in segments if name not in open_segments]
+            if not closed:
+                continue
+
+            # Only closed segments are folded, so the open ones stay newer than the pages
+            old_pages = await self._read_pages(shard_index)
+            entries: dict[str, dict] = {}
+            for data in await asyncio.gather(*(self.backend.read(shard_index, page["name"]) for page in old_pages)):
+                self._apply(entries, data)
+            for data in await asyncio.gather(*(self.backend.read(shard_index, name) for name in closed)):
+                self._apply(entries, data)
+
+            pages = await self._write_pages(shard_index, list(entries.values()))
+            # The page list is replaced in one write, so readers see the old pages or the new ones
+            await self.backend.write(shard_index, PAGES_NAME, json.dumps({"sort": PAGE_SORT, "pages": pages}).encode("utf-8"))
+            current = {page["name"] for page in pages}
+            for name in [page["name"] for page in old_pages if page["name"] not in current] + closed:
+                await self.backend.delete(shard_index, name)
+
+            logger.info(
+                f"Compacted manifest shard {shard_index}: {len(entries)} entries in {len(pages)} pages, "
+                f"{len(closed)} segments"
+            )
+
+    async def _write_pages(self, shard: int, entries: list[dict]) -> list[dict]:
+        order = functools.cmp_to_key(functools.partial(_compare, descending=False))
+        entries.sort(key=lambda e: order(_position(e, PAGE_SORT)))
+        present = [e for e in entries if e.get(PAGE_SORT) is not None]
+        missing = [e for e in entries if e.get(PAGE_SORT) is None]
+        generation = datetime.now(UTC).strftime("%Y%m%d%H%M%S%f")
+
+        pages = []
+        for group, is_missing in ((present, False), (missing, True)):
+            for start in range(0, len(group), self.page_size):
+                chunk = group[start:start + self.page_size]
+                name = f"page-{generation}-{len(pages):05d}.jsonl"
+                await self.backend.write(shard, name, b"".join(self._line(e) for e in chunk))
+                pages.append({
+                    "name": name,
+                    "missing": is_missing,
+                    "first": _position(chunk[0], PAGE_SORT),
+                    "last": _position(chunk[-1], PAGE_SORT),
+                    "count": len(chunk)
+                })
+        return pages
+
+    async def is_backfilled(self) -> bool:
+        if not self._backfilled:
+            self._backfilled = await self.backend.read(0, BACKFILL_MARKER) is not None
+        return self._backfilled
+
+    async def backfill(self, storage_helper) -> int:
+        """Add documents already in the results container, so the index can replace its listing.
+
+        Entries carry only what the listing shows (exports and last-modified time), and a
+        document already in the index is left alone. Returns how many were added.
+        """
+        container = await storage_helper.get_container_client(storage_helper.extracted_data_container)
+        known = {entry["id"] for entry in await self.entries()}
+
+        documents: dict[str, dict] = {}
+        async for blob in container.list_blobs():
+            if blob.name.endswith(".result.json"):
+                base_name, ext = blob.name[:-len(".result.json")], "result"
+            else:
+                base_name, _, ext = blob.name.rpartition(".")
+            if not base_name or base_name in known:
+                continue
+            modified = utc_timestamp(blob.last_modified)
+            document = documents.setdefault(base_name, {
+                "id": base_name,
+                "status": "completed",
+                "confidence": None,
+                "page_count": None,
+                "exports": {},
+                "processed_at": modified,
+                # Older than any record process_document writes from now on, so those win
+                "updated_at": modified or ""
+            })
+            document["exports"][ext] = container.get_blob_client(blob.name).url
+            if modified and (document["processed_at"] is None or modified > document["processed_at"]):
+                document["processed_at"] = document["updated_at"] = modified
+
+        by_shard: dict[int, list[bytes]] = {}
+        for document in documents.values():
+            by_shard.setdefault(self.shard_for(document["id"]), []).append(self._line(document))
+        segment = self._current_segment()
+        for shard, lines in by_shard.items():
+            for start in range(0, len(lines), BACKFILL_APPEND_LINES):
+                await self.backend.append(shard, segment, b"".join(lines[start:start + BACKFILL_APPEND_LINES]))
+
+        marker = {"backfilled_at": datetime.now(UTC).isoformat(), "documents": len(documents)}
+        await self.backend.write(0, BACKFILL_MARKER, json.dumps(marker).encode("utf-8"))
+        self._backfilled = True
+        logger.info(f"Backfilled the manifest with {len(documents)} documents from the results container")
+        return len(documents)
+
+
+def _position(entry: dict, sort: str) -> list:
+    """Where an entry sorts: [missing, value, id]; entries without the sort value go last."""
+    value = entry.get(sort)
+    return [value is None, value if value is not None else "", entry["id"]]
+
+
+def _compare(a: list, b: list, descending: bool) -> int:
+    if a[0] != b[0]:
+        return 1 if a[0] else -1
+    if a[0]:
+        # Entries missing the sort value are ordered by id ascending in either direction
+        x, y = a[2], b[2]
+    else:
+        x, y = (a[1], a[2]), (b[1], b[2])
+        if descending:
+            x, y = y, x
+    return (x > y) - (x < y)
+
+
+def _follows(entry: dict, sort: str, cursor: list | None, descending: bool) -> bool:
+    return cursor is None or _compare(_position(entry, sort), cursor, descending) > 0
+
+
+async def _iterate(items: list[dict]) -> AsyncIterator[dict]:
+    for item in items:
+        yield item
+
+
+async def _merge(streams: list[AsyncIterator[dict]], key) -> AsyncIterator[dict]:
+    """Merge streams that are each already in key order, pulling one entry at a time."""
+    heap = []
+    for index, stream in enumerate(streams):
+        entry = await anext(stream, None)
+        if entry is not None:
+            heapq.heappush(heap, (key(entry), index, entry))
+    while heap:
+        _, index, entry = heapq.heappop(heap)
+        yield entry
+        following = await anext(streams[index], None)
+        if following is not None:
+            heapq.heappush(heap, (key(following), index, following))
+
+
+def encode_continuation(sort: str, descending: bool, position: list) -> str:
+    token = json.dumps({"sort": sort, "desc": descending, "after": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii")
+
+
+def decode_continuation(token: str | None, sort: str, descending: bool) -> list | None:
+    """The position a continuation token resumes after, or None for the first page."""
+    if not token:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        position = data["after"]
+        if len(position) != 3 or not isinstance(position[2], str):
+            raise ValueError(token)
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid continuation token") from None
+    if data.get("sort") != sort or data.get("desc") != descending:
+        raise ValueError("Continuation token was issued for a different sort or order")
+    return position
+
+
+_index: ManifestIndex | None = None
+_index_configured = False
+
+
+def get_manifest_index() -> ManifestIndex | None:
+    """Return the process-wide manifest index, or None when MANIFEST_BACKEND=none."""
+    global _index, _index_configured
+    if not _index_configured:
+        backend_name = os.environ.get("MANIFEST_BACKEND", "blob").lower()
+        backend: ManifestBackend | None = None
+        if backend_name == "local":
+            backend = LocalManifestBackend(os.environ.get("MANIFEST_DIR", ".manifest"))
+        elif backend_name == "blob":
+            backend = BlobManifestBackend(container=os.environ.get("MANIFEST_CONTAINER", "manifest"))
+
+        if backend is not None:
+            _index = ManifestIndex(
+                backend,
+                shards=int(os.environ.get("MANIFEST_SHARDS", "16")),
+                page_size=int(os.environ.get("MANIFEST_PAGE_SIZE", "1000"))
+            )
+        _index_configured = True
+    return _index
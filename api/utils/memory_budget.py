@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentTooLarge(ValueError):
+    """The document is larger than the whole budget, so it can never be admitted."""
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """The budget stayed full for the wait timeout; the document should be retried later."""
+
+
+class MemoryBudget:
+    """Caps the bytes of documents processed at once in this worker process.
+
+    Concurrent invocations share one process, so a few large documents arriving together
+    could exhaust it and take every other invocation down with it. Each document
+    reserves its size before it is read. A document that cannot fit yet waits, in
+    arrival order, up to wait_timeout seconds and then raises MemoryBudgetExceeded so
+    its trigger retries it later. One that could never fit raises DocumentTooLarge.
+    max_concurrency also caps how many documents hold a reservation at once. A capacity
+    of 0 leaves bytes unlimited; with max_concurrency also 0 the budget is disabled.
+
+    A budget given a lender may also use the lender's capacity while the lender has
+    nothing in flight or waiting. The lender then waits until those bytes are handed back.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        wait_timeout: float = 60.0,
+        max_concurrency: int = 0,
+        lender: "MemoryBudget | None" = None
+    ):
+        self.capacity = capacity
+        self.wait_timeout = wait_timeout
+        self.max_concurrency = max_concurrency
+        self.in_use = 0
+        self.active = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+        self._lender = lender if lender is not None and lender.capacity > 0 and capacity > 0 else None
+        self._borrower: MemoryBudget | None = None
+        if self._lender is not None:
+            self._lender._borrower = self
+
+    @property
+    def limit(self) -> int:
+        """The most bytes one document can reserve, 0 for no limit."""
+        return self.capacity + (self._lender.capacity if self._lender is not None else 0)
+
+    @property
+    def borrowed(self) -> int:
+        return max(0, self.in_use - self.capacity) if self._lender is not None else 0
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        if self.capacity <= 0 and self.max_concurrency <= 0:
+            yield
+            return
+        if 0 < self.limit < size:
+            raise DocumentTooLarge(
+                f"Document is {size} bytes, over the {self.limit} byte in-flight memory budget"
+            )
+
+        await self._acquire(size)
+        try:
+            yield
+        finally:
+            self._release(size)
+
+    def stats(self) -> dict:
+        return {"capacity": self.capacity, "in_use": self.in_use, "active": self.active, "waiting": len(self._waiters)}
+
+    def _fits(self, size: int) -> bool:
+        if self.max_concurrency > 0 and self.active >= self.max_concurrency:
+            return False
+        if self.capacity <= 0:
+            return True
+        lent = self._borrower.borrowed if self._borrower is not None else 0
+        if self.in_use + size <= self.capacity - lent:
+            return True
+        lender = self._lender
+        return (
+            lender is not None
+            and lender.active == 0
+            and not lender._waiters
+            and self.in_use + size <= self.limit
+        )
+
+    def _take(self, size: int):
+        self.in_use += size
+        self.active += 1
+
+    async def _acquire(self, size: int):
+        if not self._waiters and self._fits(size):
+            self._take(size)
+            return
+
+        # Futures are created on the running loop, so the budget is not tied to one loop
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (size, waiter)
+        self._waiters.append(entry)
+        logger.info(
+            f"Waiting for {size} bytes of memory budget ({self.in_use}/{self.capacity} bytes, {self.active} documents in flight)"
+        )
+        try:
+            await asyncio.wait_for(waiter, self.wait_timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the wait ended; hand it back
+                self._release(size)
+            else:
+                # _wake() may already have dropped the cancelled entry
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                # Leaving the head of the line may let the next waiter in
+                self._wake()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise MemoryBudgetExceeded(
+                f"No room for {size} bytes within {self.wait_timeout:.0f}s "
+                f"({self.in_use}/{self.capacity} bytes in flight)"
+            ) from None
+
+    def _release(self, size: int):
+        self.in_use -= size
+        self.active -= 1
+        self._wake()
+        # Returned bytes may be what the other side of a loan was waiting for
+        for other in (self._lender, self._borrower):
+            if other is not None:
+                other._wake()
+
+    def _wake(self):
+        while self._waiters:
+            size, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(size):
+                break
+            self._waiters.popleft()
+            self._take(size)
+            waiter.set_result(None)
+
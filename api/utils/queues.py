@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, replace
+from typing import Protocol
+
+from .credentials import get_credential
+from .lifecycle import on_shutdown
+
+logger = logging.getLogger(__name__)
+
+# Queue the document_queue_processor function listens on; the Functions host moves
+# messages that fail maxDequeueCount times to "<name>-poison"
+INGEST_QUEUE = "document-ingest"
+POISON_QUEUE = f"{INGEST_QUEUE}-poison"
+
+
+def ingest_mode() -> str:
+    """How new landing-zone files reach process_document.
+
+    blob: the landing-zone blob trigger (default)
+    queue: POST /upload and /batches enqueue a message for the queue trigger
+    events: an Event Grid BlobCreated subscription enqueues the message
+    """
+    return os.environ.get("INGEST_MODE", "blob").lower()
+
+
+@dataclass
+class QueueMessage:
+    id: str
+    content: str
+    dequeue_count: int = 0
+    pop_receipt: str | None = None
+
+
+class MessageQueue(Protocol):
+    async def send(self, content: str, visibility_timeout: int | None = None): ...
+
+    async def receive(self, max_messages: int, visibility_timeout: int) -> list[QueueMessage]: ...
+
+    async def update_visibility(self, message: QueueMessage, visibility_timeout: float) -> QueueMessage: ...
+
+    async def delete(self, message: QueueMessage): ...
+
+
+class InMemoryQueue:
+    """A storage queue stand-in for tests and local runs of QueueWorker.
+
+    Follows the service's rules: received messages are hidden for the visibility timeout
+    and come back with a higher dequeue_count unless deleted, and every receive or
+    visibility update issues a new pop receipt, so a worker holding a stale one gets
+    LookupError, as it would get a 404 from Azure.
+    """
+
+    def __init__(self, name: str = INGEST_QUEUE, clock=time.monotonic):
+        self.name = name
+        self._clock = clock
+        # id -> [message, visible_at]; dicts keep insertion order, so receives are FIFO
+        self._messages: dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    async def send(self, content: str, visibility_timeout: int | None = None) -> QueueMessage:
+        message = QueueMessage(id=uuid.uuid4().hex, content=content)
+        self._messages[message.id] = [message, self._clock() + (visibility_timeout or 0)]
+        return replace(message)
+
+    async def receive(self, max_messages: int = 1, visibility_timeout: int = 30) -> list[QueueMessage]:
+        now = self._clock()
+        received = []
+        for entry in self._messages.values():
+            if len(received) >= max_messages:
+                break
+            message, visible_at = entry
+            if visible_at <= now:
+                message.dequeue_count += 1
+                message.pop_receipt = uuid.uuid4().hex
+                entry[1] = now + visibility_timeout
+                received.append(replace(message))
+        return received
+
+    async def update_visibility(self, message: QueueMessage, visibility_timeout: float) -> QueueMessage:
+        entry = self._entry(message)
+        entry[0].pop_receipt = uuid.uuid4().hex
+        entry[1] = self._clock() + visibility_timeout
+        return replace(entry[0])
+
+    async def delete(self, message: QueueMessage):
+        self._entry(message)
+        del self._messages[message.id]
+
+    def _entry(self, message: QueueMessage) -> list:
+        entry = self._messages.get(message.id)
+        if entry is None or entry[0].pop_receipt != message.pop_receipt:
+            raise LookupError(f"Message {message.id} was deleted or received again")
+        return entry
+
+
+class StorageQueue:
+    """An Azure Storage queue, with messages base64-encoded as the Functions queue trigger expects."""
+
+    def __init__(self, queue_name: str = INGEST_QUEUE, account_name: str | None = None):
+        self.queue_name = queue_name
+        self.account_name = account_name or os.environ.get("STORAGE_ACCOUNT_NAME", "")
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from azure.storage.queue import (
+                TextBase64DecodePolicy,
+                TextBase64EncodePolicy,
+            )
+            from azure.storage.queue.aio import QueueClient
+
+            policies = {
+                "message_encode_policy": TextBase64EncodePolicy(),
+                "message_decode_policy": TextBase64DecodePolicy()
+            }
+            connection_string = os.environ.get("AzureWebJobsStorage")
+            if connection_string and "UseDevelopmentStorage" not in connection_string:
+                self._client = QueueClient.from_connection_string(connection_string, self.queue_name, **policies)
+            else:
+                self._client = QueueClient(
+                    account_url=f"https://{self.account_name}.queue.core.windows.net",
+                    queue_name=self.queue_name,
+                    credential=get_credential(),
+                    **policies
+                )
+        return self._client
+
+    async def send(self, content: str, visibility_timeout: int | None = None):
+        await self._get_client().send_message(content, visibility_timeout=visibility_timeout)
+
+    async def receive(self, max_messages: int, visibility_timeout: int) -> list[QueueMessage]:
+        received = []
+        pages = self._get_client().receive_messages(
+            messages_per_page=max_messages,
+            visibility_timeout=visibility_timeout,
+            max_messages=max_messages
+        )
+        async for message in pages:
+            received.append(QueueMessage(message.id, message.content, message.dequeue_count, message.pop_receipt))
+        return received
+
+    async def update_visibility(self, message: QueueMessage, visibility_timeout: float) -> QueueMessage:
+        updated = await self._get_client().update_message(
+            message.id,
+            pop_receipt=message.pop_receipt,
+            visibility_timeout=int(visibility_timeout)
+        )
+        return replace(message, pop_receipt=updated.pop_receipt)
+
+    async def delete(self, message: QueueMessage):
+        await self._get_client().delete_message(message.id, pop_receipt=message.pop_receipt)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+def ingest_message(
+    blob_name: str,
+    job_id: str | None = None,
+    content_type: str | None = None,
+    batch_id: str | None = None
+) -> str:
+    """The queue message for one landing-zone file: a blob name and, if known, its job."""
+    message = {"blob_name": blob_name, "job_id": job_id, "content_type": content_type, "batch_id": batch_id}
+    return json.dumps({key: value for key, value in message.items() if value is not None})
+
+
+def parse_ingest_message(content: str, container: str = "landing-zone") -> dict:
+    """Read an ingest_message() or an Event Grid BlobCreated event for the landing zone."""
+    data = json.loads(content)
+    if "blob_name" in data:
+        return data
+
+    # Event Grid and CloudEvents schemas name the event type differently
+    event_type = data.get("eventType") or data.get("type")
+    prefix = f"/blobServices/default/containers/{container}/blobs/"
+    subject = data.get("subject", "")
+    if event_type == "Microsoft.Storage.BlobCreated" and subject.startswith(prefix):
+        return {
+            "blob_name": subject[len(prefix):],
+            "content_type": (data.get("data") or {}).get("contentType")
+        }
+    raise ValueError(f"Not an ingest message for {container}: {content[:200]}")
+
+
+_ingest_queue: StorageQueue | None = None
+
+
+def get_ingest_queue() -> StorageQueue:
+    global _ingest_queue
+    if _ingest_queue is None:
+        _ingest_queue = StorageQueue(INGEST_QUEUE)
+        on_shutdown(close_ingest_queue)
+    return _ingest_queue
+
+
+async def close_ingest_queue():
+    global _ingest_queue
+    if _ingest_queue is not None:
+        await _ingest_queue.close()
+        _ingest_queue = None
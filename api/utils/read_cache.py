@@ -0,0 +1,179 @@
+import logging
+import os
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from .compression import accepts_encoding, decompress
+from .lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedBlob:
+    content: bytes
+    etag: str
+    last_modified: datetime | None
+    content_type: str | None
+    checked_at: float
+    metadata: dict[str, str] = field(default_factory=dict)
+    content_encoding: str | None = None
+
+
+class BlobReadCache:
+    """Size-bounded cache of recently served result blobs, revalidated by ETag.
+
+    A cached body is served without touching storage for `revalidate_after` seconds;
+    after that a conditional download confirms it, which costs a 304 rather than the
+    body when nothing changed. Bodies over `max_entry_bytes` are never kept, so one
+    large export cannot evict every small one; callers stream those from storage.
+    """
+
+    def __init__(
+        self,
+        storage_helper=None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        revalidate_after: float | None = None,
+        max_entry_bytes: int | None = None
+    ):
+        self._storage_helper = storage_helper
+        self.revalidate_after = revalidate_after if revalidate_after is not None else float(
+            os.environ.get("BLOB_READ_CACHE_REVALIDATE_AFTER", "5")
+        )
+        self._entries = LRUCache(
+            max_entries=max_entries or int(os.environ.get("BLOB_READ_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=max_bytes or int(os.environ.get("BLOB_READ_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            sizeof=lambda blob: len(blob.content)
+        )
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else int(
+            os.environ.get("BLOB_READ_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024))
+        )
+        self.hits = 0
+        self.revalidations = 0
+        self.downloads = 0
+
+    @property
+    def storage_helper(self):
+        if self._storage_helper is None:
+            from .clients import get_storage_helper
+
+            self._storage_helper = get_storage_helper()
+        return self._storage_helper
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._entries
+
+    async def get(self, container: str, blob_name: str) -> CachedBlob:
+        key = (container, blob_name)
+        cached: CachedBlob | None = self._entries.get(key)
+        now = time.monotonic()
+
+        if cached is not None and now - cached.checked_at < self.revalidate_after:
+            self.hits += 1
+            return cached
+
+        content, props = await self.storage_helper.download_blob_if_modified(
+            container, blob_name, etag=cached.etag if cached else None
+        )
+        if content is None and cached is not None:
+            self.revalidations += 1
+            cached.checked_at = now
+            self._entries.get(key)
+            return cached
+
+        self.downloads += 1
+        blob = CachedBlob(
+            content=content,
+            etag=props.get("etag") or "",
+            last_modified=props.get("last_modified"),
+            content_type=props.get("content_type"),
+            checked_at=now,
+            metadata=props.get("metadata") or {},
+            content_encoding=props.get("content_encoding")
+        )
+        if len(content) <= self.max_entry_bytes:
+            self._entries.put(key, blob)
+        else:
+            self._entries.pop(key)
+        return blob
+
+    def invalidate(self, container: str, blob_name: str):
+        self._entries.pop((container, blob_name))
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._entries.current_bytes,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "downloads": self.downloads
+        }
+
+
+def representation(blob: CachedBlob, accept_encoding: str | None, decode: bool = True) -> CachedBlob:
+    """Pick what to send: the stored bytes if the client accepts their encoding, else decoded.
+
+    The decoded variant gets its own ETag, since a validator must differ between codings.
+    With decode=False only the validators are computed, which is enough to answer a
+    conditional request before paying for decompression.
+    """
+    if not blob.content_encoding or accepts_encoding(accept_encoding, blob.content_encoding):
+        return blob
+
+    tag = blob.etag.strip('"')
+    return replace(
+        blob,
+        content=decompress(blob.content, blob.content_encoding) if decode else blob.content,
+        etag=f'"{tag}-identity"' if tag else "",
+        content_encoding=None
+    )
+
+
+def validator_headers(blob: CachedBlob) -> dict[str, str]:
+    # no-cache lets browsers keep the body but revalidate it on every request
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if blob.content_encoding:
+        headers["Content-Encoding"] = blob.content_encoding
+    if blob.etag:
+        headers["ETag"] = blob.etag
+    if blob.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(blob.last_modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers, blob: CachedBlob) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since the way RFC 9110 orders them."""
+    if_none_match = request_headers.get("If-None-Match")
+    if if_none_match:
+        if not blob.etag:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" and "x" refer to the same representation
+        current = blob.etag.removeprefix("W/")
+        return "*" in candidates or any(tag.removeprefix("W/") == current for tag in candidates)
+
+    if_modified_since = request_headers.get("If-Modified-Since")
+    if if_modified_since and blob.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None or blob.last_modified.tzinfo is None:
+            return False
+        # HTTP dates have one-second resolution
+        return blob.last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+_read_cache: BlobReadCache | None = None
+
+
+def get_read_cache() -> BlobReadCache:
+    global _read_cache
+    if _read_cache is None:
+        _read_cache = BlobReadCache()
+    return _read_cache
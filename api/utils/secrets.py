@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import time
+
+from azure.core.exceptions import AzureError
+
+from .lifecycle import on_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+class SecretProvider:
+    """Async Key Vault secret reader with a TTL cache.
+
+    Secrets are fetched on first use rather than at import time. Once a cached value is
+    older than the TTL it is still served while a background task refreshes it. After a
+    failed fetch the environment fallback is served for failure_ttl seconds before Key
+    Vault is tried again, so an outage does not cost every document a credential round-trip.
+    """
+
+    def __init__(self, vault_url: str | None = None, ttl: float | None = None, failure_ttl: float | None = None):
+        self.vault_url = vault_url if vault_url is not None else os.environ.get("KEY_VAULT_URI", "")
+        self.ttl = ttl if ttl is not None else float(os.environ.get("SECRET_CACHE_TTL", "3600"))
+        self.failure_ttl = (
+            failure_ttl if failure_ttl is not None else float(os.environ.get("SECRET_FAILURE_TTL", "60"))
+        )
+        self._client = None
+        self._values: dict[str, tuple[str, float]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._failed_at: dict[str, float] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            # Imported here so the Key Vault SDK only loads when a vault is configured
+            from azure.keyvault.secrets.aio import SecretClient
+
+            from .credentials import get_credential
+
+            self._client = SecretClient(vault_url=self.vault_url, credential=get_credential())
+        return self._client
+
+    async def _fetch(self, name: str) -> str:
+        secret = await self._get_client().get_secret(name)
+        self._values[name] = (secret.value, time.monotonic())
+        logger.info(f"Loaded secret {name} from Key Vault")
+        return secret.value
+
+    async def _refresh(self, name: str):
+        try:
+            await self._fetch(name)
+        except AzureError as e:
+            logger.warning(f"Background refresh of secret {name} failed: {e}")
+        finally:
+            self._refreshing.pop(name, None)
+
+    async def get(self, name: str, env_fallback: str | None = None) -> str | None:
+        fallback = os.environ.get(env_fallback) if env_fallback else None
+        if not self.vault_url:
+            return fallback
+
+        cached = self._values.get(name)
+        if cached is not None:
+            value, fetched_at = cached
+            if time.monotonic() - fetched_at > self.ttl and name not in self._refreshing:
+                self._refreshing[name] = asyncio.ensure_future(self._refresh(name))
+            return value
+        if self._backing_off(name):
+            return fallback
+
+        # Concurrent first requests share a single Key Vault round-trip
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._values.get(name)
+            if cached is not None:
+                return cached[0]
+            if self._backing_off(name):
+                return fallback
+            try:
+                value = await self._fetch(name)
+            except AzureError as e:
+                self._failed_at[name] = time.monotonic()
+                logger.warning(f"Could not load {name} from Key Vault, using the fallback for {self.failure_ttl:.0f}s: {e}")
+                return fallback
+            self._failed_at.pop(name, None)
+            return value
+
+    def _backing_off(self, name: str) -> bool:
+        failed_at = self._failed_at.get(name)
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_ttl
+
+    async def close(self):
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+_provider: SecretProvider | None = None
+
+
+def get_secret_provider() -> SecretProvider:
+    global _provider
+    if _provider is None:
+        _provider = SecretProvider()
+        on_shutdown(_provider.close)
+    return _provider
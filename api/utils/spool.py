@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import mmap
+import os
+import tempfile
+from collections.abc import AsyncIterable, Callable
+from typing import Self
+
+logger = logging.getLogger(__name__)
+
+# Size of each read when copying a blob to the spool file
+SPOOL_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def spool_threshold() -> int:
+    """Documents larger than this many bytes are spooled to disk instead of held in memory."""
+    return int(os.environ.get("INGEST_SPOOL_THRESHOLD_BYTES", str(32 * 1024 * 1024)))
+
+
+class SpooledDocument:
+    """A document's bytes: in memory up to the spool threshold, memory-mapped from a temp file above it.
+
+    `data` is bytes or an mmap. Both support len(), slicing, hashlib and memoryview, so
+    hashing and the chunked base64 payload read them the same way. Mapped pages are
+    backed by the file, so the kernel can drop them under pressure instead of killing
+    the worker. The temp file is unlinked on creation and goes away when closed.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap, file=None):
+        self.data = data
+        self._file = file
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def spooled(self) -> bool:
+        return self._file is not None
+
+    @classmethod
+    def from_file(cls, file) -> "SpooledDocument":
+        file.flush()
+        if file.tell() == 0:
+            # An empty file cannot be mapped
+            file.close()
+            return cls(b"")
+        return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), file)
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.data.close()
+        except BufferError:
+            # A memoryview of the map is still alive; it is unmapped when that is collected
+            logger.warning("Spooled document still referenced, leaving the map to the garbage collector")
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _temp_file():
+    return tempfile.TemporaryFile(dir=os.environ.get("INGEST_SPOOL_DIR") or None)
+
+
+def spool_reader(read: Callable[[int], bytes], size: int, threshold: int | None = None) -> SpooledDocument:
+    """Read a file-like source (such as a blob trigger's InputStream) of known size, spooling large ones."""
+    if size <= (threshold if threshold is not None else spool_threshold()):
+        return SpooledDocument(read(-1))
+
+    file = _temp_file()
+    try:
+        while chunk := read(SPOOL_CHUNK_SIZE):
+            file.write(chunk)
+        return SpooledDocument.from_file(file)
+    except BaseException:
+        file.close()
+        raise
+
+
+async def spool_chunks(chunks: AsyncIterable[bytes], size: int, threshold: int | None = None) -> SpooledDocument:
+    """Collect a chunked download of known size, spooling large ones so only one chunk is in memory."""
+    if size <= (threshold if threshold is not None else spool_threshold()):
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer += chunk
+        return SpooledDocument(bytes(buffer))
+
+    file = _temp_file()
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(file.write, chunk)
+        return await asyncio.to_thread(SpooledDocument.from_file, file)
+    except BaseException:
+        file.close()
+        raise
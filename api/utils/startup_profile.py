@@ -0,0 +1,89 @@
+import importlib.abc
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+_started_at = time.perf_counter()
+_import_times: dict[str, float] = {}
+_first_request: dict | None = None
+_enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            # Cumulative time, so nested imports are included in their parent
+            _import_times[module.__name__] = (time.perf_counter() - start) * 1000
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+
+def install():
+    """Start timing every module import made from now on."""
+    global _enabled
+    if not _enabled:
+        sys.meta_path.insert(0, _TimingFinder())
+        _enabled = True
+
+
+def install_if_enabled():
+    if os.environ.get("STARTUP_PROFILE", "").lower() in ("1", "true", "yes"):
+        install()
+
+
+def mark_request(route: str):
+    """Record the first request the worker serves; later calls are no-ops."""
+    global _first_request
+    if not _enabled or _first_request is not None:
+        return
+
+    _first_request = {
+        "route": route,
+        "ms_since_start": round((time.perf_counter() - _started_at) * 1000, 1)
+    }
+    report = get_report()
+    slowest = ", ".join(f"{name}={ms}ms" for name, ms in report["slowest_imports"])
+    logger.info(
+        f"Startup profile: first request ({route}) {_first_request['ms_since_start']}ms after start; "
+        f"slowest imports: {slowest}"
+    )
+
+
+def get_report(limit: int = 15) -> dict:
+    slowest = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return {
+        "enabled": _enabled,
+        "first_request": _first_request,
+        "modules_imported": len(_import_times),
+        "slowest_imports": [(name, round(ms, 1)) for name, ms in slowest]
+    }
@@ -0,0 +1,122 @@
+"""Cold-start profile of the Function App: import time, first /health, first storage-backed request.
+
+Each run is a fresh interpreter. Key Vault and Blob Storage are replaced with in-process
+stubs that simulate a network round-trip, so the script needs no network or credentials.
+
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+API_DIR = Path(__file__).parent.parent / "api"
+SIMULATED_LATENCY = 0.02
+
+
+def _install_keyvault_stub():
+    class _Secret:
+        def __init__(self, value):
+            self.value = value
+
+    class SecretClient:
+        def __init__(self, vault_url, credential):
+            self.vault_url = vault_url
+
+        async def get_secret(self, name):
+            await asyncio.sleep(SIMULATED_LATENCY)
+            return _Secret(f"stub-{name}")
+
+        async def close(self):
+            pass
+
+    module = types.ModuleType("azure.keyvault.secrets.aio")
+    module.SecretClient = SecretClient
+    sys.modules["azure.keyvault.secrets.aio"] = module
+
+
+async def _fake_download(self, container, blob_name):
+    await asyncio.sleep(SIMULATED_LATENCY)
+    return json.dumps({"document_id": blob_name}).encode("utf-8")
+
+
+def _child():
+    started = time.perf_counter()
+    os.environ.update({
+        "STARTUP_PROFILE": "1",
+        "KEY_VAULT_URI": "https://bench.vault.azure.net/",
+        "STORAGE_ACCOUNT_NAME": "bench",
+    })
+    sys.path.insert(0, str(API_DIR))
+    _install_keyvault_stub()
+
+    import azure.functions as func
+    import function_app
+    imported = time.perf_counter()
+
+    health = function_app.health_check(func.HttpRequest("GET", "/api/health", body=b""))
+    first_health = time.perf_counter()
+
+    async def first_document():
+        # Patching imports the storage helper, so its SDK load is counted in this request
+        with patch("utils.blob_helpers.BlobStorageHelper.download_blob", _fake_download):
+            return await function_app.get_document(
+                func.HttpRequest("GET", "/api/documents/bench", body=b"", route_params={"doc_id": "bench"})
+            )
+
+    document = asyncio.run(first_document())
+    first_document_done = time.perf_counter()
+
+    async def load_secret():
+        from utils import get_secret_provider
+        return await get_secret_provider().get("MistralApiKey")
+
+    secret_started = time.perf_counter()
+    asyncio.run(load_secret())
+    secret_done = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_health_ms": (first_health - imported) * 1000,
+        "first_document_ms": (first_document_done - first_health) * 1000,
+        "first_secret_ms": (secret_done - secret_started) * 1000,
+        "status_codes": [health.status_code, document.status_code],
+        "startup": json.loads(health.get_body())["startup"],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"], check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ("import_ms", "first_health_ms", "first_document_ms", "first_secret_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:<20} median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+
+    print("\nSlowest imports before the first request (cumulative ms):")
+    for name, ms in runs[-1]["startup"]["slowest_imports"][:10]:
+        print(f"  {name:<45} {ms:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
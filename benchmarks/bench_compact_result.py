@@ -0,0 +1,124 @@
+"""Memory and throughput of ExtractionResult against CompactResult on large results.
+
+Builds the same synthetic result both ways, then times serialisation and the JSON
+export. Retained memory is the tracemalloc size of the built result, so it counts
+the field and table objects but not the strings they share.
+
+    python benchmarks/bench_compact_result.py --fields 20000 --tables 50 --rows 200
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from exporters import JsonExporter
+from models import (
+    CompactResult,
+    ExtractedField,
+    ExtractionConfidence,
+    ExtractionResult,
+    FieldRecord,
+)
+
+EXTRACTED_AT = datetime(2024, 1, 15, 10, 30, 0)
+
+
+def _synthetic_columns(fields: int, tables: int, rows: int, columns: int):
+    rng = random.Random(42)
+    words = ["invoice", "total", "Acme", "VAT", "2024-01-15", "€1,250.00", "qty", "ref"]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    field_values = [(text(2), text(4), round(rng.random(), 3), rng.randint(1, 1000)) for _ in range(fields)]
+    table_values = [
+        {
+            "headers": [text(1) for _ in range(columns)],
+            "rows": [[text(2) for _ in range(columns)] for _ in range(rows)]
+        }
+        for _ in range(tables)
+    ]
+    return field_values, table_values
+
+
+def _build_model(field_values, table_values) -> ExtractionResult:
+    return ExtractionResult(
+        document_id="bench_document",
+        fields=[
+            ExtractedField(name=name, value=value, confidence=confidence, page_number=page)
+            for name, value, confidence, page in field_values
+        ],
+        tables=table_values,
+        confidence=ExtractionConfidence(overall=0.9),
+        page_count=1000,
+        extracted_at=EXTRACTED_AT
+    )
+
+
+def _build_compact(field_values, table_values) -> CompactResult:
+    return CompactResult(
+        document_id="bench_document",
+        fields=[FieldRecord(name, value, confidence, page) for name, value, confidence, page in field_values],
+        tables=table_values,
+        confidence=ExtractionConfidence(overall=0.9),
+        page_count=1000,
+        extracted_at=EXTRACTED_AT
+    )
+
+
+def _time(operation, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _retained(build) -> float:
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    field_values, table_values = _synthetic_columns(args.fields, args.tables, args.rows, args.columns)
+    builders = {
+        "pydantic": lambda: _build_model(field_values, table_values),
+        "compact": lambda: _build_compact(field_values, table_values),
+    }
+
+    model, compact = builders["pydantic"](), builders["compact"]()
+    if compact.to_json() != model.model_dump_json() or compact.to_result() != model:
+        sys.exit("compact result serialises differently from ExtractionResult")
+
+    print(f"{'mode':<9} {'build ms':>9} {'held MB':>8} {'to_dict ms':>11} {'json ms':>8} {'export ms':>10}")
+    for name, build in builders.items():
+        result = build()
+        to_json = result.to_json if name == "compact" else result.model_dump_json
+        print(
+            f"{name:<9} {_time(build, args.repeat):>9.1f} {_retained(build):>8.1f} "
+            f"{_time(result.to_dict, args.repeat):>11.1f} {_time(to_json, args.repeat):>8.1f} "
+            f"{_time(lambda result=result: JsonExporter().export(result), args.repeat):>10.1f}"
+        )
+    print(f"{'to_result':<9} {_time(compact.to_result, args.repeat):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Time and peak memory of field extraction on large synthetic OCR markdown.
+
+Compares the previous line-split DocumentExtractor._extract_fields against the
+single-pass extract_fields. Peak memory is measured with tracemalloc, so it counts
+Python allocations made during the extraction only.
+
+    python benchmarks/bench_field_extraction.py --pages 1000 --lines 60 --field-ratio 0.1
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from models import ExtractedField
+from ocr.fields import PAGE_SEPARATOR, extract_fields
+
+
+def _line_split_extract(markdown_content: str) -> list[ExtractedField]:
+    fields = []
+    for line in markdown_content.split("\n"):
+        if ":" in line and not line.startswith("#"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                name = parts[0].strip().strip("*").strip("-").strip()
+                value = parts[1].strip().strip("*").strip()
+                if name and value and len(name) < 50:
+                    fields.append(ExtractedField(name=name, value=value, confidence=0.85))
+    return fields
+
+
+def _synthetic_markdown(pages: int, lines: int, field_ratio: float) -> str:
+    rng = random.Random(42)
+    words = ["invoice", "total", "Acme", "VAT", "2024-01-15", "€1,250.00", "qty", "ref", "net"]
+
+    def line() -> str:
+        kind = rng.random()
+        if kind < field_ratio:
+            return f"**{rng.choice(words).title()}:** {' '.join(rng.choices(words, k=3))}"
+        if kind < field_ratio + 0.1:
+            return f"# {' '.join(rng.choices(words, k=3))}"
+        if kind < field_ratio + 0.2:
+            return "| " + " | ".join(rng.choices(words, k=4)) + " |"
+        return " ".join(rng.choices(words, k=16))
+
+    return PAGE_SEPARATOR.join("\n".join(line() for _ in range(lines)) for _ in range(pages))
+
+
+def _measure(extract, repeat: int) -> tuple[float, float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fields = extract()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    extract()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings) * 1000, peak / 1024 / 1024, len(fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--field-ratio", type=float, default=0.1, help="share of lines that are fields")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    markdown = _synthetic_markdown(args.pages, args.lines, args.field_ratio)
+    old = [(f.name, f.value) for f in _line_split_extract(markdown)]
+    new = [(f.name, f.value) for f in extract_fields(markdown, args.pages)]
+    if old != new:
+        sys.exit("single-pass fields differ from the line-split extractor")
+
+    modes = {
+        "line-split": lambda: _line_split_extract(markdown),
+        "single-pass": lambda: extract_fields(markdown, args.pages),
+    }
+    print(f"{len(markdown) / 1024 / 1024:.1f} MB of markdown, {args.pages} pages")
+    print(f"{'mode':<12} {'time ms':>9} {'peak MB':>9} {'fields':>8}")
+    for name, extract in modes.items():
+        ms, peak_mb, count = _measure(extract, args.repeat)
+        print(f"{name:<12} {ms:>9.1f} {peak_mb:>9.1f} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
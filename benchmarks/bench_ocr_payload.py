@@ -0,0 +1,109 @@
+"""Peak RSS of building and sending the Mistral OCR request body.
+
+Compares the previous inline data-URI payload against StreamingOCRPayload. Each
+mode runs in a fresh subprocess against an in-process mock transport, so no
+network access is needed.
+
+    python benchmarks/bench_ocr_payload.py --size-mb 50
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _draining_transport():
+    import httpx
+
+    # httpx.MockTransport buffers the request body, which would hide the difference
+    class DrainingTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            received = 0
+            async for chunk in request.stream:
+                received += len(chunk)
+            return httpx.Response(200, json={"pages": [], "received": received})
+
+    return DrainingTransport()
+
+
+async def _run_inline(file_bytes: bytes):
+    import httpx
+
+    base64_content = base64.b64encode(file_bytes).decode("utf-8")
+    data_uri = f"data:application/pdf;base64,{base64_content}"
+    payload = {
+        "model": "mistral-document-ai-2505",
+        "document": {"type": "document_url", "document_url": data_uri},
+        "include_image_base64": False
+    }
+    async with httpx.AsyncClient(transport=_draining_transport()) as client:
+        response = await client.post("https://bench.local/providers/mistral/azure/ocr", json=payload)
+    return response.json()["received"]
+
+
+async def _run_streaming(file_bytes: bytes):
+    import httpx
+    from ocr.mistral_client import MistralOCRClient
+
+    async with httpx.AsyncClient(transport=_draining_transport()) as http_client:
+        client = MistralOCRClient(endpoint="https://bench.local", api_key="bench", http_client=http_client)
+        response = await client.extract_from_bytes(file_bytes=file_bytes, content_type="application/pdf")
+    return response["received"]
+
+
+def _child(mode: str, size_mb: int):
+    # Import everything up front so module loading is not counted as payload overhead
+    import httpx  # noqa: F401
+    from ocr.mistral_client import MistralOCRClient  # noqa: F401
+
+    file_bytes = os.urandom(size_mb * 1024 * 1024)
+    baseline = _peak_rss_mb()
+    runner = _run_inline if mode == "inline" else _run_streaming
+    received = asyncio.run(runner(file_bytes))
+    print(json.dumps({
+        "mode": mode,
+        "document_mb": size_mb,
+        "body_mb": round(received / 1024 / 1024, 1),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--child", choices=["inline", "streaming"])
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.size_mb)
+        return
+
+    print(f"{'mode':<10} {'doc MB':>7} {'baseline MB':>12} {'peak MB':>8} {'overhead':>9}")
+    for mode in ("inline", "streaming"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--size-mb", str(args.size_mb)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        overhead = (stats["peak_rss_mb"] - stats["baseline_rss_mb"]) / stats["document_mb"]
+        print(
+            f"{stats['mode']:<10} {stats['document_mb']:>7} {stats['baseline_rss_mb']:>12} "
+            f"{stats['peak_rss_mb']:>8} {overhead:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
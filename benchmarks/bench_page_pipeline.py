@@ -0,0 +1,122 @@
+"""Peak memory and time from a large OCR response to streamed exports.
+
+Compares the joined-text pipeline (parse_response, fields from the combined markdown,
+exports of the whole text) against the per-page one the extractor now runs. Each export
+is consumed as iter_bytes chunks, the way uploads stage blocks. Peak memory is measured
+with tracemalloc after the response exists, so it counts what the pipeline adds to it.
+
+    python benchmarks/bench_page_pipeline.py --pages 1000 --page-kb 8
+"""
+import argparse
+import hashlib
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from exporters import EXPORT_FORMATS
+from models import CompactResult, ExtractionConfidence
+from ocr.fields import extract_fields, extract_page_fields
+from ocr.mistral_client import MistralOCRClient
+
+CHUNK_SIZE = 256 * 1024
+EXTRACTED_AT = datetime(2024, 1, 15, 10, 30, 0)
+
+
+def _synthetic_response(pages: int, page_kb: int) -> dict:
+    rng = random.Random(42)
+    words = ["invoice", "total", "Acme & Sons", "<net>", "VAT", "2024-01-15", "€1,250.00", "qty"]
+
+    def page() -> str:
+        lines = []
+        size = 0
+        while size < page_kb * 1024:
+            if rng.random() < 0.1:
+                line = f"**{rng.choice(words).title()}:** {' '.join(rng.choices(words, k=3))}"
+            else:
+                line = " ".join(rng.choices(words, k=14))
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines)
+
+    return {
+        "pages": [{"markdown": page(), "confidence": 0.9, "tables": []} for _ in range(pages)],
+        "model": "mistral-ocr-2503"
+    }
+
+
+def _joined(client: MistralOCRClient, response: dict) -> CompactResult:
+    parsed = client.parse_response(response)
+    return CompactResult.from_text(
+        parsed["markdown_content"],
+        parsed["raw_text"],
+        document_id="bench_document",
+        fields=extract_fields(parsed["markdown_content"], parsed["page_count"]),
+        tables=parsed["tables"],
+        confidence=ExtractionConfidence(overall=0.9),
+        page_count=parsed["page_count"],
+        extracted_at=EXTRACTED_AT
+    )
+
+
+def _paged(client: MistralOCRClient, response: dict) -> CompactResult:
+    pages = []
+    fields = []
+    for number, page in enumerate(client.iter_pages(response), 1):
+        pages.append(page["markdown"])
+        fields.extend(extract_page_fields(page["markdown"], number))
+    return CompactResult(
+        document_id="bench_document",
+        pages=pages,
+        fields=fields,
+        confidence=ExtractionConfidence(overall=0.9),
+        page_count=len(pages),
+        extracted_at=EXTRACTED_AT
+    )
+
+
+def _run(build, client: MistralOCRClient, response: dict) -> tuple[int, str]:
+    result = build(client, response)
+    written = 0
+    digest = hashlib.sha256()
+    for _, _, exporter_cls in EXPORT_FORMATS.values():
+        for chunk in exporter_cls().iter_bytes(result, CHUNK_SIZE):
+            written += len(chunk)
+            digest.update(chunk)
+    return written, digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--page-kb", type=int, default=8)
+    args = parser.parse_args()
+
+    client = MistralOCRClient(endpoint="https://example.invalid", api_key="unused")
+    response = _synthetic_response(args.pages, args.page_kb)
+    text_mb = sum(len(page["markdown"]) for page in response["pages"]) / 1024 / 1024
+
+    outputs = {name: _run(build, client, response) for name, build in (("joined", _joined), ("paged", _paged))}
+    if outputs["joined"] != outputs["paged"]:
+        sys.exit("paged exports differ from the joined pipeline")
+
+    print(f"{text_mb:.1f} MB of page text, {args.pages} pages, exports {outputs['paged'][0] / 1024 / 1024:.1f} MB")
+    print(f"{'pipeline':<8} {'time ms':>9} {'peak MB':>9}")
+    for name, build in (("joined", _joined), ("paged", _paged)):
+        start = time.perf_counter()
+        _run(build, client, response)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        _run(build, client, response)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<8} {elapsed * 1000:>9.1f} {peak / 1024 / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Time and peak memory of the XML export on large synthetic results.
+
+Compares the previous ElementTree + minidom exporter against the single-pass
+XmlExporter (pretty and compact). Peak memory is measured with tracemalloc, so it
+counts Python allocations made during the export only.
+
+    python benchmarks/bench_xml_export.py --fields 5000 --tables 50 --rows 200
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.dom import minidom
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from exporters import XmlExporter
+from models import ExtractedField, ExtractionConfidence, ExtractionResult
+
+
+def _minidom_export(result: ExtractionResult) -> str:
+    root = ET.Element("extraction")
+    root.set("document_id", result.document_id)
+    root.set("extracted_at", result.extracted_at.isoformat())
+    root.set("model_version", result.model_version)
+
+    metadata = ET.SubElement(root, "metadata")
+    ET.SubElement(metadata, "page_count").text = str(result.page_count)
+    ET.SubElement(metadata, "processing_time_ms").text = str(result.processing_time_ms)
+    confidence_elem = ET.SubElement(metadata, "confidence")
+    ET.SubElement(confidence_elem, "overall").text = f"{result.confidence.overall:.3f}"
+    ET.SubElement(confidence_elem, "is_low_confidence").text = str(result.confidence.is_low_confidence).lower()
+
+    if result.fields:
+        fields_elem = ET.SubElement(root, "fields")
+        for field in result.fields:
+            field_elem = ET.SubElement(fields_elem, "field")
+            field_elem.set("confidence", f"{field.confidence:.2f}")
+            ET.SubElement(field_elem, "name").text = field.name
+            ET.SubElement(field_elem, "value").text = str(field.value)
+
+    if result.tables:
+        tables_elem = ET.SubElement(root, "tables")
+        for i, table in enumerate(result.tables):
+            table_elem = ET.SubElement(tables_elem, "table")
+            table_elem.set("index", str(i))
+            headers = table.get("headers", [])
+            if headers:
+                headers_elem = ET.SubElement(table_elem, "headers")
+                for h in headers:
+                    ET.SubElement(headers_elem, "header").text = str(h)
+            rows_elem = ET.SubElement(table_elem, "rows")
+            for row in table.get("rows", []):
+                row_elem = ET.SubElement(rows_elem, "row")
+                for cell in row:
+                    ET.SubElement(row_elem, "cell").text = str(cell)
+
+    content = ET.SubElement(root, "content")
+    ET.SubElement(content, "raw_text").text = result.raw_text
+
+    return minidom.parseString(ET.tostring(root, encoding="unicode")).toprettyxml(indent="  ")
+
+
+def _synthetic_result(fields: int, tables: int, rows: int, columns: int) -> ExtractionResult:
+    rng = random.Random(42)
+    words = ["invoice", "total", "Acme & Sons", "<net>", "VAT", "2024-01-15", "€1,250.00", "qty", "ref"]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    return ExtractionResult(
+        document_id="bench_document",
+        raw_text="\n".join(text(12) for _ in range(fields)),
+        fields=[
+            ExtractedField(name=text(2), value=text(4), confidence=rng.random())
+            for _ in range(fields)
+        ],
+        tables=[
+            {
+                "headers": [text(1) for _ in range(columns)],
+                "rows": [[text(2) for _ in range(columns)] for _ in range(rows)]
+            }
+            for _ in range(tables)
+        ],
+        confidence=ExtractionConfidence(overall=0.9, is_low_confidence=False),
+        page_count=max(tables, 1)
+    )
+
+
+def _measure(export, result: ExtractionResult, repeat: int) -> tuple[float, float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = export(result)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    export(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings) * 1000, peak / 1024 / 1024, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=5000)
+    parser.add_argument("--tables", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    result = _synthetic_result(args.fields, args.tables, args.rows, args.columns)
+    modes = {
+        "minidom": _minidom_export,
+        "streaming": XmlExporter().export,
+        "compact": XmlExporter(indent=None).export,
+    }
+
+    if _minidom_export(result) != XmlExporter().export(result):
+        sys.exit("streaming output differs from the minidom exporter")
+
+    print(f"{'mode':<10} {'time ms':>9} {'peak MB':>9} {'output MB':>10}")
+    for name, export in modes.items():
+        ms, peak_mb, size = _measure(export, result, args.repeat)
+        print(f"{name:<10} {ms:>9.1f} {peak_mb:>9.1f} {size / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,13 @@ def mock_storage_helper():
     helper.landing_zone_container = "landing-zone"
     helper.extracted_data_container = "extracted-data"
     helper.upload_result = AsyncMock(return_value="https://teststorage.blob.core.windows.net/extracted-data/test.md")
+
+    async def upload_result_stream(blob_name, chunks, content_type="text/plain"):
+        async for _ in chunks:
+            pass
+        return f"https://teststorage.blob.core.windows.net/extracted-data/{blob_name}"
+
+    helper.upload_result_stream = AsyncMock(side_effect=upload_result_stream)
     helper.download_blob = AsyncMock(return_value=b"test content")
     helper.list_results = AsyncMock(return_value=[])
     helper.close = AsyncMock()
@@ -0,0 +1,195 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.admission import AdmissionScheduler, WaitStats, estimate_pages
+from utils.memory_budget import DocumentTooLarge, MemoryBudgetExceeded
+
+KB = 1024
+
+
+@pytest.fixture
+def scheduler():
+    # fast lane: 250 KB, 2 at a time; slow lane: 750 KB, 1 at a time
+    return AdmissionScheduler(
+        capacity=1000 * KB,
+        fast_share=0.25,
+        fast_concurrency=2,
+        slow_concurrency=1,
+        fast_lane_max_pages=10,
+        bytes_per_page=10 * KB,
+        wait_timeout=5
+    )
+
+
+class TestEstimatePages:
+    def test_pdf_and_tiff_scale_with_size(self):
+        assert estimate_pages(0, "application/pdf", 100) == 1
+        assert estimate_pages(250, "application/pdf", 100) == 3
+        assert estimate_pages(1000, "image/tiff", 100) == 10
+
+    def test_single_images(self):
+        assert estimate_pages(10 ** 9, "image/png", 100) == 1
+
+
+class TestLanes:
+    def test_routing(self, scheduler):
+        assert scheduler.lane_for(20 * KB, 2).name == "fast"
+        assert scheduler.lane_for(200 * KB, 20).name == "slow"
+        # One page, but more bytes than the fast lane holds
+        assert scheduler.lane_for(300 * KB, 1).name == "slow"
+
+    @pytest.mark.asyncio
+    async def test_small_documents_pass_a_busy_slow_lane(self, scheduler):
+        release = asyncio.Event()
+        admitted = []
+
+        async def process(name: str, size: int, content_type: str = "application/pdf"):
+            async with scheduler.admit(size, content_type) as lane:
+                admitted.append((name, lane))
+                await release.wait()
+
+        big = [asyncio.create_task(process(f"big-{i}", 500 * KB)) for i in range(2)]
+        await asyncio.sleep(0.01)
+        receipt = asyncio.create_task(process("receipt", 15 * KB))
+        await asyncio.sleep(0.01)
+
+        assert admitted == [("big-0", "slow"), ("receipt", "fast")]
+        stats = scheduler.stats()
+        assert stats["slow"]["waiting"] == 1
+        assert stats["slow"]["pages_in_flight"] == 50
+        assert stats["fast"]["bytes_in_flight"] == 15 * KB
+
+        release.set()
+        await asyncio.gather(*big, receipt)
+        assert scheduler.stats()["slow"]["in_flight"] == 0
+        assert scheduler.stats()["slow"]["pages_in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lane_concurrency_limit(self, scheduler):
+        running = 0
+        peak = 0
+
+        async def process():
+            nonlocal running, peak
+            async with scheduler.admit(KB, "image/png"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(process() for _ in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_document_over_the_whole_budget_is_refused(self, scheduler):
+        with pytest.raises(DocumentTooLarge):
+            async with scheduler.admit(1100 * KB, "application/pdf"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_document_over_the_slow_lane_borrows_the_idle_fast_lane(self, scheduler):
+        release = asyncio.Event()
+        admitted = []
+
+        async def process(name: str, size: int, content_type: str = "application/pdf"):
+            async with scheduler.admit(size, content_type) as lane:
+                admitted.append((name, lane))
+                await release.wait()
+
+        # 800 KB fits the 1000 KB budget but not the slow lane's 750 KB
+        big = asyncio.create_task(process("big", 800 * KB))
+        await asyncio.sleep(0.01)
+        # One page, so fast lane, but more than the 200 KB the loan leaves it
+        receipt = asyncio.create_task(process("receipt", 220 * KB, "image/png"))
+        await asyncio.sleep(0.01)
+
+        # The receipt waits for the borrowed bytes instead of overcommitting the budget
+        assert admitted == [("big", "slow")]
+        assert scheduler.stats()["slow"]["bytes_borrowed"] == 50 * KB
+        assert scheduler.stats()["fast"]["waiting"] == 1
+
+        release.set()
+        await asyncio.gather(big, receipt)
+        assert admitted == [("big", "slow"), ("receipt", "fast")]
+        assert scheduler.stats()["slow"]["bytes_borrowed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_lane_does_not_borrow_from_a_busy_fast_lane(self, scheduler):
+        release_receipt = asyncio.Event()
+        admitted = []
+
+        async def receipt():
+            async with scheduler.admit(15 * KB, "image/png"):
+                admitted.append("receipt")
+                await release_receipt.wait()
+
+        async def big():
+            async with scheduler.admit(800 * KB, "application/pdf"):
+                admitted.append("big")
+
+        receipt_task = asyncio.create_task(receipt())
+        await asyncio.sleep(0.01)
+        big_task = asyncio.create_task(big())
+        await asyncio.sleep(0.01)
+
+        assert admitted == ["receipt"]
+
+        release_receipt.set()
+        await asyncio.gather(receipt_task, big_task)
+        assert admitted == ["receipt", "big"]
+
+
+class TestQueueWait:
+    @pytest.mark.asyncio
+    async def test_wait_is_recorded_per_lane(self, scheduler):
+        async def hold(seconds: float):
+            async with scheduler.admit(400 * KB, "application/pdf"):
+                await asyncio.sleep(seconds)
+
+        await asyncio.gather(hold(0.05), hold(0))
+        async with scheduler.admit(KB, "image/png"):
+            pass
+
+        slow = scheduler.stats()["slow"]["queue_wait"]
+        fast = scheduler.stats()["fast"]["queue_wait"]
+        assert slow["admitted"] == 2
+        assert slow["max_ms"] >= 40
+        assert fast["admitted"] == 1
+        assert fast["max_ms"] < 40
+
+    @pytest.mark.asyncio
+    async def test_timeouts_are_counted(self):
+        scheduler = AdmissionScheduler(capacity=100 * KB, slow_concurrency=1, wait_timeout=0.02)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.admit(50 * KB, "application/pdf"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(MemoryBudgetExceeded):
+            async with scheduler.admit(50 * KB, "application/pdf"):
+                pass
+        release.set()
+        await holder
+
+        assert scheduler.stats()["slow"]["queue_wait"]["timeouts"] == 1
+
+    def test_percentiles(self):
+        stats = WaitStats()
+        for wait_ms in range(1, 101):
+            stats.record(float(wait_ms))
+
+        snapshot = stats.snapshot()
+        assert snapshot["p50_ms"] == 51.0
+        assert snapshot["p95_ms"] == 96.0
+        assert snapshot["avg_ms"] == 50.5
+        assert snapshot["max_ms"] == 100.0
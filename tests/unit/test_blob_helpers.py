@@ -0,0 +1,135 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.blob_helpers import BlobStorageHelper
+
+
+class _FakePage:
+    def __init__(self, blobs):
+        self._blobs = blobs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for blob in self._blobs:
+            yield blob
+
+
+class _FakePager:
+    def __init__(self, pages, start):
+        self._pages = pages
+        self._index = int(start or 0)
+        self.continuation_token = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._index >= len(self._pages):
+            raise StopAsyncIteration
+        page = self._pages[self._index]
+        self._index += 1
+        self.continuation_token = str(self._index) if self._index < len(self._pages) else None
+        return _FakePage(page)
+
+
+def _blob(name: str):
+    blob = MagicMock()
+    blob.name = name
+    blob.size = 10
+    blob.content_settings.content_type = "application/json"
+    blob.last_modified = datetime(2024, 1, 15, 10, 30)
+    return blob
+
+
+@pytest.fixture
+def helper():
+    helper = BlobStorageHelper(account_name="teststorage")
+    helper._client = MagicMock()
+    return helper
+
+
+class TestListResultsPage:
+    @pytest.mark.asyncio
+    async def test_returns_one_page_and_continuation(self, helper):
+        pages = [[_blob("a.json"), _blob("a.md")], [_blob("b.json")]]
+        list_blobs = helper._client.get_container_client.return_value.list_blobs
+        list_blobs.return_value.by_page.side_effect = lambda continuation_token: _FakePager(pages, continuation_token)
+
+        first, token = await helper.list_results_page(limit=2)
+        second, last_token = await helper.list_results_page(limit=2, continuation=token)
+
+        assert [r["name"] for r in first] == ["a.json", "a.md"]
+        assert token == "1"
+        assert [r["name"] for r in second] == ["b.json"]
+        assert last_token is None
+        list_blobs.assert_called_with(name_starts_with=None, results_per_page=2)
+
+
+class TestIterBlobChunks:
+    @pytest.mark.asyncio
+    async def test_streams_requested_range(self, helper):
+        async def chunks():
+            for chunk in (b"abc", b"def"):
+                yield chunk
+
+        download = MagicMock()
+        download.chunks.side_effect = chunks
+        blob_client = helper._client.get_blob_client.return_value
+        blob_client.download_blob = AsyncMock(return_value=download)
+
+        received = [chunk async for chunk in helper.iter_blob_chunks("extracted-data", "a.md", offset=10, length=6)]
+
+        assert received == [b"abc", b"def"]
+        blob_client.download_blob.assert_awaited_once_with(offset=10, length=6, max_concurrency=1)
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestUploadBlobStream:
+    @pytest.mark.asyncio
+    async def test_stages_and_commits_blocks(self, helper):
+        blob_client = helper._client.get_blob_client.return_value
+        blob_client.stage_block = AsyncMock()
+        blob_client.commit_block_list = AsyncMock()
+
+        await helper.upload_blob_stream("extracted-data", "a.xml", _chunks(b"aa", b"bb", b"cc"), "application/xml")
+
+        staged = [call.args for call in blob_client.stage_block.await_args_list]
+        committed = blob_client.commit_block_list.await_args.args[0]
+        assert [data for _, data in staged] == [b"aa", b"bb", b"cc"]
+        assert [block.id for block in committed] == [block_id for block_id, _ in staged]
+        assert len({len(block.id) for block in committed}) == 1
+
+    @pytest.mark.asyncio
+    async def test_single_chunk_uses_one_request(self, helper):
+        blob_client = helper._client.get_blob_client.return_value
+        blob_client.upload_blob = AsyncMock()
+        blob_client.stage_block = AsyncMock()
+
+        await helper.upload_blob_stream("extracted-data", "a.md", _chunks(b"small"), "text/markdown")
+
+        assert blob_client.upload_blob.await_args.args[0] == b"small"
+        blob_client.stage_block.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_block_is_not_committed(self, helper):
+        blob_client = helper._client.get_blob_client.return_value
+        blob_client.stage_block = AsyncMock(side_effect=[None, RuntimeError("stage failed"), None])
+        blob_client.commit_block_list = AsyncMock()
+
+        with pytest.raises(RuntimeError):
+            await helper.upload_blob_stream("extracted-data", "a.md", _chunks(b"a", b"b", b"c"), max_concurrency=1)
+
+        blob_client.commit_block_list.assert_not_awaited()
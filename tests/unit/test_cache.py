@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.core.exceptions import ServiceRequestError
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from models import ExtractedField, ExtractionConfidence, ExtractionResult
+from ocr.cache import LocalDirectoryCacheBackend, OCRResultCache, document_cache_key
+from utils.lru import LRUCache
+
+
+@pytest.fixture
+def extraction_result():
+    return ExtractionResult(
+        document_id="invoice_pdf",
+        raw_text="Vendor: Acme",
+        markdown_content="**Vendor:** Acme",
+        fields=[ExtractedField(name="Vendor", value="Acme", confidence=0.85)],
+        confidence=ExtractionConfidence(overall=0.85, is_low_confidence=False),
+        page_count=1
+    )
+
+
+class TestDocumentCacheKey:
+    def test_same_content_same_key(self):
+        assert document_cache_key(b"abc", "model-a") == document_cache_key(b"abc", "model-a")
+
+    def test_key_depends_on_model(self):
+        assert document_cache_key(b"abc", "model-a") != document_cache_key(b"abc", "model-b")
+
+
+class TestOCRResultCache:
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, extraction_result):
+        cache = OCRResultCache()
+
+        assert await cache.get("key") is None
+        await cache.put("key", extraction_result)
+        cached = await cache.get("key")
+
+        assert cached == extraction_result
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier_survives_new_process(self, tmp_path, extraction_result):
+        key = document_cache_key(b"%PDF", "mistral-document-ai-2505")
+        await OCRResultCache(backend=LocalDirectoryCacheBackend(tmp_path)).put(key, extraction_result)
+
+        cache = OCRResultCache(backend=LocalDirectoryCacheBackend(tmp_path))
+        cached = await cache.get(key)
+
+        assert cached is not None
+        assert cached.fields[0].name == "Vendor"
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_treated_as_miss(self, extraction_result):
+        backend = AsyncMock()
+        backend.get = AsyncMock(side_effect=ServiceRequestError("storage down"))
+        backend.put = AsyncMock(side_effect=ServiceRequestError("storage down"))
+        cache = OCRResultCache(backend=backend)
+
+        assert await cache.get("key") is None
+        await cache.put("key", extraction_result)
+        assert await cache.get("key") == extraction_result
+
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_is_evicted_and_counted_as_miss(self, tmp_path, extraction_result):
+        backend = LocalDirectoryCacheBackend(tmp_path)
+        await backend.put("key", b'{"document_id": "doc", "raw_te')
+        cache = OCRResultCache(backend=backend)
+
+        assert await cache.get("key") is None
+        assert await cache.get_compact("key") is None
+        assert cache.stats() == {"hits": 0, "misses": 2, "entries": 0}
+
+        await cache.put("key", extraction_result)
+        assert await OCRResultCache(backend=backend).get("key") == extraction_result
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2)
+        lru.put("a", b"1")
+        lru.put("b", b"2")
+        lru.get("a")
+        lru.put("c", b"3")
+
+        assert "a" in lru
+        assert "b" not in lru
+
+    def test_bounded_by_bytes(self):
+        lru = LRUCache(max_entries=10, max_bytes=5)
+        lru.put("a", b"123")
+        lru.put("b", b"456")
+
+        assert "a" not in lru
+        assert lru.current_bytes == 3
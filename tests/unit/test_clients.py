@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils import clients, credentials
+
+
+class TestSharedClients:
+    @pytest.mark.asyncio
+    async def test_helpers_are_process_scoped(self):
+        assert clients.get_storage_helper() is clients.get_storage_helper()
+        assert clients.get_event_publisher() is clients.get_event_publisher()
+        assert credentials.get_credential() is credentials.get_credential()
+
+        await clients.close_shared_clients()
+
+    @pytest.mark.asyncio
+    async def test_close_resets_singletons(self):
+        helper = clients.get_storage_helper()
+        credential = credentials.get_credential()
+
+        await clients.close_shared_clients()
+
+        assert clients.get_storage_helper() is not helper
+        assert credentials.get_credential() is not credential
+        await clients.close_shared_clients()
@@ -0,0 +1,167 @@
+import random
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from exporters import EXPORT_FORMATS
+from models import (
+    PAGE_SEPARATOR,
+    CompactResult,
+    ExtractedField,
+    ExtractionConfidence,
+    ExtractionResult,
+    FieldRecord,
+    result_to_json,
+)
+from ocr.cache import OCRResultCache
+
+
+def _random_result(rng: random.Random) -> ExtractionResult:
+    def text() -> str:
+        return "".join(rng.choice(["a", "Z", " ", "é", "€", "\"", "\\", "\n", "😀"]) for _ in range(rng.randint(0, 6)))
+
+    return ExtractionResult(
+        document_id=text() or "doc",
+        raw_text=text(),
+        markdown_content=text(),
+        fields=[
+            ExtractedField(
+                name=text(),
+                value=text(),
+                confidence=round(rng.random(), 3),
+                page_number=rng.choice([None, rng.randint(1, 9)])
+            )
+            for _ in range(rng.randint(0, 5))
+        ],
+        tables=[
+            {"headers": [text()], "rows": [[text(), text()] for _ in range(rng.randint(0, 3))]}
+            for _ in range(rng.randint(0, 2))
+        ],
+        confidence=ExtractionConfidence(overall=round(rng.random(), 3), is_low_confidence=rng.random() < 0.5),
+        page_count=rng.randint(1, 50),
+        processing_time_ms=rng.randint(0, 10000),
+        extracted_at=rng.choice([
+            datetime(2024, 1, 15, 10, 30, 0),
+            datetime(2024, 1, 15, 10, 30, 0, 123456),
+            datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC)
+        ])
+    )
+
+
+@pytest.fixture
+def sample_result():
+    return ExtractionResult(
+        document_id="test_invoice",
+        markdown_content="**Vendor:** Test Corp",
+        fields=[ExtractedField(name="Vendor", value="Test Corp", confidence=0.95, page_number=1)],
+        tables=[{"headers": ["Item", "Price"], "rows": [["Widget", "$50"]]}],
+        confidence=ExtractionConfidence(overall=0.95, is_low_confidence=False),
+        extracted_at=datetime(2024, 1, 15, 10, 30, 0)
+    )
+
+
+class TestCompactResult:
+    def test_matches_pydantic_serialization(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            result = _random_result(rng)
+            compact = CompactResult.from_result(result)
+
+            assert compact.to_json() == result.model_dump_json()
+            assert compact.to_dict() == result.to_dict()
+            assert compact.to_result() == result
+            assert CompactResult.from_json(result.model_dump_json()) == compact
+
+    def test_exporters_accept_compact_results(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            result = _random_result(rng)
+            compact = CompactResult.from_result(result)
+            for _, _, exporter_cls in EXPORT_FORMATS.values():
+                assert exporter_cls().export(compact) == exporter_cls().export(result)
+
+    def test_records_have_no_instance_dict(self):
+        record = FieldRecord("Vendor", "Acme", 0.85)
+
+        assert not hasattr(record, "__dict__")
+        assert record.to_model() == ExtractedField(name="Vendor", value="Acme", confidence=0.85)
+
+    def test_replace_and_field_lookup(self, sample_result):
+        compact = CompactResult.from_result(sample_result)
+
+        copy = compact.replace(document_id="other")
+
+        assert copy.document_id == "other"
+        assert compact.document_id == "test_invoice"
+        assert copy.get_field_value("vendor") == "Test Corp"
+        assert copy.get_field_value("missing") is None
+
+    def test_result_to_json_takes_either(self, sample_result):
+        assert result_to_json(CompactResult.from_result(sample_result)) == result_to_json(sample_result)
+
+    def test_to_result_validates(self, sample_result):
+        compact = CompactResult.from_result(sample_result)
+        compact.fields[0].confidence = 1.5
+
+        with pytest.raises(ValueError):
+            compact.to_result()
+
+
+class TestPagedText:
+    def _paged(self, rng: random.Random) -> CompactResult:
+        def page() -> str:
+            return "".join(rng.choice(["a", " ", "&", "<", "\"", "\\", "é", "\n", "\r", "\r\n", "---"]) for _ in range(rng.randint(0, 8)))
+
+        pages = [page() for _ in range(rng.randint(0, 5))]
+        raw_pages = rng.choice([None, [page() for _ in range(rng.randint(1, 3))]])
+        return CompactResult(
+            document_id="paged",
+            pages=pages,
+            raw_pages=raw_pages,
+            fields=[FieldRecord("Vendor", "Acme", 0.9, 1)],
+            confidence=ExtractionConfidence(overall=0.9),
+            page_count=len(pages),
+            extracted_at=datetime(2024, 1, 15, 10, 30, 0)
+        )
+
+    def test_pages_join_with_separator(self):
+        compact = CompactResult(document_id="d", pages=["one", "two"], confidence=ExtractionConfidence(overall=0.9))
+
+        assert compact.markdown_content == f"one{PAGE_SEPARATOR}two"
+        assert compact.raw_text == compact.markdown_content
+        assert "".join(compact.iter_raw_text()) == compact.raw_text
+
+    def test_identical_raw_text_is_held_once(self, sample_result):
+        text = "**Vendor:** Test Corp"
+        result = sample_result.model_copy(update={"raw_text": text, "markdown_content": text})
+
+        compact = CompactResult.from_result(result)
+
+        assert compact.raw_pages is None
+        assert compact.to_dict() == result.to_dict()
+
+    def test_exports_match_joined_text(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            compact = self._paged(rng)
+            joined = compact.to_result()
+            for _, _, exporter_cls in EXPORT_FORMATS.values():
+                assert exporter_cls().export(compact) == exporter_cls().export(joined), repr(compact.pages)
+
+
+class TestCompactCache:
+    @pytest.mark.asyncio
+    async def test_compact_and_pydantic_share_entries(self, sample_result):
+        cache = OCRResultCache()
+
+        await cache.put("compact", CompactResult.from_result(sample_result))
+        await cache.put("model", sample_result)
+
+        assert await cache.get("compact") == sample_result
+        assert await cache.get_compact("model") == CompactResult.from_result(sample_result)
+        assert await cache.get_compact("missing") is None
@@ -0,0 +1,122 @@
+import gzip
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.blob_helpers import BlobStorageHelper
+from utils.compression import (
+    accepts_encoding,
+    compress,
+    compress_chunks,
+    decompress,
+    result_encoding,
+)
+from utils.read_cache import CachedBlob, representation, validator_headers
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _gzip_blob(content: bytes) -> CachedBlob:
+    return CachedBlob(
+        content=compress(content, "gzip"),
+        etag='"0x1"',
+        last_modified=None,
+        content_type="text/markdown",
+        checked_at=0.0,
+        content_encoding="gzip"
+    )
+
+
+class TestResultEncoding:
+    def test_default_is_uncompressed(self, monkeypatch):
+        monkeypatch.delenv("RESULT_COMPRESSION", raising=False)
+        assert result_encoding() is None
+
+    def test_gzip(self, monkeypatch):
+        monkeypatch.setenv("RESULT_COMPRESSION", "gzip")
+        assert result_encoding() == "gzip"
+
+    def test_zstd_falls_back_without_package(self, monkeypatch):
+        monkeypatch.setenv("RESULT_COMPRESSION", "zstd")
+        monkeypatch.setattr("utils.compression._zstd_available", lambda: False)
+        assert result_encoding() == "gzip"
+
+
+class TestCompression:
+    def test_round_trip(self):
+        data = b"# Invoice\n" * 1000
+        assert decompress(compress(data, "gzip"), "gzip") == data
+
+    @pytest.mark.asyncio
+    async def test_streaming_compression_is_valid_gzip(self):
+        parts = [b"line %d\n" % i for i in range(5000)]
+        compressed = [chunk async for chunk in compress_chunks(_chunks(*parts), "gzip", min_chunk_size=1024)]
+
+        assert gzip.decompress(b"".join(compressed)) == b"".join(parts)
+        assert all(len(chunk) >= 1024 for chunk in compressed[:-1])
+
+
+class TestAcceptEncoding:
+    def test_listed_encoding(self):
+        assert accepts_encoding("gzip, deflate, br", "gzip")
+        assert accepts_encoding("br, zstd", "zstd")
+        assert not accepts_encoding("br", "gzip")
+        assert not accepts_encoding(None, "gzip")
+
+    def test_q_values(self):
+        assert not accepts_encoding("gzip;q=0, identity", "gzip")
+        assert accepts_encoding("gzip;q=0.5", "gzip")
+
+    def test_wildcard(self):
+        assert accepts_encoding("*", "zstd")
+        assert not accepts_encoding("*, zstd;q=0", "zstd")
+
+
+class TestRepresentation:
+    def test_passes_compressed_bytes_through(self):
+        blob = _gzip_blob(b"hello")
+
+        assert representation(blob, "gzip, br") is blob
+        assert validator_headers(blob)["Content-Encoding"] == "gzip"
+
+    def test_decodes_for_clients_without_support(self):
+        blob = _gzip_blob(b"hello")
+        decoded = representation(blob, None)
+
+        assert decoded.content == b"hello"
+        assert decoded.content_encoding is None
+        assert decoded.etag != blob.etag
+        assert "Content-Encoding" not in validator_headers(decoded)
+
+    def test_validators_without_decoding(self):
+        blob = _gzip_blob(b"hello")
+        variant = representation(blob, None, decode=False)
+
+        assert variant.etag == representation(blob, None).etag
+        assert variant.content == blob.content
+
+
+class TestCompressedUploads:
+    @pytest.mark.asyncio
+    async def test_upload_result_compresses(self, monkeypatch):
+        monkeypatch.setenv("RESULT_COMPRESSION", "gzip")
+        helper = BlobStorageHelper(account_name="teststorage")
+        helper._client = MagicMock()
+        blob_client = helper._client.get_blob_client.return_value
+        blob_client.upload_blob = AsyncMock()
+
+        await helper.upload_result("invoice.md", "# Invoice", "text/markdown")
+
+        data = blob_client.upload_blob.await_args.args[0]
+        settings = blob_client.upload_blob.await_args.kwargs["content_settings"]
+        assert gzip.decompress(data) == b"# Invoice"
+        assert settings.content_encoding == "gzip"
+        assert settings.content_type == "text/markdown"
@@ -0,0 +1,157 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils import lifecycle
+from utils.eventgrid import EventGridPublisher
+
+
+def _publisher(**kwargs) -> EventGridPublisher:
+    publisher = EventGridPublisher(
+        topic_endpoint="https://topic.westeurope-1.eventgrid.azure.net/api/events",
+        topic_key="test-key",
+        **kwargs
+    )
+    publisher._client = AsyncMock()
+    return publisher
+
+
+def _sent_batches(publisher: EventGridPublisher) -> list[list[str]]:
+    return [[event.subject for event in call.args[0]] for call in publisher._client.send.await_args_list]
+
+
+class TestEventGridPublisher:
+    @pytest.mark.asyncio
+    async def test_unbatched_sends_each_event(self):
+        publisher = _publisher(batching=False)
+
+        await publisher.publish_document_failed("doc1", "doc1.pdf", "boom")
+        await publisher.publish_document_failed("doc2", "doc2.pdf", "boom")
+
+        assert _sent_batches(publisher) == [["documents/doc1"], ["documents/doc2"]]
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self):
+        publisher = _publisher(batching=True, max_batch_size=2, max_latency=60)
+
+        for i in range(4):
+            await publisher.publish_document_processed(f"doc{i}", f"doc{i}.pdf", 0.9, {})
+        await asyncio.sleep(0.01)
+
+        assert _sent_batches(publisher) == [
+            ["documents/doc0", "documents/doc1"],
+            ["documents/doc2", "documents/doc3"]
+        ]
+        await publisher.close()
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_max_latency(self):
+        publisher = _publisher(batching=True, max_batch_size=100, max_latency=0.02)
+
+        await publisher.publish_document_processed("doc1", "doc1.pdf", 0.9, {})
+        await asyncio.sleep(0.1)
+
+        assert _sent_batches(publisher) == [["documents/doc1"]]
+        await publisher.close()
+
+    @pytest.mark.asyncio
+    async def test_splits_batches_by_bytes(self):
+        publisher = _publisher(batching=True, max_batch_size=100, max_batch_bytes=1200, max_latency=60)
+        client = publisher._client
+
+        for i in range(3):
+            await publisher.publish_document_processed(f"doc{i}", f"doc{i}.pdf", 0.9, {})
+        await publisher.close()
+
+        assert [len(call.args[0]) for call in client.send.await_args_list] == [1, 1, 1]
+        assert publisher.events_sent == 3
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_buffered_events(self):
+        publisher = _publisher(batching=True, max_batch_size=100, max_latency=60)
+        client = publisher._client
+
+        await publisher.publish_document_processed("doc1", "doc1.pdf", 0.9, {})
+        await publisher.publish_document_failed("doc2", "doc2.pdf", "boom")
+        await publisher.close()
+
+        assert [[e.subject for e in c.args[0]] for c in client.send.await_args_list] == [
+            ["documents/doc1", "documents/doc2"]
+        ]
+        client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_applies_backpressure(self):
+        publisher = _publisher(batching=True, max_batch_size=1, max_latency=60, max_buffered_events=1)
+        release = asyncio.Event()
+
+        async def slow_send(events):
+            await release.wait()
+
+        publisher._client.send = AsyncMock(side_effect=slow_send)
+        await publisher.publish_document_failed("doc1", "doc1.pdf", "boom")
+        await asyncio.sleep(0.01)
+        await publisher.publish_document_failed("doc2", "doc2.pdf", "boom")
+        blocked = asyncio.ensure_future(publisher.publish_document_failed("doc3", "doc3.pdf", "boom"))
+        await asyncio.sleep(0.01)
+
+        assert not blocked.done()
+        release.set()
+        await publisher.close()
+        assert blocked.done()
+        assert publisher.events_sent == 3
+
+
+
+def test_exit_hook_sends_events_buffered_on_closed_loop():
+    # The worker's loop is gone by the time atexit runs, and _run_at_exit starts a new one
+    publisher = _publisher(batching=True, max_batch_size=2, max_latency=60)
+    async_client = publisher._client
+
+    async def never_sends(events):
+        await asyncio.Event().wait()
+
+    async_client.send.side_effect = never_sends
+
+    async def worker():
+        for i in range(3):
+            await publisher.publish_document_processed(f"doc{i}", f"doc{i}.pdf", 0.9, {})
+        await asyncio.sleep(0.01)
+
+    # Cancels the flusher and the stuck send of the first batch, then closes the loop
+    asyncio.run(worker())
+
+    lifecycle.on_shutdown(publisher.close)
+    with patch("utils.eventgrid.SyncEventGridPublisherClient") as sync_client:
+        lifecycle._run_at_exit()
+
+    sent = [[event.subject for event in call.args[0]] for call in sync_client.return_value.send.call_args_list]
+    assert sent == [["documents/doc0", "documents/doc1"], ["documents/doc2"]]
+    sync_client.return_value.close.assert_called_once()
+    assert publisher.events_sent == 3
+
+
+def test_events_buffered_on_a_previous_loop_are_sent_from_the_next():
+    publisher = _publisher(batching=True, max_batch_size=100, max_latency=60)
+
+    async def first_invocation():
+        for i in range(2):
+            await publisher.publish_document_processed(f"doc{i}", f"doc{i}.pdf", 0.9, {})
+
+    async def second_invocation():
+        await publisher.publish_document_processed("doc2", "doc2.pdf", 0.9, {})
+        await publisher.close()
+
+    asyncio.run(first_invocation())
+    with patch("utils.eventgrid.EventGridPublisherClient", return_value=AsyncMock()) as client_class:
+        asyncio.run(second_invocation())
+
+    sent = [[event.subject for event in call.args[0]] for call in client_class.return_value.send.await_args_list]
+    assert sorted(subject for batch in sent for subject in batch) == ["documents/doc0", "documents/doc1", "documents/doc2"]
+    assert publisher.events_sent == 3
@@ -1,6 +1,9 @@
 import pytest
 import json
+import random
+import xml.etree.ElementTree as ET
 from datetime import datetime
+from xml.dom import minidom
 import sys
 from pathlib import Path
 
@@ -11,6 +14,78 @@ from models import ExtractionResult, ExtractionConfidence, ExtractedField
 from exporters import MarkdownExporter, JsonExporter, CsvExporter, XmlExporter
 
 
+def _minidom_xml_export(result: ExtractionResult) -> str:
+    """The previous ElementTree + minidom XmlExporter, kept as a reference."""
+    root = ET.Element("extraction")
+    root.set("document_id", result.document_id)
+    root.set("extracted_at", result.extracted_at.isoformat())
+    root.set("model_version", result.model_version)
+
+    metadata = ET.SubElement(root, "metadata")
+    ET.SubElement(metadata, "page_count").text = str(result.page_count)
+    ET.SubElement(metadata, "processing_time_ms").text = str(result.processing_time_ms)
+    confidence_elem = ET.SubElement(metadata, "confidence")
+    ET.SubElement(confidence_elem, "overall").text = f"{result.confidence.overall:.3f}"
+    ET.SubElement(confidence_elem, "is_low_confidence").text = str(result.confidence.is_low_confidence).lower()
+
+    if result.fields:
+        fields_elem = ET.SubElement(root, "fields")
+        for field in result.fields:
+            field_elem = ET.SubElement(fields_elem, "field")
+            field_elem.set("confidence", f"{field.confidence:.2f}")
+            ET.SubElement(field_elem, "name").text = field.name
+            ET.SubElement(field_elem, "value").text = str(field.value)
+
+    if result.tables:
+        tables_elem = ET.SubElement(root, "tables")
+        for i, table in enumerate(result.tables):
+            table_elem = ET.SubElement(tables_elem, "table")
+            table_elem.set("index", str(i))
+            if isinstance(table, dict):
+                headers = table.get("headers", [])
+                rows = table.get("rows", [])
+                if headers:
+                    headers_elem = ET.SubElement(table_elem, "headers")
+                    for h in headers:
+                        ET.SubElement(headers_elem, "header").text = str(h)
+                rows_elem = ET.SubElement(table_elem, "rows")
+                for row in rows:
+                    row_elem = ET.SubElement(rows_elem, "row")
+                    for cell in row:
+                        ET.SubElement(row_elem, "cell").text = str(cell)
+
+    content = ET.SubElement(root, "content")
+    ET.SubElement(content, "raw_text").text = result.raw_text
+
+    return minidom.parseString(ET.tostring(root, encoding="unicode")).toprettyxml(indent="  ")
+
+
+def _random_text(rng: random.Random) -> str:
+    alphabet = ["a", "Z", "7", " ", "  ", "&", "<", ">", "\"", "'", "\n", "\r\n", "\r", "\t", "é", "€", "😀", "]]>", "&amp;"]
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+
+
+def _random_result(rng: random.Random) -> ExtractionResult:
+    tables = []
+    for _ in range(rng.randint(0, 3)):
+        tables.append({
+            "headers": [_random_text(rng) for _ in range(rng.randint(0, 3))],
+            "rows": [[_random_text(rng) for _ in range(rng.randint(0, 3))] for _ in range(rng.randint(0, 3))]
+        })
+
+    return ExtractionResult(
+        document_id=_random_text(rng) or "doc",
+        raw_text=_random_text(rng),
+        fields=[
+            ExtractedField(name=_random_text(rng), value=_random_text(rng), confidence=rng.random())
+            for _ in range(rng.randint(0, 4))
+        ],
+        tables=tables,
+        confidence=ExtractionConfidence(overall=rng.random(), is_low_confidence=rng.random() < 0.5),
+        page_count=rng.randint(1, 50)
+    )
+
+
 @pytest.fixture
 def sample_result():
     return ExtractionResult(
@@ -128,3 +203,53 @@ class TestXmlExporter:
         assert "<fields>" in output
         assert "<name>Vendor</name>" in output
         assert "<value>Test Corp</value>" in output
+
+    def test_matches_minidom_output(self, sample_result):
+        assert XmlExporter().export(sample_result) == _minidom_xml_export(sample_result)
+
+    def test_matches_minidom_output_on_random_results(self):
+        rng = random.Random(1234)
+        for _ in range(300):
+            result = _random_result(rng)
+            assert XmlExporter().export(result) == _minidom_xml_export(result)
+
+    def test_non_dict_table_is_written_empty(self, sample_result):
+        result = sample_result.model_copy(update={"tables": [["not", "a", "dict"], *sample_result.tables]})
+
+        assert '<table index="0"/>' in XmlExporter().export(result)
+        assert XmlExporter().export(result) == _minidom_xml_export(result)
+
+    def test_compact_output_is_equivalent(self, sample_result):
+        pretty = XmlExporter().export(sample_result)
+        compact = XmlExporter(indent=None).export(sample_result)
+
+        assert "\n" not in compact
+        assert ET.canonicalize(compact, strip_text=True) == ET.canonicalize(pretty, strip_text=True)
+
+    def test_rejects_characters_xml_cannot_hold(self, sample_result):
+        result = sample_result.model_copy(update={"raw_text": "bad \x00 byte"})
+
+        with pytest.raises(ValueError):
+            XmlExporter().export(result)
+
+
+class TestStreamingExport:
+    @pytest.mark.parametrize("exporter_cls", [MarkdownExporter, JsonExporter, CsvExporter, XmlExporter])
+    def test_chunks_reassemble_to_export(self, sample_result, exporter_cls):
+        exporter = exporter_cls()
+        chunks = list(exporter.iter_bytes(sample_result, chunk_size=7))
+
+        assert b"".join(chunks) == exporter.export(sample_result).encode("utf-8")
+        assert all(len(chunk) == 7 for chunk in chunks[:-1])
+        assert 0 < len(chunks[-1]) <= 7
+
+    def test_multibyte_characters_split_across_chunks(self, sample_result):
+        result = sample_result.model_copy(update={"markdown_content": "€" * 10})
+        chunks = list(MarkdownExporter().iter_bytes(result, chunk_size=4))
+
+        assert b"".join(chunks).decode("utf-8") == MarkdownExporter().export(result)
+
+    def test_json_matches_json_dumps(self, sample_result):
+        output = JsonExporter().export(sample_result)
+
+        assert output == json.dumps(json.loads(output), indent=2, ensure_ascii=False)
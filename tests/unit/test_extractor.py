@@ -1,5 +1,8 @@
+import asyncio
+import io
+import httpx
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 import sys
 from pathlib import Path
 
@@ -8,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
 
 from ocr.extractor import DocumentExtractor
 from ocr.mistral_client import MistralOCRClient
+from ocr.sharding import PdfShards
 from models import ExtractionResult
 
 
@@ -16,14 +20,8 @@ class TestDocumentExtractor:
     def mock_client(self, mock_mistral_response):
         client = MagicMock(spec=MistralOCRClient)
         client.extract_from_bytes = AsyncMock(return_value=mock_mistral_response)
-        client.parse_response = MagicMock(return_value={
-            "markdown_content": "# Invoice\n\n**Vendor:** Test Company\n**Amount:** $100.00",
-            "raw_text": "# Invoice\n\n**Vendor:** Test Company\n**Amount:** $100.00",
-            "tables": [],
-            "page_count": 1,
-            "confidence": 0.92,
-            "model": "mistral-ocr-2503"
-        })
+        client.iter_pages = MagicMock(side_effect=lambda response: MistralOCRClient.iter_pages(client, response))
+        client.model = "mistral-document-ai-2505"
         return client
 
     @pytest.fixture
@@ -79,3 +77,138 @@ class TestDocumentExtractor:
 
         assert len(fields) == 1
         assert fields[0].name == "Field"
+
+
+def _make_pdf(page_count: int) -> bytes:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(page_count):
+        writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_page_count(file_bytes: bytes) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(file_bytes)).pages)
+
+
+class TestShardedExtraction:
+    @pytest.fixture
+    def client(self):
+        return MistralOCRClient(endpoint="https://test.inference.ai.azure.com", api_key="test-api-key")
+
+    @staticmethod
+    def _fake_ocr(start_pages: list[int]):
+        # Each call reports pages numbered from where its shard starts in the document
+        async def extract_from_bytes(file_bytes, content_type, filename=None):
+            start = start_pages.pop(0)
+            count = _pdf_page_count(file_bytes)
+            return {
+                "pages": [
+                    {"index": i, "markdown": f"**Page:** {start + i + 1}", "confidence": 0.9}
+                    for i in range(count)
+                ],
+                "model": "mistral-ocr-2503",
+                "usage_info": {"pages_processed": count}
+            }
+        return extract_from_bytes
+
+    @pytest.mark.asyncio
+    async def test_merged_shards_match_single_call(self, client):
+        pdf_bytes = _make_pdf(5)
+        extractor = DocumentExtractor(client, pages_per_shard=2)
+        client.extract_from_bytes = self._fake_ocr([0, 2, 4])
+
+        merged = await extractor._run_ocr(pdf_bytes, "application/pdf", "long.pdf")
+
+        single = await self._fake_ocr([0])(pdf_bytes, "application/pdf")
+        assert merged == single
+        assert client.parse_response(merged) == client.parse_response(single)
+
+    @pytest.mark.asyncio
+    async def test_shards_are_rendered_as_slots_free_up(self, client):
+        pdf_bytes = _make_pdf(6)
+        extractor = DocumentExtractor(client, pages_per_shard=2, max_concurrent_shards=1)
+        ocr = self._fake_ocr([0, 2, 4])
+        rendered = []
+        render = PdfShards.render
+
+        def counting_render(shards, index):
+            rendered.append(index)
+            return render(shards, index)
+
+        async def extract_from_bytes(file_bytes, content_type, filename=None):
+            rendered_when_sent.append(len(rendered))
+            return await ocr(file_bytes, content_type, filename)
+
+        rendered_when_sent = []
+        client.extract_from_bytes = extract_from_bytes
+
+        with patch.object(PdfShards, "render", counting_render):
+            result = await extractor.extract("long_pdf", pdf_bytes, "application/pdf", "long.pdf")
+
+        # With one slot, each shard is rendered only once the previous one was sent
+        assert rendered_when_sent == [1, 2, 3]
+        assert result.page_count == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_shard_is_not_retried_on_top_of_the_client(self, client):
+        pdf_bytes = _make_pdf(4)
+        extractor = DocumentExtractor(client, pages_per_shard=2, max_concurrent_shards=1)
+        ocr = self._fake_ocr([0, 2])
+        request = httpx.Request("POST", "https://test.inference.ai.azure.com")
+        calls = []
+
+        async def flaky(file_bytes, content_type, filename=None):
+            # The client has already used up its own retries when it raises
+            calls.append(filename)
+            if len(calls) == 2:
+                raise httpx.HTTPStatusError("busy", request=request, response=httpx.Response(503, request=request))
+            return await ocr(file_bytes, content_type, filename)
+
+        client.extract_from_bytes = flaky
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await extractor.extract("long_pdf", pdf_bytes, "application/pdf", "long.pdf")
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_shard_cancels_the_others(self, client):
+        pdf_bytes = _make_pdf(6)
+        extractor = DocumentExtractor(client, pages_per_shard=2, max_concurrent_shards=3)
+        request = httpx.Request("POST", "https://test.inference.ai.azure.com")
+        calls = []
+        cancelled = []
+
+        async def extract_from_bytes(file_bytes, content_type, filename=None):
+            calls.append(filename)
+            if len(calls) == 1:
+                await asyncio.sleep(0.01)
+                raise httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request))
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(filename)
+                raise
+
+        client.extract_from_bytes = extract_from_bytes
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await extractor._run_ocr(pdf_bytes, "application/pdf", "long.pdf")
+
+        assert len(cancelled) == 2
+
+    @pytest.mark.asyncio
+    async def test_short_pdf_is_not_sharded(self, client):
+        pdf_bytes = _make_pdf(2)
+        extractor = DocumentExtractor(client, pages_per_shard=2)
+        client.extract_from_bytes = AsyncMock(return_value={"pages": []})
+
+        await extractor._run_ocr(pdf_bytes, "application/pdf", "short.pdf")
+
+        client.extract_from_bytes.assert_awaited_once()
@@ -0,0 +1,92 @@
+import random
+import sys
+from pathlib import Path
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from models import ExtractedField
+from ocr.fields import PAGE_SEPARATOR, extract_fields, extract_page_fields
+
+
+def _line_split_extract(markdown_content: str) -> list[ExtractedField]:
+    """The previous DocumentExtractor._extract_fields, kept as a reference."""
+    fields = []
+    for line in markdown_content.split("\n"):
+        if ":" in line and not line.startswith("#"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                name = parts[0].strip().strip("*").strip("-").strip()
+                value = parts[1].strip().strip("*").strip()
+                if name and value and len(name) < 50:
+                    fields.append(ExtractedField(name=name, value=value, confidence=0.85))
+    return fields
+
+
+def _as_tuples(fields: list[ExtractedField]) -> list[tuple]:
+    return [(f.name, f.value, f.confidence) for f in fields]
+
+
+def _random_markdown(rng: random.Random) -> str:
+    tokens = [
+        "a", "Vendor", "Total Amount", " ", "  ", "\t", "\r", " ", " ", "*", "**", "-", "--",
+        ":", "::", "#", "# ", "|", "$1,000.00", "2024-01-15", "http://x.y", "é", "\n", "\n", "\n"
+    ]
+    return "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+
+
+class TestExtractFields:
+    def test_matches_line_split_implementation(self):
+        rng = random.Random(2024)
+        for _ in range(3000):
+            markdown = _random_markdown(rng)
+            assert _as_tuples(extract_fields(markdown)) == _as_tuples(_line_split_extract(markdown)), repr(markdown)
+
+    def test_bold_and_list_markup(self):
+        markdown = "**Vendor:** Acme Corp\n- **Date:** 2024-01-15\n* Total: **$500.00**\n# Title: skipped"
+
+        fields = extract_fields(markdown)
+
+        # Markup is stripped in the same order as before, so "- **Date" keeps its asterisks
+        assert [(f.name, f.value) for f in fields] == [
+            ("Vendor", "Acme Corp"),
+            ("**Date", "2024-01-15"),
+            ("Total", "$500.00"),
+        ]
+
+    def test_long_names_are_skipped(self):
+        assert extract_fields(f"{'x' * 50}: value") == []
+        assert len(extract_fields(f"{'x' * 49}: value")) == 1
+
+    def test_page_numbers_from_separators(self):
+        pages = ["**Vendor:** Acme", "**Date:** 2024-01-15", "Total: $500\nTax: $50"]
+        markdown = PAGE_SEPARATOR.join(pages)
+
+        fields = extract_fields(markdown, page_count=3)
+
+        assert [(f.name, f.page_number) for f in fields] == [("Vendor", 1), ("Date", 2), ("Total", 3), ("Tax", 3)]
+
+    def test_ambiguous_separators_leave_page_unset(self):
+        # A horizontal rule inside a page makes the separator count disagree with page_count
+        markdown = PAGE_SEPARATOR.join(["Vendor: Acme", "Notes", "Date: today"])
+
+        fields = extract_fields(markdown, page_count=2)
+
+        assert all(f.page_number is None for f in fields)
+
+    def test_per_page_extraction_matches_joined_text(self):
+        rng = random.Random(99)
+        for _ in range(1000):
+            pages = [_random_markdown(rng) for _ in range(rng.randint(1, 4))]
+
+            per_page = [
+                field
+                for number, page in enumerate(pages, 1)
+                for field in extract_page_fields(page, number)
+            ]
+
+            joined = extract_fields(PAGE_SEPARATOR.join(pages))
+            assert [(f.name, f.value) for f in per_page] == [(f.name, f.value) for f in joined], repr(pages)
+
+    def test_single_page(self):
+        assert extract_fields("Vendor: Acme", page_count=1)[0].page_number == 1
@@ -0,0 +1,226 @@
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from exporters import XmlExporter
+from models import CompactResult, ExtractionConfidence, FieldRecord
+from ocr.cache import OCRResultCache
+from ocr.extractor import DocumentExtractor
+from ocr.handler import process_document
+from utils.jobs import JobStore, LocalJobBackend
+from utils.manifest import LocalManifestBackend, ManifestIndex
+
+
+@pytest.fixture(autouse=True)
+def mistral_env(monkeypatch):
+    monkeypatch.setenv("MISTRAL_ENDPOINT", "https://test.inference.ai.azure.com")
+    monkeypatch.setenv("MISTRAL_API_KEY", "test-api-key")
+    monkeypatch.setattr("ocr.handler.get_manifest_index", lambda: None)
+
+
+@pytest.fixture
+def extraction_result():
+    return CompactResult(
+        document_id="invoice_pdf",
+        pages=["**Vendor:** Acme"],
+        raw_pages=["Vendor: Acme"],
+        fields=[FieldRecord(name="Vendor", value="Acme", confidence=0.85)],
+        confidence=ExtractionConfidence(overall=0.85, is_low_confidence=False),
+        page_count=1
+    )
+
+
+class TestProcessDocument:
+    @pytest.mark.asyncio
+    async def test_duplicate_upload_skips_ocr(
+        self, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper, mock_event_publisher
+    ):
+        cache = OCRResultCache()
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = extraction_result
+
+            first = await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                event_publisher=mock_event_publisher,
+                cache=cache
+            )
+            second = await process_document(
+                blob_name="invoice-copy.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                event_publisher=mock_event_publisher,
+                cache=cache
+            )
+
+        assert mock_extract.await_count == 1
+        assert first["cache"]["hit"] is False
+        assert second["cache"]["hit"] is True
+        assert second["cache"]["hits"] == 1
+        assert second["extraction"]["document_id"] == "invoice-copy_pdf"
+        assert "json" in second["exports"]
+
+    @pytest.mark.asyncio
+    async def test_only_enabled_formats_are_exported(
+        self, monkeypatch, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        monkeypatch.setenv("EXPORT_FORMATS", "json,md")
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = extraction_result
+            result = await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                cache=OCRResultCache()
+            )
+
+        assert set(result["exports"]) == {"json", "markdown"}
+        uploaded = {call.args[0] for call in mock_storage_helper.upload_result_stream.await_args_list}
+        assert uploaded == {"invoice.json", "invoice.md"}
+
+    @pytest.mark.asyncio
+    async def test_failed_format_keeps_successful_exports(
+        self, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract, \
+                patch.object(XmlExporter, "iter_export", side_effect=ValueError("bad xml")):
+            mock_extract.return_value = extraction_result
+            result = await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                cache=OCRResultCache()
+            )
+
+        assert "xml" not in result["exports"]
+        assert result["export_errors"] == {"xml": "bad xml"}
+        assert {"markdown", "json"} <= set(result["exports"])
+
+    @pytest.mark.asyncio
+    async def test_records_document_in_manifest(
+        self, tmp_path, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        manifest = ManifestIndex(LocalManifestBackend(tmp_path))
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = extraction_result
+            await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                cache=OCRResultCache(),
+                manifest=manifest
+            )
+
+        entries = await manifest.entries()
+        assert len(entries) == 1
+        assert entries[0]["id"] == "invoice"
+        assert entries[0]["status"] == "completed"
+        assert entries[0]["confidence"] == 0.85
+        assert "json" in entries[0]["exports"]
+        # Same format as backfilled entries, so they sort together
+        assert entries[0]["processed_at"].endswith("+00:00")
+
+    @pytest.mark.asyncio
+    async def test_failed_document_is_recorded(
+        self, tmp_path, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        manifest = ManifestIndex(LocalManifestBackend(tmp_path))
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.side_effect = RuntimeError("OCR unavailable")
+            with pytest.raises(RuntimeError):
+                await process_document(
+                    blob_name="invoice.pdf",
+                    blob_content=sample_pdf_bytes,
+                    blob_properties=mock_blob_properties,
+                    storage_helper=mock_storage_helper,
+                    cache=OCRResultCache(),
+                    manifest=manifest
+                )
+
+        entries = await manifest.entries()
+        assert entries[0]["status"] == "failed"
+        assert entries[0]["error"] == "OCR unavailable"
+
+    @pytest.mark.asyncio
+    async def test_job_moves_to_completed(
+        self, tmp_path, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        jobs = JobStore(LocalJobBackend(tmp_path))
+        job = await jobs.create("invoice.pdf", "invoice.pdf", "application/pdf", len(sample_pdf_bytes))
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = extraction_result
+            await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                cache=OCRResultCache(),
+                job_id=job["id"],
+                jobs=jobs
+            )
+
+        done = await jobs.get(job["id"])
+        assert done["status"] == "completed"
+        assert done["document_id"] == "invoice"
+        assert done["confidence"] == 0.85
+        assert "json" in done["exports"]
+
+    @pytest.mark.asyncio
+    async def test_job_records_failure(
+        self, tmp_path, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        jobs = JobStore(LocalJobBackend(tmp_path))
+        job = await jobs.create("invoice.pdf", "invoice.pdf", "application/pdf", len(sample_pdf_bytes))
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.side_effect = RuntimeError("OCR unavailable")
+            with pytest.raises(RuntimeError):
+                await process_document(
+                    blob_name="invoice.pdf",
+                    blob_content=sample_pdf_bytes,
+                    blob_properties=mock_blob_properties,
+                    storage_helper=mock_storage_helper,
+                    cache=OCRResultCache(),
+                    job_id=job["id"],
+                    jobs=jobs
+                )
+
+        failed = await jobs.get(job["id"])
+        assert failed["status"] == "failed"
+        assert failed["error"] == "OCR unavailable"
+
+    @pytest.mark.asyncio
+    async def test_lazy_mode_stores_only_canonical_result(
+        self, monkeypatch, extraction_result, sample_pdf_bytes, mock_blob_properties, mock_storage_helper
+    ):
+        monkeypatch.setenv("EXPORT_MODE", "lazy")
+
+        with patch.object(DocumentExtractor, "extract_compact", new_callable=AsyncMock) as mock_extract:
+            mock_extract.return_value = extraction_result
+            result = await process_document(
+                blob_name="invoice.pdf",
+                blob_content=sample_pdf_bytes,
+                blob_properties=mock_blob_properties,
+                storage_helper=mock_storage_helper,
+                cache=OCRResultCache()
+            )
+
+        assert set(result["exports"]) == {"result"}
+        uploaded = [call.args[0] for call in mock_storage_helper.upload_result.await_args_list]
+        assert uploaded == ["invoice.result.json"]
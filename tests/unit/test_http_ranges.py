@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.http_ranges import RangeNotSatisfiable, content_range, parse_range
+
+
+class TestParseRange:
+    def test_closed_range(self):
+        assert parse_range("bytes=0-99", 1000) == (0, 99)
+
+    def test_open_ended_range(self):
+        assert parse_range("bytes=900-", 1000) == (900, 999)
+
+    def test_suffix_range(self):
+        assert parse_range("bytes=-100", 1000) == (900, 999)
+        assert parse_range("bytes=-5000", 1000) == (0, 999)
+
+    def test_end_clamped_to_size(self):
+        assert parse_range("bytes=500-5000", 1000) == (500, 999)
+
+    def test_max_length(self):
+        assert parse_range("bytes=0-", 1000, max_length=256) == (0, 255)
+
+    def test_ignored_headers(self):
+        assert parse_range(None, 1000) is None
+        assert parse_range("bytes=0-10,20-30", 1000) is None
+        assert parse_range("items=0-10", 1000) is None
+        assert parse_range("bytes=50-10", 1000) is None
+        assert parse_range("bytes=0-10", 0) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=-0", 1000)
+
+    def test_content_range(self):
+        assert content_range(0, 99, 1000) == "bytes 0-99/1000"
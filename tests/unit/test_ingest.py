@@ -0,0 +1,155 @@
+import asyncio
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.ingest import (
+    IngestEntry,
+    ingest_entries,
+    is_zip,
+    iter_zip_entries,
+    unique_names,
+)
+
+
+def make_zip(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def entry(name: str, content: bytes = b"%PDF") -> IngestEntry:
+    return IngestEntry(name, "application/pdf", lambda: content)
+
+
+class TestZipEntries:
+    def test_yields_files_with_content_types(self):
+        data = make_zip({
+            "invoices/a.pdf": b"%PDF-a",
+            "scan.png": b"\x89PNG",
+            "invoices/": b"",
+            "__MACOSX/invoices/._a.pdf": b"fork",
+            ".DS_Store": b"junk"
+        })
+
+        entries = list(iter_zip_entries(data))
+
+        assert [(e.filename, e.content_type) for e in entries] == [
+            ("a.pdf", "application/pdf"),
+            ("scan.png", "image/png")
+        ]
+        assert entries[0].read() == b"%PDF-a"
+
+    def test_entries_are_read_lazily(self):
+        data = make_zip({"big.pdf": b"x" * 100, "small.pdf": b"y"})
+
+        entries = list(iter_zip_entries(data, max_bytes=10))
+
+        assert entries[1].read() == b"y"
+        with pytest.raises(ValueError, match="byte limit"):
+            entries[0].read()
+
+    def test_corrupt_archive(self):
+        with pytest.raises(zipfile.BadZipFile):
+            list(iter_zip_entries(b"not a zip"))
+
+    def test_is_zip(self):
+        assert is_zip(None, "application/zip")
+        assert is_zip(None, "application/x-zip-compressed; charset=binary")
+        assert is_zip("Scans.ZIP", "application/octet-stream")
+        assert not is_zip("invoice.pdf", "application/pdf")
+
+
+class TestUniqueNames:
+    def test_repeated_names_are_numbered(self):
+        names = [e.filename for e in unique_names([entry("a.pdf"), entry("b.pdf"), entry("A.pdf"), entry("a.pdf")])]
+
+        assert names == ["a.pdf", "b.pdf", "A-2.pdf", "a-3.pdf"]
+
+
+class TestIngestEntries:
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency_and_keeps_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def store(e: IngestEntry, content: bytes) -> dict:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"filename": e.filename, "job_id": e.filename}
+
+        results = await ingest_entries([entry(f"{i}.pdf") for i in range(10)], store, concurrency=3)
+
+        assert [r["job_id"] for r in results] == [f"{i}.pdf" for i in range(10)]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_reads_only_when_a_slot_is_free(self):
+        reads = []
+        release = asyncio.Event()
+
+        def reader(name):
+            def read():
+                reads.append(name)
+                return b"%PDF"
+            return read
+
+        async def store(e: IngestEntry, content: bytes) -> dict:
+            await release.wait()
+            return {"filename": e.filename, "job_id": e.filename}
+
+        entries = [IngestEntry(f"{i}.pdf", "application/pdf", reader(i)) for i in range(5)]
+        task = asyncio.create_task(ingest_entries(entries, store, concurrency=2))
+        await asyncio.sleep(0.05)
+
+        assert reads == [0, 1]
+        release.set()
+        await task
+        assert reads == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_file(self):
+        def broken():
+            raise ValueError("over the limit")
+
+        async def store(e: IngestEntry, content: bytes) -> dict:
+            if e.filename == "bad.pdf":
+                raise RuntimeError("upload failed")
+            return {"filename": e.filename, "job_id": "1"}
+
+        results = await ingest_entries(
+            [entry("ok.pdf"), entry("bad.pdf"), IngestEntry("huge.pdf", "application/pdf", broken)],
+            store,
+            concurrency=2
+        )
+
+        assert results == [
+            {"filename": "ok.pdf", "job_id": "1"},
+            {"filename": "bad.pdf", "error": "upload failed"},
+            {"filename": "huge.pdf", "error": "over the limit"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_zip_archive_end_to_end(self):
+        stored = {}
+
+        async def store(e: IngestEntry, content: bytes) -> dict:
+            stored[e.filename] = content
+            return {"filename": e.filename, "job_id": e.filename}
+
+        data = make_zip({"a/invoice.pdf": b"one", "b/invoice.pdf": b"two"})
+        results = await ingest_entries(unique_names(iter_zip_entries(data)), store, concurrency=4)
+
+        assert [r["filename"] for r in results] == ["invoice.pdf", "invoice-2.pdf"]
+        assert stored == {"invoice.pdf": b"one", "invoice-2.pdf": b"two"}
@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.jobs import (
+    JobStore,
+    LocalJobBackend,
+    batch_status,
+    is_job_id,
+    landing_blob_name,
+    new_job_id,
+)
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return JobStore(LocalJobBackend(tmp_path))
+
+
+class TestJobStore:
+    @pytest.mark.asyncio
+    async def test_create_and_get(self, jobs):
+        job = await jobs.create("invoice.pdf", "invoice.pdf", "application/pdf", 1024)
+
+        stored = await jobs.get(job["id"])
+
+        assert is_job_id(job["id"])
+        assert stored == job
+        assert stored["status"] == "pending"
+        assert stored["exports"] == {}
+
+    @pytest.mark.asyncio
+    async def test_same_filename_gets_separate_landing_blobs(self, jobs):
+        created = []
+        for _ in range(2):
+            job_id = new_job_id()
+            created.append(await jobs.create(
+                "invoice.pdf", landing_blob_name(job_id, "invoice.pdf"), "application/pdf", 1024, job_id=job_id
+            ))
+
+        assert created[0]["blob_name"] == f"{created[0]['id']}/invoice.pdf"
+        assert created[0]["blob_name"] != created[1]["blob_name"]
+        assert await jobs.get(created[1]["id"]) == created[1]
+
+    @pytest.mark.asyncio
+    async def test_update_merges_changes(self, jobs):
+        job = await jobs.create("invoice.pdf", "invoice.pdf", "application/pdf", 1024)
+
+        await jobs.update(job["id"], status="processing", document_id="invoice")
+        updated = await jobs.update(job["id"], status="completed", exports={"json": "https://x/invoice.json"})
+
+        assert updated["status"] == "completed"
+        assert updated["document_id"] == "invoice"
+        assert updated["exports"] == {"json": "https://x/invoice.json"}
+        assert await jobs.get(job["id"]) == updated
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, jobs):
+        assert await jobs.get("0" * 32) is None
+        assert await jobs.update("0" * 32, status="failed") is None
+
+    @pytest.mark.asyncio
+    async def test_malformed_ids_never_reach_the_backend(self):
+        backend = AsyncMock()
+        jobs = JobStore(backend)
+
+        assert await jobs.get("../../etc/passwd") is None
+        assert await jobs.get("ABC") is None
+        backend.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_status_aggregates_jobs(self, jobs):
+        first = await jobs.create("a.pdf", "a.pdf", "application/pdf", 10, batch_id="b" * 32)
+        second = await jobs.create("b.pdf", "b.pdf", "application/pdf", 10, batch_id="b" * 32)
+        await jobs.create_batch("b" * 32, [
+            {"filename": "a.pdf", "job_id": first["id"]},
+            {"filename": "b.pdf", "job_id": second["id"]},
+            {"filename": "c.pdf", "error": "too large"}
+        ])
+
+        status = await jobs.get_batch_status("b" * 32)
+        assert status["status"] == "processing"
+        assert status["counts"] == {"pending": 2, "processing": 0, "completed": 0, "failed": 1}
+
+        await jobs.update(first["id"], status="completed", document_id="a")
+        await jobs.update(second["id"], status="completed", document_id="b")
+        status = await jobs.get_batch_status("b" * 32)
+
+        assert status["status"] == "completed_with_errors"
+        assert status["total"] == 3
+        assert [job["status"] for job in status["jobs"]] == ["completed", "completed", "failed"]
+        assert status["jobs"][2]["error"] == "too large"
+
+    @pytest.mark.asyncio
+    async def test_job_ids_are_not_batches(self, jobs):
+        job = await jobs.create("a.pdf", "a.pdf", "application/pdf", 10)
+
+        assert await jobs.get_batch_status(job["id"]) is None
+        assert await jobs.get_batch_status("0" * 32) is None
+
+
+class TestBatchStatus:
+    @pytest.mark.parametrize("counts, expected", [
+        ({"pending": 3}, "pending"),
+        ({"pending": 1, "completed": 2}, "processing"),
+        ({"processing": 1, "failed": 1}, "processing"),
+        ({"completed": 3}, "completed"),
+        ({"completed": 2, "failed": 1}, "completed_with_errors"),
+        ({"failed": 3}, "failed"),
+    ])
+    def test_status(self, counts, expected):
+        assert batch_status(counts) == expected
@@ -0,0 +1,145 @@
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from exporters import (
+    LazyExportRenderer,
+    MarkdownExporter,
+    canonical_blob_name,
+    store_canonical_result,
+)
+from models import ExtractedField, ExtractionConfidence, ExtractionResult
+from utils.compression import compress, decompress, result_encoding
+from utils.read_cache import BlobReadCache
+
+
+class _InMemoryStorage:
+    extracted_data_container = "extracted-data"
+
+    def __init__(self):
+        self.blobs = {}
+        self.uploads = []
+        self._version = 0
+
+    async def upload_blob(
+        self, container, blob_name, data, content_type="application/octet-stream", metadata=None, content_encoding=None
+    ):
+        self._version += 1
+        self.blobs[(container, blob_name)] = (data, f'"0x{self._version}"', metadata or {}, content_type, content_encoding)
+        self.uploads.append(blob_name)
+        return f"https://teststorage.blob.core.windows.net/{container}/{blob_name}"
+
+    async def upload_result(self, blob_name, content, content_type="text/plain"):
+        data = content.encode("utf-8")
+        encoding = result_encoding()
+        if encoding:
+            data = compress(data, encoding)
+        return await self.upload_blob(
+            self.extracted_data_container, blob_name, data, content_type, content_encoding=encoding
+        )
+
+    async def download_blob_if_modified(self, container, blob_name, etag=None):
+        if (container, blob_name) not in self.blobs:
+            raise ResourceNotFoundError("BlobNotFound")
+        data, current_etag, metadata, content_type, content_encoding = self.blobs[(container, blob_name)]
+        if etag == current_etag:
+            return None, {}
+        return data, {
+            "etag": current_etag,
+            "last_modified": datetime(2024, 1, 15, 10, 30, tzinfo=UTC),
+            "content_type": content_type,
+            "content_encoding": content_encoding,
+            "metadata": metadata
+        }
+
+
+@pytest.fixture
+def extraction_result():
+    return ExtractionResult(
+        document_id="invoice_pdf",
+        raw_text="Vendor: Acme",
+        markdown_content="**Vendor:** Acme",
+        fields=[ExtractedField(name="Vendor", value="Acme", confidence=0.85)],
+        confidence=ExtractionConfidence(overall=0.85, is_low_confidence=False),
+        page_count=1
+    )
+
+
+@pytest.fixture
+def storage():
+    return _InMemoryStorage()
+
+
+def _renderer(storage) -> LazyExportRenderer:
+    return LazyExportRenderer(storage, read_cache=BlobReadCache(storage, revalidate_after=0))
+
+
+class TestLazyExportRenderer:
+    @pytest.mark.asyncio
+    async def test_renders_from_canonical_result(self, storage, extraction_result):
+        await store_canonical_result(extraction_result, "invoice", storage)
+
+        blob = await _renderer(storage).get("invoice", "markdown")
+
+        assert blob.content == MarkdownExporter().export(extraction_result).encode("utf-8")
+        assert storage.uploads == [canonical_blob_name("invoice"), "invoice.md"]
+
+    @pytest.mark.asyncio
+    async def test_renders_once_per_result_version(self, storage, extraction_result):
+        await store_canonical_result(extraction_result, "invoice", storage)
+        renderer = _renderer(storage)
+
+        first = await renderer.get("invoice", "xml")
+        second = await renderer.get("invoice", "xml")
+
+        assert renderer.renders == 1
+        assert first.etag == second.etag
+
+    @pytest.mark.asyncio
+    async def test_written_back_render_reused_by_new_instance(self, storage, extraction_result):
+        await store_canonical_result(extraction_result, "invoice", storage)
+        await _renderer(storage).get("invoice", "csv")
+
+        renderer = _renderer(storage)
+        await renderer.get("invoice", "csv")
+
+        assert renderer.renders == 0
+
+    @pytest.mark.asyncio
+    async def test_reprocessed_result_is_rendered_again(self, storage, extraction_result):
+        await store_canonical_result(extraction_result, "invoice", storage)
+        renderer = _renderer(storage)
+        first = await renderer.get("invoice", "markdown")
+
+        updated = extraction_result.model_copy(update={"page_count": 3})
+        await store_canonical_result(updated, "invoice", storage)
+        second = await renderer.get("invoice", "markdown")
+
+        assert renderer.renders == 2
+        assert first.etag != second.etag
+        assert b"**Pages:** 3" in second.content
+
+    @pytest.mark.asyncio
+    async def test_eager_exports_served_without_canonical(self, storage):
+        await storage.upload_result("invoice.md", "# Eager", "text/markdown")
+
+        blob = await _renderer(storage).get("invoice", "markdown")
+
+        assert blob.content == b"# Eager"
+
+    @pytest.mark.asyncio
+    async def test_compressed_canonical_and_render(self, monkeypatch, storage, extraction_result):
+        monkeypatch.setenv("RESULT_COMPRESSION", "gzip")
+        await store_canonical_result(extraction_result, "invoice", storage)
+
+        blob = await _renderer(storage).get("invoice", "markdown")
+
+        assert blob.content_encoding == "gzip"
+        assert decompress(blob.content, "gzip") == MarkdownExporter().export(extraction_result).encode("utf-8")
+        assert storage.blobs[("extracted-data", "invoice.md")][4] == "gzip"
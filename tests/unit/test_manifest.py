@@ -0,0 +1,259 @@
+import sys
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.manifest import (
+    LocalManifestBackend,
+    ManifestIndex,
+    decode_continuation,
+    encode_continuation,
+    utc_timestamp,
+)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return ManifestIndex(LocalManifestBackend(tmp_path), shards=4, page_size=2)
+
+
+async def _age_segments(manifest: ManifestIndex):
+    """Move every open segment back three hours so compaction folds it."""
+    old_segment = manifest._segment_name(datetime.now(UTC) - timedelta(hours=3))
+    for shard in range(manifest.shards):
+        for name in await manifest.backend.list_segments(shard):
+            await manifest.backend.append(shard, old_segment, await manifest.backend.read(shard, name))
+            await manifest.backend.delete(shard, name)
+
+
+async def _all_pages(manifest: ManifestIndex, **kwargs) -> list[str]:
+    seen = []
+    continuation = None
+    while True:
+        page, continuation = await manifest.query(continuation=continuation, **kwargs)
+        seen.extend(e["id"] for e in page)
+        if continuation is None:
+            return seen
+
+
+def _entry(doc_id: str, **overrides) -> dict:
+    entry = {
+        "id": doc_id,
+        "filename": f"{doc_id}.pdf",
+        "status": "completed",
+        "confidence": 0.9,
+        "page_count": 1,
+        "exports": {},
+        "processed_at": "2024-01-15T10:00:00"
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestManifestIndex:
+    @pytest.mark.asyncio
+    async def test_latest_record_wins(self, manifest):
+        await manifest.record(_entry("invoice", status="failed", confidence=None))
+        await manifest.record(_entry("invoice", status="completed", confidence=0.8))
+
+        entries = await manifest.entries()
+
+        assert len(entries) == 1
+        assert entries[0]["status"] == "completed"
+        assert entries[0]["confidence"] == 0.8
+
+    @pytest.mark.asyncio
+    async def test_filters_and_sorting(self, manifest):
+        await manifest.record(_entry("a", confidence=0.5))
+        await manifest.record(_entry("b", confidence=0.95))
+        await manifest.record(_entry("c", confidence=0.75))
+        await manifest.record(_entry("d", status="failed", confidence=None))
+
+        completed, _ = await manifest.query(status="completed", sort="confidence", descending=False)
+        confident, _ = await manifest.query(min_confidence=0.7, sort="confidence")
+
+        assert [e["id"] for e in completed] == ["a", "c", "b"]
+        assert [e["id"] for e in confident] == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_missing_sort_values_go_last(self, manifest):
+        await manifest.record(_entry("a", confidence=0.5))
+        await manifest.record(_entry("b", confidence=None))
+
+        ascending, _ = await manifest.query(sort="confidence", descending=False)
+        descending, _ = await manifest.query(sort="confidence", descending=True)
+
+        assert [e["id"] for e in ascending] == ["a", "b"]
+        assert [e["id"] for e in descending] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, manifest):
+        for i in range(5):
+            await manifest.record(_entry(f"doc-{i}"))
+
+        seen = []
+        continuation = None
+        while True:
+            page, continuation = await manifest.query(sort="id", descending=False, limit=2, continuation=continuation)
+            seen.extend(e["id"] for e in page)
+            if continuation is None:
+                break
+
+        assert seen == [f"doc-{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_paginates_compacted_pages_and_open_segments(self, manifest):
+        for i in range(7):
+            await manifest.record(_entry(f"doc-{i}", processed_at=f"2024-01-15T10:0{i}:00"))
+        await _age_segments(manifest)
+        await manifest.compact()
+        # Newer records stay in the open segment and override their compacted copies
+        await manifest.record(_entry("doc-1", processed_at="2024-01-15T11:00:00"))
+        await manifest.record(_entry("doc-7", processed_at="2024-01-15T10:07:00"))
+        await manifest.record(_entry("doc-8", processed_at=None, status="failed"))
+
+        newest_first = await _all_pages(manifest, limit=3)
+        oldest_first = await _all_pages(manifest, descending=False, limit=2)
+
+        assert newest_first == ["doc-1", "doc-7", "doc-6", "doc-5", "doc-4", "doc-3", "doc-2", "doc-0", "doc-8"]
+        assert oldest_first == ["doc-0", "doc-2", "doc-3", "doc-4", "doc-5", "doc-6", "doc-7", "doc-1", "doc-8"]
+
+    @pytest.mark.asyncio
+    async def test_continuation_is_stable_under_inserts(self, manifest):
+        for i in range(4):
+            await manifest.record(_entry(f"doc-{i}", processed_at=f"2024-01-15T10:0{i}:00"))
+
+        first, continuation = await manifest.query(limit=2)
+        # Newer than everything already returned, so it must not push doc-1 onto the next page again
+        await manifest.record(_entry("doc-9", processed_at="2024-01-15T10:09:00"))
+        second, _ = await manifest.query(limit=2, continuation=continuation)
+
+        assert [e["id"] for e in first] == ["doc-3", "doc-2"]
+        assert [e["id"] for e in second] == ["doc-1", "doc-0"]
+
+    @pytest.mark.asyncio
+    async def test_skips_pages_before_the_continuation(self, manifest):
+        for i in range(6):
+            await manifest.record(_entry(f"doc-{i}", processed_at=f"2024-01-15T10:0{i}:00"))
+        await _age_segments(manifest)
+        await manifest.compact()
+        _, continuation = await manifest.query(descending=False, limit=5)
+
+        read = AsyncMock(side_effect=manifest.backend.read)
+        manifest.backend.read = read
+        page, _ = await manifest.query(descending=False, limit=5, continuation=continuation)
+
+        pages_read = [call.args[1] for call in read.await_args_list if call.args[1].startswith("page-")]
+        assert [e["id"] for e in page] == ["doc-5"]
+        assert len(pages_read) == 1
+
+    @pytest.mark.asyncio
+    async def test_continuation_must_match_sort(self, manifest):
+        for i in range(3):
+            await manifest.record(_entry(f"doc-{i}"))
+        _, continuation = await manifest.query(sort="id", limit=1)
+
+        with pytest.raises(ValueError):
+            await manifest.query(sort="confidence", limit=1, continuation=continuation)
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_field(self, manifest):
+        with pytest.raises(ValueError):
+            await manifest.query(sort="blob_url")
+
+    @pytest.mark.asyncio
+    async def test_torn_line_is_skipped(self, manifest, tmp_path):
+        await manifest.record(_entry("invoice"))
+        shard = manifest.shard_for("invoice")
+        await manifest.backend.append(shard, manifest._current_segment(), b'{"id": "broken", "sta')
+
+        entries = await manifest.entries()
+
+        assert [e["id"] for e in entries] == ["invoice"]
+
+    @pytest.mark.asyncio
+    async def test_compaction_folds_closed_segments(self, manifest):
+        shard = manifest.shard_for("invoice")
+        old_segment = manifest._segment_name(datetime.now(UTC) - timedelta(hours=3))
+        await manifest.backend.append(shard, old_segment, b'{"id":"invoice","status":"failed","updated_at":"2024-01-01"}\n')
+        await manifest.record(_entry("invoice"))
+
+        await manifest.compact()
+
+        segments = await manifest.backend.list_segments(shard)
+        entries = await manifest.entries()
+        assert old_segment not in segments
+        assert manifest._current_segment() in segments
+        assert len(entries) == 1
+        assert entries[0]["status"] == "completed"
+
+
+class TestBackfill:
+    @staticmethod
+    def _storage_helper(names: list[str]) -> MagicMock:
+        modified = datetime(2024, 1, 1, tzinfo=UTC)
+
+        async def list_blobs():
+            for name in names:
+                yield SimpleNamespace(name=name, last_modified=modified)
+
+        container = MagicMock()
+        container.list_blobs = list_blobs
+        container.get_blob_client.side_effect = lambda name: SimpleNamespace(url=f"https://results/{name}")
+        helper = MagicMock()
+        helper.extracted_data_container = "extracted-data"
+        helper.get_container_client = AsyncMock(return_value=container)
+        return helper
+
+    @pytest.mark.asyncio
+    async def test_adds_documents_from_results_container(self, manifest):
+        await manifest.record(_entry("known", confidence=0.8))
+        helper = self._storage_helper(["known.json", "old.json", "old.csv", "older.result.json"])
+
+        assert not await manifest.is_backfilled()
+        added = await manifest.backfill(helper)
+
+        entries = {e["id"]: e for e in await manifest.entries()}
+        assert added == 2
+        assert await manifest.is_backfilled()
+        assert entries["known"]["confidence"] == 0.8
+        assert entries["old"]["exports"] == {"json": "https://results/old.json", "csv": "https://results/old.csv"}
+        assert entries["older"]["exports"] == {"result": "https://results/older.result.json"}
+
+    @pytest.mark.asyncio
+    async def test_marker_survives_restart(self, manifest, tmp_path):
+        await manifest.backfill(self._storage_helper([]))
+
+        assert await ManifestIndex(LocalManifestBackend(tmp_path), shards=4).is_backfilled()
+
+
+class TestContinuationTokens:
+    def test_round_trip(self):
+        token = encode_continuation("processed_at", True, [False, "2024-01-15T10:00:00", "invoice"])
+
+        assert decode_continuation(token, "processed_at", True) == [False, "2024-01-15T10:00:00", "invoice"]
+
+    def test_invalid_token(self):
+        with pytest.raises(ValueError):
+            decode_continuation("not-a-token!", "processed_at", True)
+
+    def test_token_for_other_order(self):
+        token = encode_continuation("processed_at", True, [False, "2024-01-15T10:00:00", "invoice"])
+
+        with pytest.raises(ValueError):
+            decode_continuation(token, "processed_at", False)
+
+
+class TestTimestamps:
+    def test_naive_and_aware_times_share_one_format(self):
+        naive = datetime(2024, 1, 15, 10, 0)
+        aware = datetime(2024, 1, 15, 11, 0, tzinfo=timezone(timedelta(hours=1)))
+
+        assert utc_timestamp(naive) == utc_timestamp(aware) == "2024-01-15T10:00:00+00:00"
+        assert utc_timestamp(None) is None
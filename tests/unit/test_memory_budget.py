@@ -0,0 +1,84 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.memory_budget import DocumentTooLarge, MemoryBudget, MemoryBudgetExceeded
+
+
+class TestMemoryBudget:
+    @pytest.mark.asyncio
+    async def test_reservations_within_capacity_run_together(self):
+        budget = MemoryBudget(capacity=100)
+
+        async with budget.reserve(40), budget.reserve(60):
+            assert budget.in_use == 100
+
+        assert budget.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_oversized_document_is_refused(self):
+        budget = MemoryBudget(capacity=100)
+
+        with pytest.raises(DocumentTooLarge):
+            async with budget.reserve(101):
+                pass
+        assert budget.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_waits_in_arrival_order(self):
+        budget = MemoryBudget(capacity=100, wait_timeout=5)
+        order = []
+        release = asyncio.Event()
+
+        async def hold(name: str, size: int):
+            async with budget.reserve(size):
+                order.append(name)
+                await release.wait()
+
+        first = asyncio.create_task(hold("first", 80))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(hold("big", 60))
+        small = asyncio.create_task(hold("small", 10))
+        await asyncio.sleep(0.01)
+
+        # "small" would fit, but does not overtake "big"
+        assert order == ["first"]
+        assert budget.stats() == {"capacity": 100, "in_use": 80, "active": 1, "waiting": 2}
+        release.set()
+        await asyncio.gather(first, big, small)
+
+        assert order == ["first", "big", "small"]
+        assert budget.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_wait_timeout(self):
+        budget = MemoryBudget(capacity=100, wait_timeout=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with budget.reserve(90):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(MemoryBudgetExceeded):
+            async with budget.reserve(20):
+                pass
+
+        assert budget.stats()["waiting"] == 0
+        release.set()
+        await holder
+        assert budget.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_capacity_disables_the_budget(self):
+        budget = MemoryBudget(capacity=0)
+
+        async with budget.reserve(10 ** 12):
+            assert budget.in_use == 0
@@ -1,12 +1,15 @@
-import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
-import httpx
+import asyncio
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
 
 # Add api/ directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
 
+from ocr.http_pool import HttpClientPool
 from ocr.mistral_client import MistralOCRClient
 
 
@@ -47,6 +50,21 @@ class TestMistralOCRClient:
         assert "Page 2 content" in result["markdown_content"]
         assert result["confidence"] == pytest.approx(0.875)
 
+    def test_iter_pages_keeps_page_text(self, client):
+        response = {
+            "pages": [
+                {"markdown": "Page 1 content", "confidence": 0.9, "tables": [{"rows": []}]},
+                {"markdown": "Page 2 content"}
+            ]
+        }
+
+        pages = list(client.iter_pages(response))
+
+        assert [page["markdown"] for page in pages] == ["Page 1 content", "Page 2 content"]
+        assert pages[0]["markdown"] is response["pages"][0]["markdown"]
+        assert [page["tables"] for page in pages] == [[{"rows": []}], []]
+        assert [page["confidence"] for page in pages] == [0.9, None]
+
     def test_parse_response_empty(self, client):
         response = {"pages": [], "model": "mistral-ocr-2503"}
         result = client.parse_response(response)
@@ -71,3 +89,73 @@ class TestMistralOCRClient:
                 )
 
             assert result == {"pages": [{"markdown": "test"}]}
+
+    @pytest.mark.asyncio
+    async def test_extract_from_bytes_uses_injected_http_client(self, sample_pdf_bytes):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"pages": []}
+        mock_response.raise_for_status = MagicMock()
+
+        http_client = MagicMock(spec=httpx.AsyncClient)
+        http_client.post = AsyncMock(return_value=mock_response)
+
+        client = MistralOCRClient(
+            endpoint="https://test.inference.ai.azure.com",
+            api_key="test-api-key",
+            http_client=http_client
+        )
+        await client.extract_from_bytes(file_bytes=sample_pdf_bytes, content_type="application/pdf")
+        await client.extract_from_bytes(file_bytes=sample_pdf_bytes, content_type="application/pdf")
+
+        assert http_client.post.await_count == 2
+
+
+class TestHttpClientPool:
+    @pytest.mark.asyncio
+    async def test_get_client_reuses_connection_pool(self):
+        pool = HttpClientPool(max_connections=5, max_keepalive_connections=2)
+
+        first = pool.get_client()
+        second = pool.get_client()
+
+        assert first is second
+        await pool.aclose()
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_get_client_recreates_after_close(self):
+        pool = HttpClientPool()
+
+        first = pool.get_client()
+        await pool.aclose()
+        second = pool.get_client()
+
+        assert first is not second
+        await pool.aclose()
+
+    def test_loop_change_closes_the_previous_client(self):
+        pool = HttpClientPool()
+
+        async def get_client():
+            return pool.get_client()
+
+        old_loop = asyncio.new_event_loop()
+        first = old_loop.run_until_complete(get_client())
+
+        async def on_new_loop():
+            client = pool.get_client()
+            # Let the retired client's close run
+            await asyncio.sleep(0)
+            await pool.aclose()
+            return client
+
+        second = asyncio.run(on_new_loop())
+        old_loop.close()
+
+        assert second is not first
+        assert first.is_closed
+
+    def test_explicit_zero_is_not_replaced_by_default(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_HTTP_KEEPALIVE_EXPIRY", "60")
+
+        assert HttpClientPool(keepalive_expiry=0).keepalive_expiry == 0
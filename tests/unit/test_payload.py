@@ -0,0 +1,74 @@
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from ocr.payload import StreamingOCRPayload
+
+
+async def _collect(payload: StreamingOCRPayload) -> bytes:
+    return b"".join([chunk async for chunk in payload])
+
+
+class TestStreamingOCRPayload:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 10, 1000, 4097])
+    async def test_matches_inline_payload(self, size):
+        file_bytes = bytes(range(256)) * (size // 256 + 1)
+        file_bytes = file_bytes[:size]
+        payload = StreamingOCRPayload(
+            model="mistral-document-ai-2505",
+            file_bytes=file_bytes,
+            content_type="application/pdf",
+            chunk_size=3 * 7
+        )
+
+        body = await _collect(payload)
+
+        expected = {
+            "model": "mistral-document-ai-2505",
+            "document": {
+                "type": "document_url",
+                "document_url": "data:application/pdf;base64," + base64.b64encode(file_bytes).decode("utf-8")
+            },
+            "include_image_base64": False
+        }
+        assert json.loads(body) == expected
+        assert len(body) == len(payload)
+
+    @pytest.mark.asyncio
+    async def test_image_payload_uses_image_url(self, sample_image_bytes):
+        payload = StreamingOCRPayload(
+            model="mistral-document-ai-2505",
+            file_bytes=sample_image_bytes,
+            content_type="image/bmp"
+        )
+
+        data = json.loads(await _collect(payload))
+
+        assert data["document"]["type"] == "image_url"
+        assert data["document"]["image_url"].startswith("data:image/png;base64,")
+
+    @pytest.mark.asyncio
+    async def test_payload_can_be_iterated_again(self, sample_pdf_bytes):
+        payload = StreamingOCRPayload(
+            model="mistral-document-ai-2505",
+            file_bytes=sample_pdf_bytes,
+            content_type="application/pdf"
+        )
+
+        assert await _collect(payload) == await _collect(payload)
+
+    def test_rejects_unaligned_chunk_size(self, sample_pdf_bytes):
+        with pytest.raises(ValueError):
+            StreamingOCRPayload(
+                model="mistral-document-ai-2505",
+                file_bytes=sample_pdf_bytes,
+                content_type="application/pdf",
+                chunk_size=1000
+            )
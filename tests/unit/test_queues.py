@@ -0,0 +1,106 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.queues import InMemoryQueue, ingest_message, parse_ingest_message
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(clock):
+    return InMemoryQueue(clock=clock)
+
+
+class TestInMemoryQueue:
+    @pytest.mark.asyncio
+    async def test_received_messages_are_hidden_until_timeout(self, queue, clock):
+        await queue.send("a")
+        await queue.send("b")
+
+        first = await queue.receive(1, visibility_timeout=30)
+        assert [m.content for m in first] == ["a"]
+        assert [m.content for m in await queue.receive(5, visibility_timeout=30)] == ["b"]
+        assert await queue.receive(5, visibility_timeout=30) == []
+
+        clock.now = 31
+        again = await queue.receive(5, visibility_timeout=30)
+        assert [(m.content, m.dequeue_count) for m in again] == [("a", 2), ("b", 2)]
+
+    @pytest.mark.asyncio
+    async def test_delete_needs_current_pop_receipt(self, queue, clock):
+        await queue.send("a")
+        [stale] = await queue.receive(1, visibility_timeout=10)
+        clock.now = 11
+        [current] = await queue.receive(1, visibility_timeout=10)
+
+        with pytest.raises(LookupError):
+            await queue.delete(stale)
+        await queue.delete(current)
+        assert len(queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_update_visibility_extends_and_renews_receipt(self, queue, clock):
+        await queue.send("a")
+        [message] = await queue.receive(1, visibility_timeout=10)
+
+        clock.now = 8
+        extended = await queue.update_visibility(message, 10)
+        clock.now = 15
+        assert await queue.receive(1, visibility_timeout=10) == []
+        assert extended.pop_receipt != message.pop_receipt
+        with pytest.raises(LookupError):
+            await queue.update_visibility(message, 10)
+
+    @pytest.mark.asyncio
+    async def test_send_with_delay(self, queue, clock):
+        await queue.send("later", visibility_timeout=5)
+
+        assert await queue.receive(1, visibility_timeout=10) == []
+        clock.now = 5
+        assert len(await queue.receive(1, visibility_timeout=10)) == 1
+
+
+class TestIngestMessages:
+    def test_round_trip_drops_unset_values(self):
+        content = ingest_message("invoice.pdf", job_id="a" * 32)
+
+        assert json.loads(content) == {"blob_name": "invoice.pdf", "job_id": "a" * 32}
+        assert parse_ingest_message(content) == {"blob_name": "invoice.pdf", "job_id": "a" * 32}
+
+    def test_event_grid_blob_created(self):
+        event = {
+            "eventType": "Microsoft.Storage.BlobCreated",
+            "subject": "/blobServices/default/containers/landing-zone/blobs/scans/invoice.pdf",
+            "data": {"contentType": "application/pdf", "url": "https://x.blob.core.windows.net/landing-zone/scans/invoice.pdf"}
+        }
+
+        assert parse_ingest_message(json.dumps(event)) == {
+            "blob_name": "scans/invoice.pdf",
+            "content_type": "application/pdf"
+        }
+
+    def test_events_for_other_containers_are_rejected(self):
+        event = {
+            "type": "Microsoft.Storage.BlobCreated",
+            "subject": "/blobServices/default/containers/extracted-data/blobs/invoice.json"
+        }
+
+        with pytest.raises(ValueError):
+            parse_ingest_message(json.dumps(event))
@@ -0,0 +1,125 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from ocr.mistral_client import MistralOCRClient
+from ocr.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+
+    def test_milliseconds_header_takes_precedence(self):
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+
+    def test_http_date_in_the_past(self):
+        assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"retry-after": "soon"}) is None
+
+
+class TestAdaptiveRateLimiter:
+    def test_throttle_decreases_multiplicatively(self):
+        limiter = AdaptiveRateLimiter(requests_per_second=8, min_rate=1)
+
+        limiter.on_throttle()
+        assert limiter.rate == 4
+        limiter.on_throttle()
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.rate == 1
+        assert limiter.throttle_events == 4
+
+    def test_success_increases_additively_up_to_max(self):
+        limiter = AdaptiveRateLimiter(requests_per_second=2, increase_step=0.5)
+        limiter.on_throttle()
+
+        limiter.on_success()
+        assert limiter.rate == 1.5
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.rate == 2
+
+    def test_backoff_respects_retry_after(self):
+        limiter = AdaptiveRateLimiter(backoff_base=0.01)
+
+        assert limiter.backoff_delay(0, retry_after=5) == 5
+        assert 0 <= limiter.backoff_delay(3) <= 0.08
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        limiter = AdaptiveRateLimiter(requests_per_second=1000, max_concurrency=2)
+        active = 0
+        peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.requests == 6
+
+
+class TestMistralClientRetries:
+    @staticmethod
+    def _client(responses: list[httpx.Response], limiter: AdaptiveRateLimiter, max_retries: int = 3):
+        def handler(request):
+            return responses.pop(0)
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return MistralOCRClient(
+            endpoint="https://test.inference.ai.azure.com",
+            api_key="test-api-key",
+            http_client=http_client,
+            rate_limiter=limiter,
+            max_retries=max_retries
+        )
+
+    @pytest.mark.asyncio
+    async def test_retries_429_and_adapts_rate(self, sample_pdf_bytes):
+        limiter = AdaptiveRateLimiter(requests_per_second=100, backoff_base=0)
+        client = self._client([
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"pages": []})
+        ], limiter)
+
+        result = await client.extract_from_bytes(file_bytes=sample_pdf_bytes, content_type="application/pdf")
+
+        assert result == {"pages": []}
+        assert limiter.stats()["throttle_events"] == 1
+        assert limiter.stats()["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, sample_pdf_bytes):
+        limiter = AdaptiveRateLimiter(requests_per_second=100, backoff_base=0)
+        client = self._client([httpx.Response(503), httpx.Response(503)], limiter, max_retries=1)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.extract_from_bytes(file_bytes=sample_pdf_bytes, content_type="application/pdf")
+
+        assert limiter.retries == 1
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, sample_pdf_bytes):
+        limiter = AdaptiveRateLimiter(requests_per_second=100, backoff_base=0)
+        client = self._client([httpx.Response(400), httpx.Response(200, json={})], limiter)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.extract_from_bytes(file_bytes=sample_pdf_bytes, content_type="application/pdf")
+
+        assert limiter.retries == 0
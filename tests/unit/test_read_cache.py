@@ -0,0 +1,120 @@
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.read_cache import (
+    BlobReadCache,
+    CachedBlob,
+    is_not_modified,
+    validator_headers,
+)
+
+LAST_MODIFIED = datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def storage_helper():
+    helper = MagicMock()
+    helper.download_blob_if_modified = AsyncMock(return_value=(
+        b'{"status": "completed"}',
+        {"etag": '"0x1"', "last_modified": LAST_MODIFIED, "content_type": "application/json"}
+    ))
+    return helper
+
+
+def _blob(etag='"0x1"') -> CachedBlob:
+    return CachedBlob(
+        content=b"{}",
+        etag=etag,
+        last_modified=LAST_MODIFIED,
+        content_type="application/json",
+        checked_at=0.0
+    )
+
+
+class TestBlobReadCache:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_from_memory(self, storage_helper):
+        cache = BlobReadCache(storage_helper, revalidate_after=60)
+
+        await cache.get("extracted-data", "invoice.json")
+        blob = await cache.get("extracted-data", "invoice.json")
+
+        assert blob.content == b'{"status": "completed"}'
+        assert storage_helper.download_blob_if_modified.await_count == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_revalidated_by_etag(self, storage_helper):
+        cache = BlobReadCache(storage_helper, revalidate_after=0)
+
+        await cache.get("extracted-data", "invoice.json")
+        storage_helper.download_blob_if_modified.return_value = (None, {})
+        blob = await cache.get("extracted-data", "invoice.json")
+
+        assert blob.etag == '"0x1"'
+        assert storage_helper.download_blob_if_modified.await_args.kwargs["etag"] == '"0x1"'
+        assert cache.stats()["revalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_blob_replaces_entry(self, storage_helper):
+        cache = BlobReadCache(storage_helper, revalidate_after=0)
+
+        await cache.get("extracted-data", "invoice.json")
+        storage_helper.download_blob_if_modified.return_value = (
+            b"updated", {"etag": '"0x2"', "last_modified": LAST_MODIFIED, "content_type": "application/json"}
+        )
+        blob = await cache.get("extracted-data", "invoice.json")
+
+        assert blob.content == b"updated"
+        assert blob.etag == '"0x2"'
+
+    @pytest.mark.asyncio
+    async def test_size_bound(self, storage_helper):
+        cache = BlobReadCache(storage_helper, max_bytes=30)
+
+        await cache.get("extracted-data", "a.json")
+        await cache.get("extracted-data", "b.json")
+
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] <= 30
+
+    @pytest.mark.asyncio
+    async def test_entry_over_cap_is_not_kept(self, storage_helper):
+        cache = BlobReadCache(storage_helper, max_entry_bytes=10)
+
+        blob = await cache.get("extracted-data", "a.json")
+
+        assert blob.content == b'{"status": "completed"}'
+        assert ("extracted-data", "a.json") not in cache
+        assert cache.stats()["entries"] == 0
+
+
+class TestConditionalRequests:
+    def test_validator_headers(self):
+        headers = validator_headers(_blob())
+
+        assert headers["ETag"] == '"0x1"'
+        assert headers["Last-Modified"] == "Mon, 15 Jan 2024 10:30:00 GMT"
+
+    def test_if_none_match(self):
+        assert is_not_modified({"If-None-Match": '"0x1"'}, _blob())
+        assert is_not_modified({"If-None-Match": 'W/"0x1", "0x9"'}, _blob())
+        assert is_not_modified({"If-None-Match": "*"}, _blob())
+        assert not is_not_modified({"If-None-Match": '"0x2"'}, _blob())
+
+    def test_if_none_match_takes_precedence(self):
+        headers = {"If-None-Match": '"0x2"', "If-Modified-Since": "Mon, 15 Jan 2024 10:30:00 GMT"}
+
+        assert not is_not_modified(headers, _blob())
+
+    def test_if_modified_since(self):
+        assert is_not_modified({"If-Modified-Since": "Mon, 15 Jan 2024 10:30:00 GMT"}, _blob())
+        assert not is_not_modified({"If-Modified-Since": "Mon, 15 Jan 2024 10:29:59 GMT"}, _blob())
+        assert not is_not_modified({"If-Modified-Since": "not a date"}, _blob())
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from azure.core.exceptions import ClientAuthenticationError
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from utils.secrets import SecretProvider
+
+
+def _provider(ttl: float = 3600) -> SecretProvider:
+    provider = SecretProvider(vault_url="https://test.vault.azure.net/", ttl=ttl)
+    provider._client = MagicMock()
+    provider._client.get_secret = AsyncMock(side_effect=lambda name: MagicMock(value=f"{name}-v{provider._client.get_secret.await_count}"))
+    provider._client.close = AsyncMock()
+    return provider
+
+
+class TestSecretProvider:
+    @pytest.mark.asyncio
+    async def test_without_vault_uses_environment(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_API_KEY", "from-env")
+        provider = SecretProvider(vault_url="")
+
+        assert await provider.get("MistralApiKey", env_fallback="MISTRAL_API_KEY") == "from-env"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_reads_share_one_fetch(self):
+        provider = _provider()
+
+        values = await asyncio.gather(*(provider.get("MistralApiKey") for _ in range(5)))
+
+        assert set(values) == {"MistralApiKey-v1"}
+        assert provider._client.get_secret.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_is_served_while_refreshing(self):
+        provider = _provider(ttl=0)
+
+        assert await provider.get("MistralApiKey") == "MistralApiKey-v1"
+        assert await provider.get("MistralApiKey") == "MistralApiKey-v1"
+        await asyncio.sleep(0)
+
+        assert await provider.get("MistralApiKey") == "MistralApiKey-v2"
+        await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_vault_failure_falls_back_to_environment(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_API_KEY", "from-env")
+        provider = _provider()
+        provider._client.get_secret = AsyncMock(side_effect=ClientAuthenticationError("forbidden"))
+
+        assert await provider.get("MistralApiKey", env_fallback="MISTRAL_API_KEY") == "from-env"
+
+    @pytest.mark.asyncio
+    async def test_vault_failure_is_not_retried_until_backoff_ends(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_API_KEY", "from-env")
+        provider = _provider()
+        provider.failure_ttl = 60
+        provider._client.get_secret = AsyncMock(side_effect=ClientAuthenticationError("forbidden"))
+
+        for _ in range(3):
+            assert await provider.get("MistralApiKey", env_fallback="MISTRAL_API_KEY") == "from-env"
+        assert provider._client.get_secret.await_count == 1
+
+        provider.failure_ttl = 0
+        provider._client.get_secret = AsyncMock(return_value=MagicMock(value="from-vault"))
+        assert await provider.get("MistralApiKey", env_fallback="MISTRAL_API_KEY") == "from-vault"
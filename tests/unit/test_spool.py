@@ -0,0 +1,92 @@
+import io
+import mmap
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from ocr.cache import document_cache_key
+from ocr.payload import StreamingOCRPayload
+from ocr.sharding import split_pdf
+from utils.spool import spool_chunks, spool_reader
+
+
+async def chunks(data: bytes, size: int = 1000):
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+def blank_pdf(pages: int) -> bytes:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class TestSpooling:
+    def test_small_documents_stay_in_memory(self):
+        document = spool_reader(io.BytesIO(b"%PDF-small").read, 10, threshold=100)
+
+        assert not document.spooled
+        assert document.data == b"%PDF-small"
+
+    def test_large_documents_are_memory_mapped(self):
+        data = bytes(range(256)) * 40
+        with spool_reader(io.BytesIO(data).read, len(data), threshold=100) as document:
+            assert document.spooled
+            assert isinstance(document.data, mmap.mmap)
+            assert document.size == len(data)
+            assert document.data[:] == data
+        assert document.data.closed
+
+    @pytest.mark.asyncio
+    async def test_chunked_download(self):
+        data = b"x" * 5000
+        small = await spool_chunks(chunks(data), len(data), threshold=10_000)
+        large = await spool_chunks(chunks(data), len(data), threshold=100)
+
+        assert small.data == data and not small.spooled
+        with large:
+            assert large.spooled and large.data[:] == data
+
+    @pytest.mark.asyncio
+    async def test_empty_blob(self):
+        with await spool_chunks(chunks(b""), 1, threshold=0) as document:
+            assert document.data == b""
+
+    def test_close_with_live_view_does_not_raise(self):
+        data = b"y" * 1000
+        document = spool_reader(io.BytesIO(data).read, len(data), threshold=10)
+        view = memoryview(document.data)
+
+        document.close()
+
+        assert view[:3] == b"yyy"
+
+
+class TestSpooledDocumentPipeline:
+    def test_hash_and_payload_match_in_memory_bytes(self):
+        data = bytes(range(256)) * 1000
+        with spool_reader(io.BytesIO(data).read, len(data), threshold=100) as document:
+            assert document_cache_key(document.data, "m") == document_cache_key(data, "m")
+
+            spooled_payload = b"".join(StreamingOCRPayload("m", document.data, "application/pdf").iter_chunks())
+            payload = b"".join(StreamingOCRPayload("m", data, "application/pdf").iter_chunks())
+            assert spooled_payload == payload
+
+    def test_pdf_sharding_reads_the_map(self):
+        pdf = blank_pdf(5)
+        with spool_reader(io.BytesIO(pdf).read, len(pdf), threshold=100) as document:
+            shards = split_pdf(document.data, pages_per_shard=2)
+            rendered = [shards.render(i) for i in range(len(shards))]
+
+        in_memory = split_pdf(pdf, pages_per_shard=2)
+        assert len(shards) == 3
+        assert rendered == [in_memory.render(i) for i in range(len(in_memory))]
@@ -0,0 +1,192 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add api/ directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from azure.core.exceptions import ResourceNotFoundError
+from ocr.worker import QueueWorker, handle_ingest_message, mark_poisoned
+from utils.admission import AdmissionScheduler
+from utils.jobs import JobStore, LocalJobBackend
+from utils.queues import InMemoryQueue, ingest_message
+
+
+async def chunks(data: bytes, size: int = 1024):
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+class TestQueueWorker:
+    @pytest.mark.asyncio
+    async def test_processes_everything_within_concurrency(self):
+        queue = InMemoryQueue()
+        for i in range(10):
+            await queue.send(f"doc-{i}")
+
+        in_flight = 0
+        peak = 0
+        handled = []
+
+        async def handler(content: str, dequeue_count: int):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            handled.append(content)
+
+        worker = QueueWorker(queue, handler, concurrency=3, visibility_timeout=30)
+        await worker.drain()
+
+        assert sorted(handled) == sorted(f"doc-{i}" for i in range(10))
+        assert peak == 3
+        assert len(queue) == 0
+        assert worker.stats() == {"completed": 10, "retried": 0, "poisoned": 0, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_only_receives_for_free_slots(self):
+        queue = InMemoryQueue()
+        for i in range(5):
+            await queue.send(f"doc-{i}")
+        release = asyncio.Event()
+
+        async def handler(content: str, dequeue_count: int):
+            await release.wait()
+
+        worker = QueueWorker(queue, handler, concurrency=2, visibility_timeout=30)
+
+        assert await worker.run_once() == 2
+        assert await worker.run_once() == 0
+        # The rest stay visible for other instances
+        assert len(await queue.receive(10, visibility_timeout=30)) == 3
+        release.set()
+        await asyncio.gather(*worker._tasks)
+
+    @pytest.mark.asyncio
+    async def test_long_handlers_keep_their_message_invisible(self):
+        queue = InMemoryQueue()
+        await queue.send("slow")
+
+        async def handler(content: str, dequeue_count: int):
+            await asyncio.sleep(0.25)
+
+        worker = QueueWorker(queue, handler, concurrency=1, visibility_timeout=0.1)
+        await worker.run_once()
+        await asyncio.sleep(0.15)
+
+        # Past the original timeout, but extended, so another worker cannot take it
+        assert await queue.receive(1, visibility_timeout=30) == []
+        await asyncio.gather(*worker._tasks)
+        assert len(queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_messages_are_retried_then_poisoned(self):
+        queue = InMemoryQueue()
+        poison = InMemoryQueue("document-ingest-poison")
+        on_poison = AsyncMock()
+        await queue.send("bad")
+        await queue.send("good")
+        attempts = []
+
+        async def handler(content: str, dequeue_count: int):
+            attempts.append((content, dequeue_count))
+            if content == "bad":
+                raise RuntimeError("OCR unavailable")
+
+        worker = QueueWorker(
+            queue, handler, concurrency=2, visibility_timeout=30, max_dequeue_count=3,
+            retry_delay=0, poison_queue=poison, on_poison=on_poison
+        )
+        await worker.drain()
+
+        assert [a for a in attempts if a[0] == "bad"] == [("bad", 1), ("bad", 2), ("bad", 3)]
+        assert len(queue) == 0
+        assert [m.content for m in await poison.receive(5, visibility_timeout=30)] == ["bad"]
+        on_poison.assert_awaited_once()
+        assert on_poison.await_args.args[0] == "bad"
+        assert worker.stats()["poisoned"] == 1
+        assert worker.stats()["retried"] == 2
+
+    @pytest.mark.asyncio
+    async def test_run_stops_when_asked(self):
+        queue = InMemoryQueue()
+        await queue.send("a")
+        handler = AsyncMock()
+        stop = asyncio.Event()
+        worker = QueueWorker(queue, handler, concurrency=2, visibility_timeout=30)
+
+        task = asyncio.create_task(worker.run(stop, poll_interval=0.01))
+        await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(task, 1)
+
+        handler.assert_awaited_once_with("a", 1)
+        assert len(queue) == 0
+
+
+class TestHandleIngestMessage:
+    @pytest.mark.asyncio
+    async def test_uses_message_then_blob_metadata(self, mock_storage_helper, sample_pdf_bytes):
+        mock_storage_helper.get_blob_properties = AsyncMock(return_value={
+            "size": len(sample_pdf_bytes),
+            "metadata": {"job_id": "b" * 32, "content_type": "image/png"}
+        })
+        mock_storage_helper.iter_blob_chunks = lambda container, blob_name: chunks(sample_pdf_bytes)
+
+        with patch("ocr.worker.process_document", new_callable=AsyncMock) as mock_process:
+            await handle_ingest_message(ingest_message("scan.png"), storage_helper=mock_storage_helper)
+            await handle_ingest_message(
+                ingest_message("invoice.pdf", job_id="a" * 32, content_type="application/pdf"),
+                storage_helper=mock_storage_helper
+            )
+
+        from_metadata, from_message = (call.kwargs for call in mock_process.await_args_list)
+        assert from_metadata["job_id"] == "b" * 32
+        assert from_metadata["blob_properties"]["content_type"] == "image/png"
+        assert from_message["job_id"] == "a" * 32
+        assert from_message["blob_properties"] == {"content_type": "application/pdf", "size": len(sample_pdf_bytes)}
+        assert from_message["blob_content"] == sample_pdf_bytes
+
+    @pytest.mark.asyncio
+    async def test_document_over_budget_fails_its_job(self, tmp_path, mock_storage_helper):
+        jobs = JobStore(LocalJobBackend(tmp_path))
+        job = await jobs.create("huge.tiff", "huge.tiff", "image/tiff", 2048)
+        mock_storage_helper.get_blob_properties = AsyncMock(return_value={"size": 2048, "metadata": {}})
+
+        with patch("ocr.worker.process_document", new_callable=AsyncMock) as mock_process:
+            result = await handle_ingest_message(
+                ingest_message("huge.tiff", job_id=job["id"]),
+                storage_helper=mock_storage_helper,
+                jobs=jobs,
+                scheduler=AdmissionScheduler(capacity=1024)
+            )
+
+        assert result is None
+        mock_process.assert_not_awaited()
+        refused = await jobs.get(job["id"])
+        assert refused["status"] == "failed"
+        assert "memory budget" in refused["error"]
+
+    @pytest.mark.asyncio
+    async def test_missing_blob_is_dropped(self, mock_storage_helper):
+        mock_storage_helper.get_blob_properties = AsyncMock(side_effect=ResourceNotFoundError("gone"))
+
+        with patch("ocr.worker.process_document", new_callable=AsyncMock) as mock_process:
+            assert await handle_ingest_message(ingest_message("gone.pdf"), storage_helper=mock_storage_helper) is None
+
+        mock_process.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_mark_poisoned_fails_the_job(self, tmp_path):
+        jobs = JobStore(LocalJobBackend(tmp_path))
+        job = await jobs.create("invoice.pdf", "invoice.pdf", "application/pdf", 10)
+
+        await mark_poisoned(ingest_message("invoice.pdf", job_id=job["id"]), RuntimeError("OCR unavailable"), jobs=jobs)
+
+        failed = await jobs.get(job["id"])
+        assert failed["status"] == "failed"
+        assert failed["error"] == "Gave up after 5 attempts: OCR unavailable"
@@ -78,11 +78,16 @@ async function uploadFile(file) {
             throw new Error('Upload failed');
         }
 
-        const result = await response.json();
-        progressText.textContent = 'Complete!';
+        // 202: the file is stored and processed in the background
+        const job = await response.json();
+        progressText.textContent = 'Processing...';
+
+        const finished = await pollJobStatus(job.status_url || `/api/jobs/${job.id}`);
+        if (finished.status === 'failed') {
+            throw new Error(finished.error || 'Processing failed');
+        }
 
-        // Document is already processed by the upload endpoint
-        console.log('Upload result:', result);
+        progressText.textContent = 'Complete!';
         setTimeout(() => {
             uploadProgress.hidden = true;
             loadDocuments();
@@ -98,20 +103,31 @@ async function uploadFile(file) {
     fileInput.value = '';
 }
 
-// Poll document status
-async function pollDocumentStatus(documentId, maxAttempts = 30) {
-    for (let i = 0; i < maxAttempts; i++) {
-        await new Promise(resolve => setTimeout(resolve, 2000));
+// Poll a job's small status record, waiting as long as the server's Retry-After asks
+async function pollJobStatus(statusUrl, timeoutMs = 10 * 60 * 1000) {
+    const url = `${API_URL}/${statusUrl.replace(/^\/?api\//, '')}`;
+    const deadline = Date.now() + timeoutMs;
+    let delayMs = 2000;
+
+    while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, delayMs));
 
         try {
-            const response = await fetch(`${API_URL}/documents/${documentId}`);
+            const response = await fetch(url, { cache: 'no-store' });
             if (response.ok) {
-                const doc = await response.json();
-                if (doc.status === 'completed' || doc.status === 'failed') {
-                    return doc;
+                const job = await response.json();
+                if (job.status === 'completed' || job.status === 'failed') {
+                    return job;
                 }
+                const retryAfter = parseInt(response.headers.get('Retry-After'), 10);
+                delayMs = Number.isFinite(retryAfter) ? retryAfter * 1000 : 2000;
+            } else if (response.status === 404) {
+                throw new Error('Job not found');
             }
         } catch (error) {
+            if (error.message === 'Job not found') {
+                throw error;
+            }
             console.error('Poll error:', error);
         }
     }
@@ -119,19 +135,46 @@ async function pollDocumentStatus(documentId, maxAttempts = 30) {
 }
 
 // Load Documents
+const DOCUMENTS_PAGE_SIZE = 100;
+let documentsLoadId = 0;
+
 async function loadDocuments() {
+    // A newer call supersedes one still paging through results
+    const loadId = ++documentsLoadId;
+    const documents = new Map();
+    let continuation = null;
+
     try {
-        const response = await fetch(`${API_URL}/documents`);
+        do {
+            const params = new URLSearchParams({ limit: DOCUMENTS_PAGE_SIZE });
+            if (continuation) params.set('continuation', continuation);
 
-        if (!response.ok) {
-            throw new Error('Failed to load documents');
-        }
+            const response = await fetch(`${API_URL}/documents?${params}`);
+
+            if (!response.ok) {
+                throw new Error('Failed to load documents');
+            }
 
-        const data = await response.json();
-        renderDocuments(data.documents || []);
+            const data = await response.json();
+            if (loadId !== documentsLoadId) return;
+
+            // Exports of one document can be split across pages, so merge by id
+            for (const doc of data.documents || []) {
+                const existing = documents.get(doc.id);
+                if (existing) {
+                    Object.assign(existing.exports, doc.exports);
+                } else {
+                    documents.set(doc.id, doc);
+                }
+            }
+
+            renderDocuments([...documents.values()]);
+            continuation = data.continuation;
+        } while (continuation);
 
     } catch (error) {
         console.error('Load error:', error);
+        if (documents.size > 0) return;
         documentsList.innerHTML = `
             <p class="empty-state">
                 Unable to connect to API.<br>
@@ -148,17 +191,23 @@ function renderDocuments(documents) {
         return;
     }
 
-    documentsList.innerHTML = documents.map(doc => `
+    documentsList.innerHTML = documents.map(doc => {
+        // Manifest entries carry status and timestamps; blob listings only have export metadata
+        const status = doc.status || 'completed';
+        const timestamp = doc.processed_at || doc.exports?.json?.last_modified;
+        return `
         <div class="document-card" onclick="openDocument('${doc.id}')">
             <div class="document-info">
-                <h3>${escapeHtml(doc.id)}</h3>
-                <span class="document-meta">${doc.exports?.json?.last_modified ? formatDate(doc.exports.json.last_modified) : ''}</span>
+                <h3>${escapeHtml(doc.filename || doc.id)}</h3>
+                <span class="document-meta">${timestamp ? formatDate(timestamp) : ''}</span>
             </div>
             <div class="document-status">
-                <span class="status-badge status-completed">completed</span>
+                ${renderConfidenceBadge(doc.confidence)}
+                <span class="status-badge status-${escapeHtml(status)}">${escapeHtml(status)}</span>
             </div>
         </div>
-    `).join('');
+    `;
+    }).join('');
 }
 
 // Render Confidence Badge
@@ -207,15 +256,42 @@ function closeModal() {
     currentDocumentId = null;
 }
 
+// Download an export in byte ranges so no single response has to hold a large file
+const EXPORT_RANGE_SIZE = 4 * 1024 * 1024;
+
+async function fetchExport(url) {
+    const parts = [];
+    let offset = 0;
+    let etag = null;
+
+    while (true) {
+        const headers = { Range: `bytes=${offset}-${offset + EXPORT_RANGE_SIZE - 1}` };
+        if (etag) headers['If-Range'] = etag;
+
+        const response = await fetch(url, { headers });
+        if (!response.ok) throw new Error('Export failed');
+
+        // Server ignored the range (or the export changed mid-download): take the whole body
+        if (response.status !== 206) return response.blob();
+
+        etag = etag || response.headers.get('ETag');
+        parts.push(await response.blob());
+
+        const match = /bytes (\d+)-(\d+)\/(\d+)/.exec(response.headers.get('Content-Range') || '');
+        if (!match) throw new Error('Export failed');
+        offset = Number(match[2]) + 1;
+        if (offset >= Number(match[3])) {
+            return new Blob(parts, { type: response.headers.get('Content-Type') || '' });
+        }
+    }
+}
+
 // Export Document
 async function exportDocument(format) {
     if (!currentDocumentId) return;
 
     try {
-        const response = await fetch(`${API_URL}/documents/${currentDocumentId}/export?format=${format}`);
-        if (!response.ok) throw new Error('Export failed');
-
-        const blob = await response.blob();
+        const blob = await fetchExport(`${API_URL}/documents/${currentDocumentId}/export?format=${format}`);
         const url = URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;